@@ -0,0 +1,3 @@
+"""
+AI比較アプリケーション - ベンチマーク・検証用ツール
+"""
@@ -0,0 +1,153 @@
+"""
+AI比較アプリケーション - HTTPキャッシュ方式の比較ベンチマーク
+スタンドインサーバーのキャッシュ可能なページに対して、キャッシュ方式（disk / memory / none）ごとに
+初回（コールド）と再訪問（ウォーム）のロード時間、サーバーへのリクエスト数、ディスク使用量を計測する
+
+使い方:
+    python -m benchmarks.cache_benchmark --runs 5 --size-mb 100
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTimer, QUrl
+from PySide6.QtWebEngineCore import QWebEngineProfile
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.stand_in_server import StandInServer
+from ui.comparison_widget import HTTP_CACHE_TYPES, configure_http_cache
+from ui.web_view import SuspendableWebView
+
+
+LOAD_LIMIT_SEC = 30
+
+
+def directory_size_mb(path: str) -> float:
+    """ディレクトリ以下のファイルサイズの合計（MB）"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total / (1024 * 1024)
+
+
+def measure_load(app: QApplication, profile: QWebEngineProfile, url: str) -> float:
+    """新しいビューでURLを読み込み、ロード完了までのミリ秒を返す（失敗・時間切れはNone）"""
+    view = SuspendableWebView(profile)
+    view.resize(800, 600)
+    view.show()
+
+    result = {}
+    started = time.perf_counter()
+
+    limit_timer = QTimer()
+    limit_timer.setSingleShot(True)
+
+    def finish(ok):
+        if 'ok' in result:
+            return
+        limit_timer.stop()
+        result['ok'] = ok
+        result['elapsed_ms'] = (time.perf_counter() - started) * 1000
+        app.quit()
+
+    view.loadFinished.connect(finish)
+    limit_timer.timeout.connect(lambda: finish(False))
+    limit_timer.start(LOAD_LIMIT_SEC * 1000)
+
+    view.setUrl(QUrl(url))
+    app.exec()
+
+    view.stop()
+    view.deleteLater()
+    return result['elapsed_ms'] if result.get('ok') else None
+
+
+def run_mode(app: QApplication, server: StandInServer, cache_type: str, size_mb: int,
+             runs: int, url: str, work_dir: Path) -> dict:
+    """1つのキャッシュ方式でコールド・ウォームのロードを計測"""
+    storage = work_dir / cache_type
+    profile = QWebEngineProfile(f"cache-benchmark-{cache_type}")
+    profile.setPersistentStoragePath(str(storage))
+    profile.setCachePath(str(storage / 'cache'))
+    configure_http_cache(profile, cache_type, size_mb)
+
+    cold, warm = [], []
+    cold_requests, warm_requests = 0, 0
+    for _ in range(runs):
+        # コールド: キャッシュを消してから読み込む
+        profile.clearHttpCache()
+        before = server.request_total('/asset/')
+        cold.append(measure_load(app, profile, url))
+        cold_requests += server.request_total('/asset/') - before
+
+        # ウォーム: 同じプロファイルの新しいビューで再訪問
+        before = server.request_total('/asset/')
+        warm.append(measure_load(app, profile, url))
+        warm_requests += server.request_total('/asset/') - before
+
+    return {
+        'cache_type': cache_type,
+        'max_size_mb': size_mb,
+        'cold_ms': _summarize(cold),
+        'warm_ms': _summarize(warm),
+        'cold_asset_requests': cold_requests / runs,
+        'warm_asset_requests': warm_requests / runs,
+        'disk_cache_mb': round(directory_size_mb(profile.cachePath()), 2),
+    }
+
+
+def _summarize(values: list) -> dict:
+    """計測値の中央値・最小・最大（失敗した回は除外）"""
+    valid = [v for v in values if v is not None]
+    if not valid:
+        return {'median': None, 'min': None, 'max': None, 'failed': len(values)}
+    return {
+        'median': round(statistics.median(valid), 1),
+        'min': round(min(valid), 1),
+        'max': round(max(valid), 1),
+        'failed': len(values) - len(valid),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTTPキャッシュ方式の比較ベンチマーク")
+    parser.add_argument('--modes', nargs='+', default=list(HTTP_CACHE_TYPES), choices=list(HTTP_CACHE_TYPES))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--size-mb', type=int, default=100)
+    parser.add_argument('--assets', type=int, default=8, help="ページが読み込むサブリソース数")
+    parser.add_argument('--latency', type=float, default=0.2, help="サブリソース1つあたりの応答遅延（秒）")
+    parser.add_argument('--kb', type=int, default=64, help="サブリソース1つあたりのサイズ（KB）")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    server = StandInServer().start()
+    work_dir = Path(tempfile.mkdtemp(prefix='ai-comparison-cache-'))
+    url = server.url(f"/assets?count={args.assets}&latency={args.latency}&kb={args.kb}")
+
+    results = []
+    try:
+        for cache_type in args.modes:
+            results.append(run_mode(app, server, cache_type, args.size_mb, args.runs, url, work_dir))
+    finally:
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+AI比較アプリケーション - ドメインフィルタの検証スクリプト
+ファーストパーティ判定（site_of）が「co.jp」等の複数ラベルのサフィックスをサイトとみなさないこと、
+ブロックリストの照合が親ドメイン・例外ルールを正しく扱うことを確認する（Qt不要）
+
+使い方:
+    python -m benchmarks.domain_check
+"""
+
+import json
+import sys
+
+from utils.domain_filter import DomainFilter, site_of
+
+
+# (ホスト名, 期待するサイト)
+SITE_CASES = [
+    ('example.com', 'example.com'),
+    ('a.b.example.com', 'example.com'),
+    ('tracker.example.co.jp', 'example.co.jp'),
+    ('www.example.ne.jp', 'example.ne.jp'),
+    ('ads.example.or.jp', 'example.or.jp'),
+    ('www.bbc.co.uk', 'bbc.co.uk'),
+    ('cdn.shop.com.au', 'shop.com.au'),
+    ('foo.user.github.io', 'user.github.io'),
+    ('WWW.Example.CO.JP.', 'example.co.jp'),
+    ('co.jp', ''),
+    ('192.168.0.1', '192.168.0.1'),
+    ('localhost', 'localhost'),
+]
+
+# (ページのホスト名, リクエスト先のホスト名, ファーストパーティとみなすか)
+FIRST_PARTY_CASES = [
+    ('www.example.co.jp', 'tracker.example.co.jp', True),
+    ('www.example.co.jp', 'tracker.other.co.jp', False),
+    ('www.bbc.co.uk', 'ads.tracker.co.uk', False),
+    ('chatgpt.com', 'cdn.chatgpt.com', True),
+    ('alice.github.io', 'bob.github.io', False),
+]
+
+# (ホスト名, ブロックされるか)
+FILTER_LINES = ['||tracker.co.jp^', '0.0.0.0 ads.example.com', '@@||ok.ads.example.com^']
+FILTER_CASES = [
+    ('tracker.co.jp', True),
+    ('a.tracker.co.jp', True),
+    ('co.jp', False),
+    ('x.ads.example.com', True),
+    ('ok.ads.example.com', False),
+    ('example.com', False),
+]
+
+
+def is_first_party(page_host: str, host: str) -> bool:
+    """RequestBlocker.interceptRequestと同じ判定"""
+    site = site_of(page_host)
+    return bool(site) and (host == site or host.endswith('.' + site))
+
+
+def main() -> int:
+    domain_filter = DomainFilter.from_lines(FILTER_LINES)
+    results = []
+    for host, expected in SITE_CASES:
+        actual = site_of(host)
+        results.append({'check': 'site_of', 'host': host, 'expected': expected, 'actual': actual,
+                        'passed': actual == expected})
+    for page_host, host, expected in FIRST_PARTY_CASES:
+        actual = is_first_party(page_host, host)
+        results.append({'check': 'first_party', 'page': page_host, 'host': host, 'expected': expected,
+                        'actual': actual, 'passed': actual == expected})
+    for host, expected in FILTER_CASES:
+        actual = domain_filter.is_blocked(host)
+        results.append({'check': 'is_blocked', 'host': host, 'expected': expected, 'actual': actual,
+                        'passed': actual == expected})
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0 if all(result['passed'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
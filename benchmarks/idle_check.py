@@ -0,0 +1,98 @@
+"""
+AI比較アプリケーション - ペインごとの最終操作時刻の検証スクリプト
+同じタブ（コンテナ）に並べた2つのペインのうち一方だけに入力してからタブを隠し、
+入力したペインが入力していないペインより後に凍結・破棄され、LRUでも新しい側に並ぶことを確認する
+
+使い方:
+    python -m benchmarks.idle_check
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QTimer, Qt
+from PySide6.QtGui import QKeyEvent
+from PySide6.QtWebEngineCore import QWebEngineProfile
+from PySide6.QtWidgets import QApplication, QHBoxLayout, QWidget
+
+from ui.lifecycle_manager import ViewLifecycleManager
+from ui.web_view import LazyWebView
+from utils.settings import Settings
+
+
+FREEZE_MS = 1500
+DISCARD_MS = 1500
+INPUT_AT_MS = 1500  # タブを表示してから一方のペインに入力するまで
+HIDE_AT_MS = 2500  # タブを表示してから隠すまで
+LIMIT_MS = HIDE_AT_MS + FREEZE_MS + DISCARD_MS + 5000
+
+PAGE_URL = "data:text/html,<textarea autofocus></textarea>"
+
+
+def send_key(lazy_view: LazyWebView):
+    """ペインの描画ウィジェットにキー入力を送る（実際の入力と同じ経路で最終操作時刻を更新させる）"""
+    target = lazy_view.web_view.focusProxy() or lazy_view.web_view
+    for event_type in (QEvent.Type.KeyPress, QEvent.Type.KeyRelease):
+        QApplication.sendEvent(target, QKeyEvent(event_type, Qt.Key.Key_A, Qt.KeyboardModifier.NoModifier, "a"))
+
+
+def main() -> int:
+    app = QApplication(sys.argv)
+    profile = QWebEngineProfile()  # オフザレコード
+    settings = Settings(tempfile.mkdtemp(prefix='ai-comparison-idle-'))
+    manager = ViewLifecycleManager(settings)
+    manager.check_timer.stop()  # メモリ予算による破棄は検証の対象外
+
+    tab = QWidget()
+    layout = QHBoxLayout(tab)
+    views = {}
+    for name in ('typed', 'untouched'):
+        lazy_view = LazyWebView(PAGE_URL, profile, tab)
+        lazy_view.set_lifecycle_timeouts(FREEZE_MS, DISCARD_MS)
+        layout.addWidget(lazy_view)
+        manager.register(lazy_view, name)
+        lazy_view.load_content()
+        views[name] = lazy_view
+
+    started = time.monotonic()
+    events = {name: {} for name in views}
+    for name, lazy_view in views.items():
+        lazy_view.lifecycle_changed.connect(
+            lambda state, name=name: events[name].setdefault(state, round(time.monotonic() - started, 2))
+        )
+
+    result = {}
+
+    def hide_tab():
+        result['last_used'] = {name: manager.last_used(view) for name, view in views.items()}
+        tab.hide()
+        for lazy_view in views.values():
+            lazy_view.schedule_suspend()
+
+    tab.resize(800, 400)
+    tab.show()
+    QTimer.singleShot(INPUT_AT_MS, lambda: send_key(views['typed']))
+    QTimer.singleShot(HIDE_AT_MS, hide_tab)
+    QTimer.singleShot(LIMIT_MS, app.quit)
+    app.exec()
+
+    manager.shutdown()
+    typed, untouched = events['typed'], events['untouched']
+    checks = {
+        'untouched_frozen_first': 'Frozen' in untouched and typed.get('Frozen', float('inf')) > untouched['Frozen'],
+        'untouched_discarded_first': (
+            'Discarded' in untouched and typed.get('Discarded', float('inf')) > untouched['Discarded']
+        ),
+        'typed_newer_in_lru': result['last_used']['typed'] > result['last_used']['untouched'],
+    }
+    print(json.dumps({'events': events, 'checks': checks}, indent=2, ensure_ascii=False))
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
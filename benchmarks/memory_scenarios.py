@@ -0,0 +1,314 @@
+"""
+AI比較アプリケーション - メモリシナリオベンチマーク
+実際のMainWindowをoffscreenで起動し、全サービスをスタンドインサーバーのAIチャット風ページ（/app）に向けて、
+操作シナリオ（全タブを開く・タブの往復・凍結/破棄タイムアウトを超える放置・再読み込み）を
+シナリオごとに別プロセスで実行する。実行中は合計RSSとレンダラーごとのRSSを一定間隔で記録し、
+ピーク値と定常値（終盤の中央値）を基準JSONと比較して、許容範囲を超えた増加を回帰として報告する
+
+使い方:
+    python -m benchmarks.memory_scenarios --output memory.json
+    python -m benchmarks.memory_scenarios --write-baseline benchmarks/memory_baseline.json
+    python -m benchmarks.memory_scenarios --baseline benchmarks/memory_baseline.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.stand_in_server import StandInServer
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = PROJECT_ROOT / 'benchmarks' / 'memory_baseline.json'
+
+# シナリオ用の設定（凍結・破棄を短時間で起こし、先読み・ページプールの影響を除く）
+FREEZE_TIMEOUT = 5
+DISCARD_TIMEOUT = 10
+SCENARIO_SETTINGS = {
+    'freeze_timeout': FREEZE_TIMEOUT,
+    'suspend_timeout': DISCARD_TIMEOUT,
+    'auto_suspend': True,
+    'memory_check_interval': 2,
+    'predictive_preload': False,
+    'page_pool_size': 0,
+    'gpu_rasterization': False,  # offscreenではGPUを使わない
+    'window_geometry': None,
+}
+
+TAB_LOAD_WAIT = 8  # タブを開いてから全ペインが読み込まれるまで待つ秒数
+IDLE_WAIT = FREEZE_TIMEOUT + DISCARD_TIMEOUT + 10  # 凍結・破棄が起きるまで放置する秒数
+
+STEADY_FRACTION = 0.25  # 定常値とする終盤のサンプルの割合
+
+# 比較する指標（大きいほど悪い）
+COMPARED_METRICS = ('peak_total_mb', 'steady_total_mb', 'peak_renderer_mb', 'steady_renderer_mb')
+
+
+# 比較ウィジェットのタブ（MainWindowのタブ順。SoraやWebエディタのタブは対象外）
+COMPARISON_TABS = ('text_ai_widget', 'image_ai_widget', 'audio_ai_widget', 'developer_ai_widget')
+
+
+def _open_all_tabs() -> list:
+    steps = []
+    for tab in range(len(COMPARISON_TABS)):
+        steps += [('tab', tab), ('wait', TAB_LOAD_WAIT)]
+    return steps
+
+
+def build_scenarios() -> dict:
+    """シナリオ名 -> 手順（('tab', 番号) / ('wait', 秒) / ('reload',)）"""
+    return {
+        # 全タブを順に開き、最初のタブに戻って落ち着くまで待つ
+        'open_all_tabs': _open_all_tabs() + [('tab', 0), ('wait', TAB_LOAD_WAIT)],
+        # 2つのタブを凍結タイムアウトより短い間隔で往復する（凍結・解凍の繰り返し）
+        'tab_switching': [('tab', 0), ('wait', TAB_LOAD_WAIT), ('tab', 1), ('wait', TAB_LOAD_WAIT)]
+                         + [step for i in range(10) for step in (('tab', i % 2), ('wait', 2))]
+                         + [('wait', TAB_LOAD_WAIT)],
+        # 全タブを開いた後、最初のタブ以外が凍結・破棄されるまで放置する
+        'idle_suspend': _open_all_tabs() + [('tab', 0), ('wait', IDLE_WAIT)],
+        # 表示中のタブの全ペインを繰り返し再読み込みする（再読み込みでのメモリ増加の確認）
+        'reload': [('tab', 0), ('wait', TAB_LOAD_WAIT)]
+                  + [step for _ in range(5) for step in (('reload',), ('wait', TAB_LOAD_WAIT))],
+    }
+
+
+def scenario_duration(steps: list) -> float:
+    """手順の合計待ち時間（秒）"""
+    return sum(step[1] for step in steps if step[0] == 'wait')
+
+
+def run_child(name: str, stand_in: str, app_path: str, interval: float, output: str):
+    """子プロセス側: MainWindowを起動してシナリオを実行し、メモリの推移をJSONに保存"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from models.ai_service import AIServiceManager
+    from utils.engine_flags import build_chromium_flags
+    from utils.settings import Settings
+
+    steps = build_scenarios()[name]
+    app = QApplication(sys.argv[:1])
+
+    settings = Settings(tempfile.mkdtemp(prefix='ai-comparison-memory-'))
+    settings.settings.update(SCENARIO_SETTINGS)
+    settings.save()
+
+    ai_manager = AIServiceManager()
+    ai_manager.redirect_all(stand_in, app_path)
+    for service in ai_manager.get_all_services():
+        # サービス個別の凍結・破棄時間を使うと放置シナリオで差が出ないため、設定値にそろえる
+        service.freeze_timeout = None
+        service.discard_timeout = None
+
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = build_chromium_flags(settings)
+
+    from ui.main_window import MainWindow
+
+    window = MainWindow(settings, ai_manager)
+    window.resize(1366, 768)
+    window.show()
+    manager = window.lifecycle_manager
+    tab_indexes = [window.tab_widget.indexOf(getattr(window, attr)) for attr in COMPARISON_TABS]
+
+    started = time.monotonic()
+    samples = []
+
+    def sample():
+        snapshot = manager.sample_metrics()
+        renderers = manager.get_renderer_summary()
+        states = {}
+        renderer_pids = set()
+        for metrics in manager.view_metrics.values():
+            states[metrics['state']] = states.get(metrics['state'], 0) + 1
+            renderer_pids.add(metrics['pid'])
+        samples.append({
+            't': round(time.monotonic() - started, 1),
+            'total_rss_mb': round(snapshot['total_rss_mb'], 1),
+            'renderer_rss_mb': round(renderers['renderer_rss_mb'], 1),
+            'renderer_count': renderers['renderer_count'],
+            'renderers_mb': {
+                str(pid): round(process['rss_mb'], 1)
+                for pid, process in snapshot['processes'].items() if pid in renderer_pids
+            },
+            'services_mb': {
+                service: round(metrics['rss_mb'], 1)
+                for service, metrics in manager.get_service_metrics().items()
+            },
+            'view_states': states,
+        })
+
+    sample_timer = QTimer()
+    sample_timer.timeout.connect(sample)
+    sample_timer.start(int(interval * 1000))
+
+    def run_step(index: int):
+        if index >= len(steps):
+            sample()
+            app.quit()
+            return
+        step = steps[index]
+        if step[0] == 'wait':
+            QTimer.singleShot(int(step[1] * 1000), lambda: run_step(index + 1))
+            return
+        if step[0] == 'tab':
+            window.tab_widget.setCurrentIndex(tab_indexes[step[1] % len(tab_indexes)])
+        elif step[0] == 'reload':
+            window.tab_widget.currentWidget().reload_all()
+        QTimer.singleShot(0, lambda: run_step(index + 1))
+
+    QTimer.singleShot(0, lambda: run_step(0))
+    app.exec()
+    sample_timer.stop()
+    window.close()
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'scenario': name, 'samples': samples}, f, ensure_ascii=False)
+    shutil.rmtree(settings.config_dir, ignore_errors=True)
+
+
+def summarize(samples: list) -> dict:
+    """ピーク値と定常値（終盤STEADY_FRACTIONのサンプルの中央値）"""
+    if not samples:
+        return {}
+    tail = samples[-max(int(len(samples) * STEADY_FRACTION), 1):]
+    return {
+        'peak_total_mb': max(s['total_rss_mb'] for s in samples),
+        'steady_total_mb': round(statistics.median(s['total_rss_mb'] for s in tail), 1),
+        'peak_renderer_mb': max(s['renderer_rss_mb'] for s in samples),
+        'steady_renderer_mb': round(statistics.median(s['renderer_rss_mb'] for s in tail), 1),
+        'peak_single_renderer_mb': max(
+            (mb for s in samples for mb in s['renderers_mb'].values()), default=0.0
+        ),
+        'peak_renderer_count': max(s['renderer_count'] for s in samples),
+        'final_renderer_count': samples[-1]['renderer_count'],
+        'final_view_states': samples[-1]['view_states'],
+        'sample_count': len(samples),
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_mb: float) -> dict:
+    """基準値との差を計算し、許容範囲（割合とMBの両方）を超えた増加を回帰とする"""
+    result = {}
+    for scenario, summary in current.items():
+        base = baseline.get(scenario)
+        if not base:
+            continue
+        diffs = {}
+        for metric in COMPARED_METRICS:
+            if metric not in summary or not base.get(metric):
+                continue
+            delta = summary[metric] - base[metric]
+            diffs[metric] = {
+                'baseline_mb': base[metric],
+                'current_mb': summary[metric],
+                'delta_mb': round(delta, 1),
+                'delta_percent': round(delta / base[metric] * 100, 1),
+                'regression': delta > base[metric] * tolerance and delta > min_delta_mb,
+            }
+        result[scenario] = diffs
+    return result
+
+
+def main() -> int:
+    scenarios = build_scenarios()
+    parser = argparse.ArgumentParser(description="メモリシナリオベンチマーク")
+    parser.add_argument('--scenarios', nargs='+', default=list(scenarios), choices=list(scenarios))
+    parser.add_argument('--interval', type=float, default=1.0, help="メモリの記録間隔（秒）")
+    parser.add_argument('--app-mb', type=int, default=40, help="各ページがJSヒープに確保するMB")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="比較する基準JSON（存在する場合）")
+    parser.add_argument('--write-baseline', help="今回の結果を基準JSONとして保存")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="回帰とみなす増加率（0.1 = 10%%）")
+    parser.add_argument('--min-delta-mb', type=float, default=20.0, help="回帰とみなす最小の増加量（MB）")
+    parser.add_argument('--output', help="結果（サンプル列を含む）を保存するJSONファイル")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--stand-in', help=argparse.SUPPRESS)
+    parser.add_argument('--app-path', help=argparse.SUPPRESS)
+    parser.add_argument('--child-output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.stand_in, args.app_path, args.interval, args.child_output)
+        return 0
+
+    server = StandInServer().start()
+    app_path = f"/app?mb={args.app_mb}"
+    work_dir = Path(tempfile.mkdtemp(prefix='ai-comparison-memory-'))
+    results = {}
+    try:
+        for name in args.scenarios:
+            # WebEngineのメモリはプロセス内に残るため、シナリオごとに別プロセスで実行する
+            output = work_dir / f"{name}.json"
+            timeout = scenario_duration(scenarios[name]) + 120
+            print(f"{name}: 実行中（約{scenario_duration(scenarios[name]):.0f}秒）", file=sys.stderr)
+            try:
+                completed = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.memory_scenarios', '--child', name,
+                     '--stand-in', server.url(''), '--app-path', app_path,
+                     '--interval', str(args.interval), '--child-output', str(output)],
+                    cwd=str(PROJECT_ROOT), capture_output=True, text=True, timeout=timeout
+                )
+                error = completed.stderr.strip()[-500:] or f"exit code {completed.returncode}"
+            except subprocess.TimeoutExpired:
+                error = f"timed out after {timeout:.0f} s"
+            if not output.exists():
+                results[name] = {'error': error}
+                continue
+            with open(output, 'r', encoding='utf-8') as f:
+                samples = json.load(f)['samples']
+            results[name] = {'summary': summarize(samples), 'samples': samples}
+    finally:
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    summaries = {name: result['summary'] for name, result in results.items() if 'summary' in result}
+    report = {
+        'scenarios': results,
+        'settings': dict(SCENARIO_SETTINGS, app_mb=args.app_mb, interval=args.interval),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+    }
+
+    regressions = []
+    if args.baseline and Path(args.baseline).exists() and not args.write_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('summary', {})
+        report['compare'] = compare(summaries, baseline, args.tolerance, args.min_delta_mb)
+        regressions = [
+            f"{scenario}.{metric}" for scenario, diffs in report['compare'].items()
+            for metric, diff in diffs.items() if diff['regression']
+        ]
+        report['regressions'] = regressions
+
+    if args.write_baseline:
+        with open(args.write_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summaries, 'settings': report['settings'],
+                       'platform': sys.platform}, f, indent=2, ensure_ascii=False)
+        print(f"基準を保存: {args.write_baseline}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    # 標準出力にはサンプル列を除いた結果を出す
+    printed = dict(report, scenarios={
+        name: {key: value for key, value in result.items() if key != 'samples'}
+        for name, result in results.items()
+    })
+    print(json.dumps(printed, indent=2, ensure_ascii=False))
+    for name in regressions:
+        print(f"回帰: {name}", file=sys.stderr)
+    failed = regressions or any('error' in result for result in results.values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
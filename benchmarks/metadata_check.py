@@ -0,0 +1,86 @@
+"""
+AI比較アプリケーション - 画像メタデータ削除の検証スクリプト
+合成したJPEGから、EXIF・XMP（APP1）・IPTC（APP13）・コメントだけが取り除かれ、
+JFIF・ICCプロファイル（APP2）・Adobe（APP14）・画像データは残ること、
+マーカー前の埋め草（0xFF）や単独のマーカーを含むファイルも処理できることを確認する（Qt不要）
+
+使い方:
+    python -m benchmarks.metadata_check
+"""
+
+import json
+import struct
+import sys
+
+from utils.downloads import strip_jpeg_metadata
+
+
+def segment(marker: int, payload: bytes) -> bytes:
+    """長さフィールド付きのJPEGセグメントを作る"""
+    return bytes([0xFF, marker]) + struct.pack('>H', len(payload) + 2) + payload
+
+
+APP0_JFIF = segment(0xE0, b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00')
+APP1_EXIF = segment(0xE1, b'Exif\x00\x00' + b'\x00' * 16)
+APP1_XMP = segment(0xE1, b'http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>')
+APP2_ICC = segment(0xE2, b'ICC_PROFILE\x00\x01\x01' + b'\x00' * 16)
+APP13_IPTC = segment(0xED, b'Photoshop 3.0\x00' + b'\x00' * 8)
+APP14_ADOBE = segment(0xEE, b'Adobe\x00\x64\x00\x00\x00\x00\x02')
+COM = segment(0xFE, b'comment')
+DQT = segment(0xDB, b'\x00' + b'\x01' * 64)
+# SOS以降（エントロピー符号化データ中のRSTマーカー・EOIを含む）はそのまま残る
+SCAN = segment(0xDA, b'\x01\x01\x00\x00\x3f\x00') + b'\x12\x34\xff\x00\xff\xd0\x56' + b'\xff\xd9'
+
+KEPT = [APP0_JFIF, APP2_ICC, APP14_ADOBE, DQT]
+REMOVED = [APP1_EXIF, APP1_XMP, APP13_IPTC, COM]
+
+CASES = {
+    'metadata_removed': (
+        b'\xff\xd8' + APP0_JFIF + APP1_EXIF + APP2_ICC + APP1_XMP + APP13_IPTC + APP14_ADOBE + COM + DQT + SCAN,
+        b'\xff\xd8' + APP0_JFIF + APP2_ICC + APP14_ADOBE + DQT + SCAN,
+    ),
+    'fill_bytes': (
+        b'\xff\xd8' + b'\xff\xff' + APP1_EXIF + b'\xff' + APP2_ICC + DQT + SCAN,
+        b'\xff\xd8' + APP2_ICC + DQT + SCAN,
+    ),
+    'standalone_markers': (
+        b'\xff\xd8' + b'\xff\x01' + APP1_EXIF + b'\xff\xd0' + DQT + SCAN,
+        b'\xff\xd8' + b'\xff\x01' + b'\xff\xd0' + DQT + SCAN,
+    ),
+    'no_metadata_unchanged': (
+        b'\xff\xd8' + APP0_JFIF + APP2_ICC + DQT + SCAN,
+        b'\xff\xd8' + APP0_JFIF + APP2_ICC + DQT + SCAN,
+    ),
+}
+
+
+def main() -> int:
+    results = []
+    for name, (data, expected) in CASES.items():
+        try:
+            actual = strip_jpeg_metadata(data)
+            error = None
+        except ValueError as e:
+            actual, error = None, str(e)
+        results.append({
+            'case': name,
+            'input_bytes': len(data),
+            'output_bytes': len(actual) if actual is not None else None,
+            'error': error,
+            'passed': actual == expected,
+        })
+
+    truncated = b'\xff\xd8' + APP1_EXIF[:-4]
+    try:
+        strip_jpeg_metadata(truncated)
+        passed = False
+    except ValueError:
+        passed = True
+    results.append({'case': 'truncated_segment_rejected', 'passed': passed})
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0 if all(result['passed'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+AI比較アプリケーション - レンダラープロセスモデルの比較ベンチマーク
+プロセスモデル（process_per_site_instance / process_per_site / limited）ごとに別プロセスでアプリと同じ
+フラグを設定し、スタンドインサーバーの2サイトに複数ペインを開いて以下を計測する
+
+- レンダラープロセス数と合計RSS/PSS
+- 1つのレンダラーを強制終了したときに巻き込まれるペイン数（クラッシュの影響範囲）
+
+使い方:
+    python -m benchmarks.process_model_benchmark --panes 3 --limit 2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.stand_in_server import StandInServer
+from utils.engine_flags import PROCESS_MODELS, build_chromium_flags
+
+
+SETTLE_MS = 2000  # ロード完了後、プロセスの生成・メモリが落ち着くまで待つ時間
+CRASH_WAIT_MS = 2000
+
+
+def run_child(model: str, limit: int, urls: list) -> dict:
+    """子プロセス側: 指定プロセスモデルでペインを開いて計測"""
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = build_chromium_flags(
+        {'process_model': model, 'renderer_process_limit': limit}
+    )
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    import psutil
+    from PySide6.QtCore import QTimer, QUrl
+    from PySide6.QtWebEngineCore import QWebEngineProfile
+    from PySide6.QtWidgets import QApplication
+
+    from ui.web_view import SuspendableWebView
+    from utils.process_metrics import ProcessMetricsCollector
+
+    app = QApplication(sys.argv[:1])
+    profile = QWebEngineProfile()  # オフザレコード
+    views = []
+    pending = set(range(len(urls)))
+    terminated = set()
+
+    def on_loaded(index):
+        pending.discard(index)
+        if not pending:
+            QTimer.singleShot(SETTLE_MS, app.quit)
+
+    for index, url in enumerate(urls):
+        view = SuspendableWebView(profile)
+        view.set_crash_policy(0, 1)  # 自動復元させずに影響範囲だけを数える
+        view.resize(400, 300)
+        view.show()
+        view.loadFinished.connect(lambda ok, index=index: on_loaded(index))
+        view.renderProcessTerminated.connect(lambda *_, index=index: terminated.add(index))
+        view.setUrl(QUrl(url))
+        views.append(view)
+
+    QTimer.singleShot(30000, app.quit)  # 時間切れ
+    app.exec()
+
+    pids = [view.render_process_pid() for view in views]
+    renderer_pids = {pid for pid in pids if pid}
+    snapshot = ProcessMetricsCollector().sample_tree(full_pids=renderer_pids)
+    renderers = [snapshot['processes'][pid] for pid in renderer_pids if pid in snapshot['processes']]
+    pss = [p['pss_mb'] for p in renderers if p['pss_mb'] is not None]
+
+    # 最初のペインのレンダラーを強制終了し、同時に落ちたペインを数える
+    crashed_panes = None
+    if pids[0]:
+        try:
+            psutil.Process(pids[0]).kill()
+            QTimer.singleShot(CRASH_WAIT_MS, app.quit)
+            app.exec()
+            crashed_panes = len(terminated)
+        except psutil.Error:
+            pass
+
+    return {
+        'process_model': model,
+        'renderer_process_limit': limit if model == 'limited' else None,
+        'panes': len(urls),
+        'loaded_panes': len(urls) - len(pending),
+        'renderer_count': len(renderer_pids),
+        'renderer_rss_mb': round(sum(p['rss_mb'] for p in renderers), 1),
+        'renderer_pss_mb': round(sum(pss), 1) if pss else None,
+        'total_rss_mb': round(snapshot['total_rss_mb'], 1),
+        'panes_lost_per_crash': crashed_panes,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="レンダラープロセスモデルの比較ベンチマーク")
+    parser.add_argument('--models', nargs='+', default=list(PROCESS_MODELS), choices=list(PROCESS_MODELS))
+    parser.add_argument('--panes', type=int, default=3, help="サイトごとのペイン数（2サイト分開く）")
+    parser.add_argument('--limit', type=int, default=2, help="limited選択時のレンダラープロセス数の上限")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--urls', nargs='*', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Chromiumのフラグはプロセス起動時にしか反映されないため、モデルごとに子プロセスで計測する
+        print(json.dumps(run_child(args.child, args.limit, args.urls)))
+        return 0
+
+    server = StandInServer().start()
+    # 127.0.0.1とlocalhostは別サイトとして扱われる
+    urls = []
+    for host in ('127.0.0.1', 'localhost'):
+        for i in range(args.panes):
+            urls.append(f"http://{host}:{server.port}/ok?pane={i}")
+
+    results = []
+    try:
+        for model in args.models:
+            started = time.monotonic()
+            completed = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.process_model_benchmark',
+                 '--child', model, '--limit', str(args.limit), '--urls', *urls],
+                capture_output=True, text=True
+            )
+            lines = [line for line in completed.stdout.splitlines() if line.startswith('{')]
+            if completed.returncode != 0 or not lines:
+                results.append({'process_model': model, 'error': completed.stderr.strip()[-500:]})
+                continue
+            result = json.loads(lines[-1])
+            result['elapsed_sec'] = round(time.monotonic() - started, 1)
+            results.append(result)
+    finally:
+        server.stop()
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
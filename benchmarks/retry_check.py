@@ -0,0 +1,97 @@
+"""
+AI比較アプリケーション - ロード再試行ポリシーの検証スクリプト
+スタンドインサーバーのハング・切断・一時障害に対して、
+SuspendableWebViewのバックオフとサーキットブレーカーが想定どおり動くか確認する
+
+使い方:
+    python -m benchmarks.retry_check
+"""
+
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTimer, QUrl
+from PySide6.QtWebEngineCore import QWebEngineProfile
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.stand_in_server import StandInServer
+from ui.web_view import SuspendableWebView
+from utils.recovery import RetryPolicy
+
+
+# 検証用に短縮したポリシー
+POLICY = RetryPolicy(base_delay=0.5, max_delay=2.0, jitter=0.2, max_attempts=3, open_cooldown=0)
+LOAD_TIMEOUT_MS = 2000
+
+# (パス, 期待する結果, 制限時間秒)
+SCENARIOS = [
+    ('/hang', 'circuit_open', 20),
+    ('/drop', 'circuit_open', 15),
+    ('/flaky?fail=2', 'loaded', 15),
+]
+
+
+def run_scenario(app: QApplication, profile: QWebEngineProfile, server: StandInServer,
+                 path: str, limit_sec: float) -> dict:
+    """1シナリオを実行し、結果を返す"""
+    view = SuspendableWebView(profile)
+    view.set_retry_policy(POLICY, LOAD_TIMEOUT_MS)
+    view.resize(800, 600)
+    view.show()
+
+    result = {'path': path, 'outcome': 'time_limit', 'attempts': 0}
+    started = time.monotonic()
+
+    limit_timer = QTimer()
+    limit_timer.setSingleShot(True)
+
+    def finish(outcome):
+        if 'elapsed_sec' in result:
+            return
+        limit_timer.stop()
+        result['outcome'] = outcome
+        result['elapsed_sec'] = round(time.monotonic() - started, 2)
+        app.quit()
+
+    view.loadStarted.connect(lambda: result.update(attempts=result['attempts'] + 1))
+    view.circuit_changed.connect(lambda is_open, reason: is_open and finish('circuit_open'))
+    view.loadFinished.connect(lambda ok: ok and finish('loaded'))
+    limit_timer.timeout.connect(lambda: finish('time_limit'))
+    limit_timer.start(int(limit_sec * 1000))
+
+    view.setUrl(QUrl(server.url(path)))
+    app.exec()
+
+    result['server_requests'] = server.request_count(path.split('?')[0])
+    view.stop()
+    view.deleteLater()
+    return result
+
+
+def main() -> int:
+    app = QApplication(sys.argv)
+    profile = QWebEngineProfile()  # オフザレコード
+    server = StandInServer().start()
+
+    failed = False
+    results = []
+    try:
+        for path, expected, limit_sec in SCENARIOS:
+            result = run_scenario(app, profile, server, path, limit_sec)
+            result['expected'] = expected
+            result['passed'] = result['outcome'] == expected
+            failed |= not result['passed']
+            results.append(result)
+    finally:
+        server.stop()
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+AI比較アプリケーション - ローカルスタンドインHTTPサーバー
+実際のAIサービスの代わりに使う検証用サーバー（ハング・切断・遅延を再現できる）
+
+使い方:
+    python -m benchmarks.stand_in_server --port 8765
+
+    /ok              即座に応答
+    /slow?delay=5    指定秒数待ってから応答
+    /hang            応答を返さない（ロードタイムアウトの検証）
+    /drop            ヘッダーを返さずに接続を切断（接続エラーの検証）
+    /flaky?fail=3    最初のN回は切断し、以降は応答（再試行の検証）
+    /assets?count=8&latency=0.2&kb=64
+                     キャッシュ可能なサブリソースをcount個読み込むページ（キャッシュの検証）
+    /asset/N.js?latency=0.2&kb=64
+                     latency秒待ってから約kb KBのJSを返す（Cache-Control: max-age付き）
+    /app?mb=40&messages=200&tick=1
+                     AIチャット画面を模したページ（JSヒープにmb MBを確保し、会話履歴のDOMを持ち、
+                     tick秒ごとに履歴を更新し続ける。メモリシナリオの検証）
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+APP_SCRIPT = """
+<script>
+// 会話履歴・モデル状態などを模してJSヒープを確保する（ページが生きている限り保持）
+window.__retained = [];
+for (let i = 0; i < {mb}; i++) {{
+  const chunk = new Float64Array(131072);  // 1 MB
+  for (let j = 0; j < chunk.length; j += 512) chunk[j] = Math.random();
+  window.__retained.push(chunk);
+}}
+const log = document.getElementById('log');
+function addMessage(n) {{
+  const item = document.createElement('div');
+  item.textContent = 'message ' + n + ' ' + 'lorem ipsum '.repeat(20);
+  log.appendChild(item);
+  if (log.childElementCount > {messages}) log.removeChild(log.firstChild);
+}}
+for (let i = 0; i < {messages}; i++) addMessage(i);
+// 応答のストリーミングを模して定期的に更新し続ける（凍結されると止まる）
+let tick = {messages};
+setInterval(() => addMessage(tick++), {tick_ms});
+</script>
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ja">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body><h1>{title}</h1><p>{body}</p></body>
+</html>
+"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """スタンドインサーバーのリクエストハンドラ"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        path = parsed.path.rstrip('/') or '/'
+        self.server.record_request(path)
+
+        if path == '/hang':
+            # クライアントが切断するかサーバー停止まで応答しない
+            self.server.stopping.wait()
+            return
+        if path == '/drop':
+            self.close_connection = True
+            return
+        if path == '/flaky':
+            fail = int(query.get('fail', 3))
+            if self.server.request_count(path) <= fail:
+                self.close_connection = True
+                return
+        if path == '/slow':
+            time.sleep(float(query.get('delay', 5)))
+        if path == '/assets':
+            self.send_asset_page(query)
+            return
+        if path == '/app':
+            self.send_app_page(query)
+            return
+        if path.startswith('/asset/'):
+            time.sleep(float(query.get('latency', 0.2)))
+            self.send_asset(path, int(query.get('kb', 64)))
+            return
+
+        self.send_page(path, f"stand-in response for {path}")
+
+    def send_asset_page(self, query: dict):
+        """キャッシュ可能なサブリソースを読み込むページを返す（ページ自体はキャッシュさせない）"""
+        count = int(query.get('count', 8))
+        asset_query = f"latency={query.get('latency', 0.2)}&kb={query.get('kb', 64)}"
+        scripts = "".join(
+            f'<script src="/asset/{i}.js?{asset_query}"></script>' for i in range(count)
+        )
+        self.send_page('/assets', f"{count} cacheable assets{scripts}", {'Cache-Control': 'no-store'})
+
+    def send_app_page(self, query: dict):
+        """メモリを確保し、定期的にDOMを更新し続けるAIチャット風のページを返す"""
+        script = APP_SCRIPT.format(
+            mb=int(query.get('mb', 40)),
+            messages=int(query.get('messages', 200)),
+            tick_ms=int(float(query.get('tick', 1)) * 1000),
+        )
+        title = f"/app {query.get('service', '')}".strip()
+        self.send_page(title, f'<div id="log"></div>{script}', {'Cache-Control': 'no-store'})
+
+    def send_asset(self, path: str, kb: int):
+        """約kb KBのJSを返す（長期キャッシュ可能）"""
+        line = f"/* {path} */ window.__asset = (window.__asset || 0) + 1;\n"
+        content = (line * max(kb * 1024 // len(line), 1)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/javascript')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Cache-Control', 'public, max-age=86400')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def send_page(self, title: str, body: str, headers: dict = None):
+        """HTMLページを返す"""
+        content = PAGE_TEMPLATE.format(title=title, body=body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """バックグラウンドスレッドで動作するスタンドインサーバー"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, handler=StandInHandler, verbose: bool = False):
+        super().__init__(('127.0.0.1', port), handler)
+        self.verbose = verbose
+        self.stopping = threading.Event()
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def url(self, path: str = '/') -> str:
+        """サーバー上のURLを取得"""
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def record_request(self, path: str):
+        with self._lock:
+            self._counts[path] = self._counts.get(path, 0) + 1
+
+    def request_count(self, path: str) -> int:
+        """パスごとのリクエスト回数"""
+        with self._lock:
+            return self._counts.get(path, 0)
+
+    def request_total(self, prefix: str = '/') -> int:
+        """指定プレフィックスで始まるパスへのリクエスト回数の合計"""
+        with self._lock:
+            return sum(count for path, count in self._counts.items() if path.startswith(prefix))
+
+    def start(self) -> 'StandInServer':
+        """バックグラウンドで待ち受けを開始"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """待ち受けを停止"""
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ローカルスタンドインHTTPサーバー")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = StandInServer(args.port, verbose=True)
+    print(f"スタンドインサーバー起動: {server.url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stopping.set()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+AI比較アプリケーション - 起動時間ベンチマーク
+main.pyをベンチマークモード（offscreen、ガイドライン省略、全サービスをスタンドインサーバーに向ける）で
+複数回起動し、各段階（インポート完了・QApplication作成・ウィンドウ作成・最初のタブのビュー作成・
+最初のロード成功）までの時間を集計してJSONで出力する。失敗・タイムアウトしたロードは段階に含めず、
+回ごと・全体の失敗数として別に出力する
+
+使い方:
+    python -m benchmarks.startup_benchmark --runs 5 --output startup.json
+    python -m benchmarks.startup_benchmark --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.stand_in_server import StandInServer
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 出力する段階の順序
+MILESTONES = [
+    'interpreter_ready',
+    'imports_done',
+    'qapplication_created',
+    'main_window_constructed',
+    'window_shown',
+    'first_tab_views_created',
+    'first_load_finished',
+    'first_tab_loaded',
+]
+
+
+def run_once(server: StandInServer, timeout: float, work_dir: Path, index: int) -> dict:
+    """main.pyを1回起動して計測結果を返す"""
+    output = work_dir / f"run{index}.json"
+    config_dir = work_dir / f"config{index}"  # 毎回まっさらな設定・プロファイル（コールドスタート）
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    completed = subprocess.run(
+        [sys.executable, str(PROJECT_ROOT / 'main.py'), '--benchmark',
+         '--stand-in', server.url(''), '--benchmark-output', str(output),
+         '--benchmark-timeout', str(timeout), '--config-dir', str(config_dir)],
+        cwd=str(PROJECT_ROOT), env=env, capture_output=True, text=True, timeout=timeout + 30
+    )
+    if not output.exists():
+        return {'error': completed.stderr.strip()[-500:] or f"exit code {completed.returncode}"}
+    with open(output, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def summarize(runs: list) -> dict:
+    """段階ごとの中央値・最小・最大（ミリ秒）"""
+    summary = {}
+    for milestone in MILESTONES:
+        values = [run['marks_ms'][milestone] for run in runs if milestone in run.get('marks_ms', {})]
+        if values:
+            summary[milestone] = {
+                'median': round(statistics.median(values), 1),
+                'min': min(values),
+                'max': max(values),
+                'count': len(values),
+            }
+    return summary
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    """基準結果との差（中央値、ミリ秒と%）"""
+    diff = {}
+    for milestone, stats in current.items():
+        base = baseline.get(milestone)
+        if not base or not base['median']:
+            continue
+        delta = stats['median'] - base['median']
+        diff[milestone] = {
+            'baseline_ms': base['median'],
+            'current_ms': stats['median'],
+            'delta_ms': round(delta, 1),
+            'delta_percent': round(delta / base['median'] * 100, 1),
+        }
+    return diff
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="起動時間ベンチマーク")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=60.0, help="1回あたりの制限時間（秒）")
+    parser.add_argument('--output', help="結果を保存するJSONファイル")
+    parser.add_argument('--compare', help="比較する過去の結果（JSON）")
+    args = parser.parse_args()
+
+    server = StandInServer().start()
+    work_dir = Path(tempfile.mkdtemp(prefix='ai-comparison-startup-'))
+    runs = []
+    try:
+        for index in range(args.runs):
+            result = run_once(server, args.timeout, work_dir, index)
+            runs.append(result)
+            status = result.get('error') or ('timed out' if result.get('timed_out') else 'ok')
+            if result.get('load_failures'):
+                status += f" ({len(result['load_failures'])} load failures)"
+            print(f"run {index + 1}/{args.runs}: {status}", file=sys.stderr)
+    finally:
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'runs': runs,
+        'summary_ms': summarize(runs),
+        'load_failures': sum(len(run.get('load_failures', [])) for run in runs),
+        'incomplete_runs': sum(1 for run in runs if 'first_tab_loaded' not in run.get('marks_ms', {})),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+    }
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            report['compare'] = compare(report['summary_ms'], json.load(f).get('summary_ms', {}))
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    failed = any('error' in run or run.get('timed_out') or 'first_tab_loaded' not in run.get('marks_ms', {})
+                 for run in runs)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,8 +7,11 @@ PySide6とQWebEngineViewを使用して、複数のAIアシスタントサービ
 
 import sys
 import os
+import time
 import traceback
 
+_MAIN_STARTED = time.time()  # インタープリタ起動完了（起動時間ベンチマーク用）
+
 # Setup exception logging
 try:
     log_path = os.path.join(os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.getcwd(), 'main_debug.log')
@@ -25,48 +28,155 @@ def exception_hook(exctype, value, tb):
 
 sys.excepthook = exception_hook
 
+import argparse
+import tempfile
+
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
 # Import UI components inside try-except block in main if possible, 
 # but for now we keep them here as they are top-level. 
 # The excepthook should catch import errors if they happen after hook setup.
 from ui.main_window import MainWindow
 from ui.guideline_dialog import GuidelineDialog
+from utils.engine_flags import build_chromium_flags
+from utils.performance_profiles import apply_performance_profile
+from utils.settings import Settings
+from utils.startup_timeline import StartupTimeline
+from models.ai_service import AIServiceManager
+
+
+def parse_args(argv: list) -> argparse.Namespace:
+    """アプリ固有の引数を解析（Qtの引数はそのまま残す）"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--benchmark', action='store_true',
+                        help="起動時間ベンチマークモード（ガイドラインを表示せず、計測後に終了）")
+    parser.add_argument('--stand-in', default=None,
+                        help="全サービスのURLを向けるスタンドインサーバー（例: http://127.0.0.1:8765）")
+    parser.add_argument('--benchmark-output', default='startup_benchmark.json')
+    parser.add_argument('--benchmark-timeout', type=float, default=60.0)
+    parser.add_argument('--config-dir', default=None, help="設定・プロファイルの保存先")
+    return parser.parse_known_args(argv[1:])[0]
+
+
+def watch_first_tab(window: MainWindow, timeline: StartupTimeline, on_done):
+    """最初のタブの全ビュー作成・最初のロード成功・全ビューのロード成功を記録
+
+    失敗したロードは段階の到達とせず、失敗として別に記録する（再試行で成功すればその時点を記録）。
+    全ビューが成功するか、成功しなかったビューが再試行を停止した時点で終了する
+    """
+    widget = window.text_ai_widget
+    lazy_views = widget.lazy_views
+    names = {lazy_view: service.name for lazy_view, service in zip(lazy_views, widget.services)}
+    created, succeeded, gave_up = set(), set(), set()
+    
+    def check_done():
+        if len(succeeded | gave_up) < len(lazy_views):
+            return
+        if len(succeeded) == len(lazy_views):
+            timeline.mark('first_tab_loaded')
+        on_done(False)
+    
+    def on_load_finished(lazy_view, ok):
+        if not ok:
+            timeline.record_failure(names.get(lazy_view, lazy_view.url), 'load_failed')
+            return
+        timeline.mark('first_load_finished')
+        succeeded.add(lazy_view)
+        gave_up.discard(lazy_view)
+        check_done()
+    
+    def on_circuit_changed(lazy_view, is_open, reason):
+        if is_open and lazy_view not in succeeded:
+            timeline.record_failure(names.get(lazy_view, lazy_view.url), f"retry_stopped: {reason}")
+            gave_up.add(lazy_view)
+            check_done()
+    
+    def on_created(lazy_view):
+        if lazy_view in created:
+            return
+        created.add(lazy_view)
+        web_view = lazy_view.web_view
+        web_view.loadFinished.connect(lambda ok: on_load_finished(lazy_view, ok))
+        web_view.circuit_changed.connect(lambda is_open, reason: on_circuit_changed(lazy_view, is_open, reason))
+        if len(created) == len(lazy_views):
+            timeline.mark('first_tab_views_created')
+    
+    for lazy_view in lazy_views:
+        if lazy_view.is_view_loaded():
+            on_created(lazy_view)
+        else:
+            lazy_view.loaded.connect(lambda v=lazy_view: on_created(v))
 
 
 def main():
     """アプリケーションのメインエントリーポイント"""
+    timeline = StartupTimeline(_MAIN_STARTED)
+    timeline.mark('imports_done')
+    args = parse_args(sys.argv)
+    
+    if args.benchmark:
+        # 画面を表示せずに計測する
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
     
     # High DPIスケーリングを有効化
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
     )
     
-    # Chromiumのフラグ設定（GPU高速化のみ維持）
-    import os
-    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = (
-        "--ignore-gpu-blocklist "
-        "--enable-gpu-rasterization "
-        "--enable-features=PlatformHEVCDecoderSupport,ProprietaryCodecs,ms-playready "
-        "--autoplay-policy=no-user-gesture-required "
-        "--enable-widevine"
-    )
-    
     # アプリケーションの作成
     app = QApplication(sys.argv)
     app.setApplicationName("AI比較アプリケーション")
     app.setOrganizationName("AI Comparison")
+    timeline.mark('qapplication_created')
     
-    # ガイドラインダイアログを表示（毎回表示）
-    dialog = GuidelineDialog()
-    if dialog.exec() != dialog.DialogCode.Accepted:
-        # 同意しない場合はアプリを終了
-        sys.exit(0)
+    # パフォーマンスプロファイルの選択（搭載メモリ・CPU数・GPUの初期化可否から自動選択）
+    # ベンチマークでは既存の設定・ログイン状態を使わないよう、使い捨ての設定フォルダを使う
+    config_dir = args.config_dir
+    if args.benchmark and not config_dir:
+        config_dir = tempfile.mkdtemp(prefix='ai-comparison-benchmark-')
+    settings = Settings(config_dir)
+    apply_performance_profile(settings)
+    
+    ai_manager = AIServiceManager()
+    if args.stand_in:
+        ai_manager.redirect_all(args.stand_in)
+    
+    # Chromiumのフラグ設定（GPUラスタライズ／ソフトウェアラスタライズ、レンダラープロセスモデル）
+    # WebEngineは最初のプロファイル作成時に初期化されるため、それより前に設定する
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = build_chromium_flags(settings)
+    
+    # ガイドラインダイアログを表示（毎回表示、ベンチマークモードでは省略）
+    if not args.benchmark:
+        dialog = GuidelineDialog()
+        if dialog.exec() != dialog.DialogCode.Accepted:
+            # 同意しない場合はアプリを終了
+            sys.exit(0)
     
     # メインウィンドウの作成と表示
-    window = MainWindow()
-    window.showMaximized()  # 1366x768解像度でも最適に表示
+    window = MainWindow(settings, ai_manager)
+    timeline.mark('main_window_constructed')
+    if window.geometry_restored:
+        window.show()  # 前回の位置・サイズ（最大化の状態を含む）
+    else:
+        window.showMaximized()  # 1366x768解像度でも最適に表示
+    timeline.mark('window_shown')
+    
+    if args.benchmark:
+        finished = []
+        
+        def finish(timed_out: bool):
+            if finished:
+                return
+            finished.append(timed_out)
+            timeline.save(args.benchmark_output, timed_out=timed_out,
+                          performance_profile=settings.active_performance_profile)
+            print(f"起動時間ベンチマーク結果: {args.benchmark_output}")
+            window.close()
+            app.quit()
+        
+        watch_first_tab(window, timeline, finish)
+        QTimer.singleShot(int(args.benchmark_timeout * 1000), lambda: finish(True))
     
     # イベントループの開始
     sys.exit(app.exec())
@@ -2,6 +2,6 @@
 AI比較アプリケーション - モデルモジュール
 """
 
-from .ai_service import AIService, AIServiceManager
+from .ai_service import AIService, AIServiceManager, ServiceGroup
 
-__all__ = ['AIService', 'AIServiceManager']
+__all__ = ['AIService', 'AIServiceManager', 'ServiceGroup']
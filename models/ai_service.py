@@ -1,9 +1,17 @@
 """
 AI比較アプリケーション - AIサービス情報管理モジュール
+サービスとタブのグループ、サービスごとの動作ポリシーは models/services.json で定義する
 """
 
-from dataclasses import dataclass
-from typing import Dict
+import json
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List
+
+
+DEFAULT_REGISTRY_PATH = Path(__file__).with_name('services.json')
+
+CACHE_MODES = ('disk', 'memory', 'none')
 
 
 @dataclass
@@ -15,124 +23,148 @@ class AIService:
     profile_name: str
     description: str = ""
     user_agent: str = None  # Noneの場合はデフォルトUAを使用
+    freeze_timeout: int = None  # 非表示→凍結までの秒数（Noneの場合は設定値を使用）
+    discard_timeout: int = None  # 凍結→破棄までの秒数（Noneの場合は設定値を使用）
+    load_timeout: int = None  # ロードタイムアウト秒数（Noneの場合は設定値を使用）
+    preload_priority: int = 0  # タブ内で大きいものから読み込む。負の値のサービスを含むタブは先読みしない
+    pinned: bool = False  # 破棄しない（タイマー・メモリ予算のどちらでも。凍結はする）
+    memory_cap_mb: int = None  # 非表示の間にこのメモリ量（MB）を超えたら予算内でも破棄
+    cache_mode: str = None  # HTTPキャッシュ disk / memory / none（Noneの場合は設定値を使用）
+    block_list: List[str] = field(default_factory=list)  # このサービスで追加で遮断するドメイン
+
+
+# 定義ファイルを変更しても再起動まで反映されない項目（プロファイル・ビューの作成時に使う）
+RESTART_FIELDS = ('display_name', 'url', 'profile_name', 'user_agent')
+# 実行中に反映する項目
+POLICY_FIELDS = ('description', 'freeze_timeout', 'discard_timeout', 'load_timeout', 'preload_priority',
+                 'pinned', 'memory_cap_mb', 'cache_mode', 'block_list')
+
+
+@dataclass
+class ServiceGroup:
+    """タブとして並べるサービスのグループ"""
+    id: str
+    title: str
+    services: List[AIService]
+    splitter_sizes: List[int] = None  # ペインの幅の比率（Noneの場合は均等）
+
+
+def _check(condition: bool, message: str):
+    if not condition:
+        raise ValueError(message)
+
+
+def _parse_service(entry: dict) -> AIService:
+    """定義ファイルの1サービス分を検証してAIServiceにする（不正な場合はValueError）"""
+    _check(isinstance(entry, dict), f"サービスの定義がオブジェクトではありません: {entry!r}")
+    known = {f.name for f in fields(AIService)}
+    unknown = set(entry) - known
+    name = entry.get('name')
+    _check(not unknown, f"{name}: 不明な項目 {', '.join(sorted(unknown))}")
+    for key in ('name', 'display_name', 'url', 'profile_name'):
+        _check(isinstance(entry.get(key), str) and entry[key], f"{name}: {key}は必須です")
+    for key in ('freeze_timeout', 'discard_timeout', 'load_timeout', 'memory_cap_mb'):
+        value = entry.get(key)
+        _check(value is None or (isinstance(value, int) and not isinstance(value, bool) and value >= 0),
+               f"{name}: {key}は0以上の整数を指定してください")
+    priority = entry.get('preload_priority', 0)
+    _check(isinstance(priority, int) and not isinstance(priority, bool), f"{name}: preload_priorityは整数です")
+    _check(isinstance(entry.get('pinned', False), bool), f"{name}: pinnedはtrue/falseです")
+    _check(entry.get('cache_mode') in CACHE_MODES + (None,),
+           f"{name}: cache_modeは{' / '.join(CACHE_MODES)}のいずれかです")
+    block_list = entry.get('block_list', [])
+    _check(isinstance(block_list, list) and all(isinstance(domain, str) for domain in block_list),
+           f"{name}: block_listはドメインのリストです")
+    return AIService(**entry)
 
 
+def load_registry(path: Path) -> tuple[Dict[str, AIService], Dict[str, ServiceGroup]]:
+    """サービス定義ファイルを読み込む（不正な場合はValueError）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"サービス定義を読み込めません ({path}): {e}") from e
+
+    services: Dict[str, AIService] = {}
+    for entry in data.get('services', []):
+        service = _parse_service(entry)
+        _check(service.name not in services, f"サービス名が重複しています: {service.name}")
+        services[service.name] = service
+
+    groups: Dict[str, ServiceGroup] = {}
+    for entry in data.get('groups', []):
+        group_id = entry.get('id')
+        _check(isinstance(group_id, str) and group_id not in groups, f"グループIDが不正または重複しています: {group_id!r}")
+        missing = [name for name in entry.get('services', []) if name not in services]
+        _check(not missing, f"{group_id}: 未定義のサービス {', '.join(missing)}")
+        sizes = entry.get('splitter_sizes')
+        _check(sizes is None or (isinstance(sizes, list) and len(sizes) == len(entry['services'])),
+               f"{group_id}: splitter_sizesの数がサービス数と異なります")
+        groups[group_id] = ServiceGroup(
+            group_id,
+            entry.get('title', group_id),
+            [services[name] for name in entry.get('services', [])],
+            sizes,
+        )
+    return services, groups
+
 
 class AIServiceManager:
     """AIサービス情報を管理するクラス"""
-    
-    def __init__(self):
-        self.text_ai_services: Dict[str, AIService] = {
-            'chatgpt': AIService(
-                name='chatgpt',
-                display_name='ChatGPT',
-                url='https://chatgpt.com/',  # 新しいドメイン（自動的に日本語UIになります）
-                profile_name='chatgpt_profile',
-                description='質問応答や画像生成(色味にクセあり)'
-            ),
-            'gemini': AIService(
-                name='gemini',
-                display_name='Gemini',
-                url='https://gemini.google.com/app?hl=ja',
-                profile_name='gemini_profile',
-                description='質問応答、画像生成は条件に「～の画風で」をつけると、その画風で生成'
-            )
-        }
-        
-        self.image_ai_services: Dict[str, AIService] = {
-            'imagefx': AIService(
-                name='imagefx',
-                display_name='ImageFX',
-                url='https://labs.google/fx/ja',
-                profile_name='imagefx_profile',
-                description='試験的AIツール Whisk(画/動の複合),Flow(動画),ImageFX(画像),MusicFX(音楽)'
-            ),
-            'deepl': AIService(
-                name='deepl',
-                display_name='DeepL',
-                url='https://www.deepl.com/ja/translator#ja/en/',
-                profile_name='deepl_profile',
-                description='命令文JP➔EN翻訳'
-            )
-        }
-        
-        # adobe用
-        self.gemini_image_services: Dict[str, AIService] = {
-            'adobeexpress': AIService(
-                name='adobeexpress',
-                display_name='Adobe Express',
-                url='https://new.express.adobe.com/',
-                profile_name='adobeexpress_profile',
-                description='画像編集、動画編集、デザインテンプレート'
-            )
-        }
-        
-        # NotebookLM専用タブ
-        self.audio_ai_services: Dict[str, AIService] = {
-            'notebooklm': AIService(
-                name='notebooklm',
-                display_name='NotebookLM',
-                url='https://notebooklm.google.com/',
-                profile_name='notebooklm_profile',
-                description='動画音声の要約、登録資料の要約や辞書化など'
-            )
-        }
-        
-        # 動画生成AIタブ
-        self.video_ai_services: Dict[str, AIService] = {
-            'sora': AIService(
-                name='sora',
-                display_name='OpenAI Sora',
-                url='https://sora.chatgpt.com/',
-                profile_name='sora_profile',
-                description='動画生成AI (OpenAI)',
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
-            )
-        }
-        
-        # 開発者向けタブ
-        self.developer_ai_services: Dict[str, AIService] = {
-            'googleaistudio': AIService(
-                name='googleaistudio',
-                display_name='Google AI Studio',
-                url='https://aistudio.google.com/',
-                profile_name='googleaistudio_profile',
-                description='Geminiモデルのプロトタイピングと実験（開発者向け）'
-            )
-        }
-    
-    def get_text_ai_service(self, name: str) -> AIService:
-        """文章AIサービスを取得する"""
-        return self.text_ai_services.get(name)
-    
-    def get_image_ai_service(self, name: str) -> AIService:
-        """画像AIサービスを取得する"""
-        return self.image_ai_services.get(name)
-    
-    def get_all_text_ai_services(self) -> list[AIService]:
-        """全ての文章AIサービスを取得する"""
-        return list(self.text_ai_services.values())
-    
-    def get_all_image_ai_services(self) -> list[AIService]:
-        """全ての画像AIサービスを取得する"""
-        return list(self.image_ai_services.values())
-    
-    def get_all_gemini_image_services(self) -> list[AIService]:
-        """全てのGemini画像生成サービスを取得する"""
-        return list(self.gemini_image_services.values())
-    
-    def get_audio_ai_service(self, name: str) -> AIService:
-        """音声AIサービスを取得する"""
-        return self.audio_ai_services.get(name)
-    
-    def get_all_audio_ai_services(self) -> list[AIService]:
-        """全ての音声AIサービスを取得する"""
-        return list(self.audio_ai_services.values())
-    
-    def get_all_video_ai_services(self) -> list[AIService]:
-        """全ての動画AIサービスを取得する"""
-        return list(self.video_ai_services.values())
-    
-    def get_all_developer_ai_services(self) -> list[AIService]:
-        """全ての開発者向けAIサービスを取得する"""
-        return list(self.developer_ai_services.values())
+
+    def __init__(self, registry_path: Path = None):
+        self.registry_path = Path(registry_path) if registry_path else DEFAULT_REGISTRY_PATH
+        self.services, self.groups = load_registry(self.registry_path)
+
+    def reload(self) -> list[AIService]:
+        """定義ファイルを読み直し、実行中に反映できる項目（ポリシー）を既存のサービスに反映する
+
+        変更があったサービスを返す。定義が不正な場合は現在の定義のまま
+        """
+        try:
+            services, groups = load_registry(self.registry_path)
+        except ValueError as e:
+            print(f"⚠️ サービス定義の再読み込みに失敗（現在の定義を継続）: {e}")
+            return []
+
+        changed = []
+        for name, service in self.services.items():
+            new = services.get(name)
+            if new is None:
+                continue
+            if any(getattr(service, key) != getattr(new, key) for key in POLICY_FIELDS):
+                for key in POLICY_FIELDS:
+                    setattr(service, key, getattr(new, key))
+                changed.append(service)
+            if any(getattr(service, key) != getattr(new, key) for key in RESTART_FIELDS):
+                print(f"サービス {name} のURL・プロファイル等の変更は再起動後に反映されます")
+        if set(services) != set(self.services) or {
+            group_id: [service.name for service in group.services] for group_id, group in groups.items()
+        } != {
+            group_id: [service.name for service in group.services] for group_id, group in self.groups.items()
+        }:
+            print("サービス・グループの追加や削除は再起動後に反映されます")
+        return changed
+
+    def get_service(self, name: str) -> AIService:
+        """サービスを名前で取得する"""
+        return self.services.get(name)
+
+    def get_group(self, group_id: str) -> ServiceGroup:
+        """タブのグループを取得する"""
+        return self.groups[group_id]
+
+    def get_group_services(self, group_id: str) -> list[AIService]:
+        """グループに含まれるサービスを取得する"""
+        return list(self.groups[group_id].services)
+
+    def get_all_services(self) -> list[AIService]:
+        """全カテゴリのサービスを取得する"""
+        return list(self.services.values())
+
+    def redirect_all(self, base_url: str, path: str = '/ok'):
+        """全サービスのURLをローカルのスタンドインサーバーに向ける（ベンチマーク用）"""
+        separator = '&' if '?' in path else '?'
+        for service in self.get_all_services():
+            service.url = f"{base_url.rstrip('/')}{path}{separator}service={service.name}"
@@ -5,5 +5,7 @@ AI比較アプリケーション - UIモジュール
 from .main_window import MainWindow
 from .comparison_widget import AIComparisonWidget
 from .web_view import LazyWebView, SuspendableWebView
+from .lifecycle_manager import ViewLifecycleManager
 
-__all__ = ['MainWindow', 'AIComparisonWidget', 'LazyWebView', 'SuspendableWebView']
+__all__ = ['MainWindow', 'AIComparisonWidget', 'LazyWebView', 'SuspendableWebView',
+           'ViewLifecycleManager']
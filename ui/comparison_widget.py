@@ -3,16 +3,38 @@ AI比較アプリケーション - AI比較ウィジェットモジュール
 3つのAIサービスを横並びで表示するウィジェット
 """
 
-from PySide6.QtCore import Qt, Signal, QStandardPaths
-from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings, QWebEngineDownloadRequest
-from PySide6.QtWidgets import QWidget, QSplitter, QVBoxLayout, QHBoxLayout, QLabel
-import os
-import mimetypes
-import re
+from PySide6.QtCore import Qt, Signal, QUrl
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings
+from PySide6.QtWidgets import QWidget, QSplitter, QVBoxLayout, QHBoxLayout, QLabel, QApplication
 
 from .web_view import LazyWebView
+from .page_pool import PagePool
+from .load_scheduler import LoadScheduler
+from .download_manager import DownloadManager
+from .request_blocker import RequestBlocker, build_block_filter, install_request_blocker
 from models.ai_service import AIService
+from utils.recovery import RetryPolicy
 from utils.settings import Settings
+from utils.storage_manager import StorageManager
+
+
+# 設定値 -> HTTPキャッシュの種類
+HTTP_CACHE_TYPES = {
+    'disk': QWebEngineProfile.HttpCacheType.DiskHttpCache,
+    'memory': QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+    'none': QWebEngineProfile.HttpCacheType.NoCache,
+}
+
+
+def configure_http_cache(profile: QWebEngineProfile, cache_type: str, max_size_mb: int):
+    """プロファイルのHTTPキャッシュを設定（Cookie・localStorageの永続化には影響しない）"""
+    http_cache_type = HTTP_CACHE_TYPES.get(cache_type)
+    if http_cache_type is None:
+        print(f"不明なHTTPキャッシュ種別: {cache_type} - diskを使用")
+        http_cache_type = QWebEngineProfile.HttpCacheType.DiskHttpCache
+    profile.setHttpCacheType(http_cache_type)
+    # メモリキャッシュの場合も上限として使われる
+    profile.setHttpCacheMaximumSize(max(int(max_size_mb), 0) * 1024 * 1024)
 
 
 class AIComparisonWidget(QWidget):
@@ -20,25 +42,92 @@ class AIComparisonWidget(QWidget):
     
     tab_activated = Signal()  # タブがアクティブになったシグナル
     
-    def __init__(self, services: list[AIService], settings: Settings, parent=None, custom_sizes=None):
+    def __init__(self, services: list[AIService], settings: Settings, parent=None, custom_sizes=None,
+                 lifecycle_manager=None, load_scheduler: LoadScheduler = None,
+                 storage_manager: StorageManager = None, download_manager: DownloadManager = None):
         super().__init__(parent)
         
         self.services = services
         self.settings = settings
+        self.lifecycle_manager = lifecycle_manager  # 全タブ共通のViewLifecycleManager
+        self.load_scheduler = load_scheduler  # 全タブ共通のLoadScheduler（Noneの場合は一斉に開始）
+        self.storage_manager = storage_manager  # プロファイルを作成する前に削除中でないか確認
+        # 全タブ共通のダウンロードキュー（Noneの場合はこのタブ専用に作成）
+        self.download_manager = download_manager or DownloadManager(settings, self)
         self.lazy_views: list[LazyWebView] = []
+        self.profiles: list[QWebEngineProfile] = []
+        self.page_pools: list[PagePool] = []
+        self.request_blockers: dict[str, RequestBlocker] = {}  # サービス名 -> インターセプター
+        self.splitter: QSplitter = None
+        self.is_built = False  # プロファイル・ビューを作成済み
         self.is_initialized = False
+        self.is_preloaded = False  # 表示前に先読みされ、まだ表示されていない
         self.custom_sizes = custom_sizes  # カスタムスプリッターサイズ
+        # 復元する状態 {'urls': {サービス名: URL}, 'splitter_sizes': [...]}（構築時に使用）
+        self.restore_state: dict = {}
         
-        # UIの初期化
+        # メインレイアウト（プロファイル・ビューは初回表示・先読み時にbuild()で作成）
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout.setSpacing(0)
+    
+    def build(self):
+        """プロファイル・ビューを作成（起動時間とメモリがタブ数に比例しないよう、初回表示まで遅らせる）"""
+        if self.is_built:
+            return
+        print(f"タブを構築中... ({len(self.services)}個のサービス)")
         self._init_ui()
+        self.is_built = True
+        # 予備ビューは操作が落ち着いてから作成
+        for page_pool in self.page_pools:
+            page_pool.schedule_refill()
+    
+    def teardown(self) -> bool:
+        """プロファイル・ビューを破棄して未構築の状態に戻す（メモリ逼迫時）
+
+        表示中のタブやポップアップを開いているタブは破棄しない
+        """
+        if not self.is_built or self.isVisible():
+            return False
+        if any(page_pool.has_popups() for page_pool in self.page_pools):
+            return False
+        print(f"タブを破棄: {', '.join(service.display_name for service in self.services)}")
+        # 再構築した時に同じページに戻れるよう、破棄前のURL・サイズを復元先にする
+        self.restore_state = self.session_state()
+        for lazy_view in self.lazy_views:
+            if self.load_scheduler:
+                self.load_scheduler.cancel(lazy_view)
+            if self.lifecycle_manager:
+                self.lifecycle_manager.unregister(lazy_view)
+            lazy_view.unload()
+        for page_pool in self.page_pools:
+            page_pool.drain()
+        
+        # ビュー（ページ）を先に削除し、その後でプロファイルを削除する
+        self.main_layout.removeWidget(self.splitter)
+        self.splitter.deleteLater()
+        for profile in self.profiles:
+            profile.deleteLater()
+        
+        self.splitter = None
+        self.lazy_views = []
+        self.profiles = []
+        self.page_pools = []
+        self.request_blockers = {}
+        self.is_built = False
+        self.is_initialized = False
+        self.is_preloaded = False
+        return True
+    
+    def can_teardown(self) -> bool:
+        """破棄しても失うものが少ないか（全ビューが未ロードまたは破棄済み）"""
+        return self.is_built and all(
+            not lazy_view.is_view_loaded() or lazy_view.web_view.is_discarded
+            for lazy_view in self.lazy_views
+        )
     
     def _init_ui(self):
         """UIの初期化"""
-        # メインレイアウト
-        main_layout = QVBoxLayout(self)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(0)
-        
         # スプリッターの作成（3つのビューを横並び）
         self.splitter = QSplitter(Qt.Orientation.Horizontal)
         self.splitter.setHandleWidth(1)
@@ -46,38 +135,23 @@ class AIComparisonWidget(QWidget):
         # 各AIサービス用のLazyWebViewを作成
         for service in self.services:
             # プロファイルの作成
-            profile = QWebEngineProfile(service.profile_name, self)
-            profile_dir = self.settings.get_profile_dir(service.profile_name)
-            profile.setPersistentStoragePath(profile_dir)
-            profile.setPersistentCookiesPolicy(
-                QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
-            )
-            
-            # 日本語の言語設定を追加
-            profile.setHttpAcceptLanguage("ja-JP,ja;q=0.9,en-US;q=0.8,en;q=0.7")
-            
-            # User-Agentの設定（指定がある場合）
-            if service.user_agent:
-                profile.setHttpUserAgent(service.user_agent)
-            
-            # WebEngineSettingsの設定（Googleログイン対策）
-            settings = profile.settings()
-            settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.LocalStorageEnabled, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.AllowWindowActivationFromJavaScript, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.AllowRunningInsecureContent, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
-            
-            # Adobe Expressエディタ画面対策：WebGL/Canvas高速化
-            settings.setAttribute(QWebEngineSettings.WebAttribute.WebGLEnabled, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, True)
+            profile = self._create_profile(service)
+            self.profiles.append(profile)
             
-            # ダウンロードハンドラの設定
-            profile.downloadRequested.connect(self._handle_download)
+            # 事前生成ビューのプール（ポップアップと初回表示で使用）
+            page_pool = PagePool(profile, self.settings.get('page_pool_size', 1))
+            self.page_pools.append(page_pool)
             
             # LazyWebViewの作成
-            lazy_view = LazyWebView(service.url, profile, self)
+            lazy_view = LazyWebView(self._restore_url(service), profile, self, page_pool=page_pool)
+            lazy_view.set_lifecycle_timeouts(*self._lifecycle_timeouts(service))
+            lazy_view.set_retry_policy(*self._retry_policy(service))
+            lazy_view.set_crash_policy(
+                self.settings.get('crash_loop_max_crashes', 3),
+                self.settings.get('crash_loop_window', 300)
+            )
+            if self.lifecycle_manager:
+                self.lifecycle_manager.register(lazy_view, service.display_name, service)
             
             # コンテナウィジェットの作成（タイトル付き）
             container = QWidget()
@@ -122,7 +196,12 @@ class AIComparisonWidget(QWidget):
             self.lazy_views.append(lazy_view)
         
         # スプリッターのサイズ設定
-        if self.custom_sizes:
+        restore_sizes = self.restore_state.get('splitter_sizes')
+        if (isinstance(restore_sizes, list) and len(restore_sizes) == len(self.services)
+                and all(isinstance(size, int) and size >= 0 for size in restore_sizes) and sum(restore_sizes) > 0):
+            # 前回セッションのサイズ
+            self.splitter.setSizes(restore_sizes)
+        elif self.custom_sizes:
             # カスタムサイズが指定されている場合
             total = sum(self.custom_sizes)
             base_width = 1200
@@ -135,7 +214,7 @@ class AIComparisonWidget(QWidget):
             self.splitter.setSizes([size_per_view] * len(self.services))
         
         # スプリッターをレイアウトに追加
-        main_layout.addWidget(self.splitter)
+        self.main_layout.addWidget(self.splitter)
         
         # スプリッターのスタイル
         self.splitter.setStyleSheet("""
@@ -149,130 +228,278 @@ class AIComparisonWidget(QWidget):
             }
         """)
     
-    def initialize_views(self):
+    def _create_profile(self, service: AIService) -> QWebEngineProfile:
+        """サービス用のプロファイルを作成（保存先・キャッシュ・言語・UA・WebEngine設定・ダウンロード・リクエストブロック）"""
+        if self.storage_manager:
+            self.storage_manager.claim(service.profile_name)
+        profile = QWebEngineProfile(service.profile_name, self)
+        profile_dir = self.settings.get_profile_dir(service.profile_name)
+        profile.setPersistentStoragePath(profile_dir)
+        profile.setCachePath(self.settings.get_cache_dir(service.profile_name))
+        profile.setPersistentCookiesPolicy(
+            QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
+        )
+        
+        # HTTPキャッシュ（上限付きディスク、またはメモリのみ）
+        configure_http_cache(profile, *self._http_cache_config(service))
+        
+        # 日本語の言語設定を追加
+        profile.setHttpAcceptLanguage("ja-JP,ja;q=0.9,en-US;q=0.8,en;q=0.7")
+        
+        # User-Agentの設定（指定がある場合）
+        if service.user_agent:
+            profile.setHttpUserAgent(service.user_agent)
+        
+        # WebEngineSettingsの設定（Googleログイン対策）
+        settings = profile.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalStorageEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.AllowWindowActivationFromJavaScript, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.AllowRunningInsecureContent, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
+        
+        # Adobe Expressエディタ画面対策：WebGL/Canvas高速化
+        settings.setAttribute(QWebEngineSettings.WebAttribute.WebGLEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, True)
+        
+        # ダウンロードハンドラの設定
+        profile.downloadRequested.connect(self._handle_download)
+        
+        # トラッカー・解析ビーコンの遮断（設定で有効な場合のみ）
+        blocker = install_request_blocker(profile, self.settings, service.display_name, service.block_list)
+        if blocker:
+            self.request_blockers[service.display_name] = blocker
+        
+        return profile
+    
+    def _lifecycle_timeouts(self, service: AIService) -> tuple[int, int]:
+        """サービスごとの凍結・破棄タイムアウト（ミリ秒）を取得"""
+        freeze = service.freeze_timeout
+        if freeze is None:
+            freeze = self.settings.get('freeze_timeout', 30)
+        discard = service.discard_timeout
+        if discard is None:
+            discard = self.settings.get('suspend_timeout', 300)
+        if service.pinned:
+            discard = 0  # 固定されたサービスは破棄しない
+        return freeze * 1000, discard * 1000
+    
+    def _http_cache_config(self, service: AIService) -> tuple[str, int]:
+        """サービスごとのHTTPキャッシュ種別と上限（MB）を取得"""
+        cache_sizes = self.settings.get('http_cache_profile_sizes_mb', {})
+        return (
+            service.cache_mode or self.settings.get('http_cache_type', 'disk'),
+            cache_sizes.get(service.profile_name, self.settings.get('http_cache_size_mb', 100))
+        )
+    
+    def can_preload(self) -> bool:
+        """先読みしてよいタブか（preload_priorityが負の重いサービスを含むタブは表示されるまで読み込まない）"""
+        return all(service.preload_priority >= 0 for service in self.services)
+    
+    def apply_service_policies(self, changed: list[AIService]):
+        """サービス定義の再読み込みで変わったポリシーを作成済みのビュー・プロファイルに反映"""
+        if not self.is_built:
+            return  # 未作成のタブは作成時に最新のポリシーを使う
+        for service, lazy_view, profile in zip(self.services, self.lazy_views, self.profiles):
+            if service not in changed:
+                continue
+            lazy_view.set_lifecycle_timeouts(*self._lifecycle_timeouts(service))
+            lazy_view.set_retry_policy(*self._retry_policy(service))
+            configure_http_cache(profile, *self._http_cache_config(service))
+            
+            blocker = self.request_blockers.get(service.display_name)
+            domain_filter = build_block_filter(self.settings, service.block_list)
+            if blocker and domain_filter:
+                blocker.domain_filter = domain_filter
+            elif domain_filter:
+                blocker = install_request_blocker(profile, self.settings, service.display_name, service.block_list)
+                self.request_blockers[service.display_name] = blocker
+            elif blocker:
+                profile.setUrlRequestInterceptor(None)
+                blocker.deleteLater()
+                del self.request_blockers[service.display_name]
+    
+    def _restore_url(self, service: AIService) -> str:
+        """ペインで最初に読み込むURL（前回セッションのURL、無ければサービスのURL）"""
+        url = self.restore_state.get('urls', {}).get(service.display_name)
+        if isinstance(url, str) and QUrl(url).scheme() in ('http', 'https'):
+            return url
+        return service.url
+    
+    def set_restore_state(self, state: dict):
+        """前回セッションの状態を設定（構築前のみ。読み込みはタブを最初に表示・先読みした時）"""
+        if not self.is_built and isinstance(state, dict):
+            self.restore_state = state
+    
+    def session_state(self) -> dict:
+        """セッション保存用の各ペインのURLとスプリッターのサイズ（未構築のタブは復元先をそのまま返す）"""
+        if not self.is_built:
+            return self.restore_state
+        return {
+            'urls': {service.display_name: lazy_view.current_url()
+                     for service, lazy_view in zip(self.services, self.lazy_views)},
+            'splitter_sizes': self.splitter.sizes(),
+        }
+    
+    def _retry_policy(self, service: AIService) -> tuple[RetryPolicy, int]:
+        """サービスごとの再試行ポリシーとロードタイムアウト（ミリ秒）を取得"""
+        policy = RetryPolicy(
+            base_delay=self.settings.get('load_retry_base_delay', 2),
+            max_delay=self.settings.get('load_retry_max_delay', 120),
+            max_attempts=self.settings.get('load_retry_max_attempts', 5),
+            open_cooldown=self.settings.get('load_retry_cooldown', 300),
+        )
+        load_timeout = service.load_timeout
+        if load_timeout is None:
+            load_timeout = self.settings.get('load_timeout', 30)
+        return policy, load_timeout * 1000
+    
+    def _load_order(self) -> list[LazyWebView]:
+        """読み込み順（フォーカスのあるペイン → preload_priorityの大きいペイン → 幅の広いペインの順）"""
+        focus_widget = QApplication.focusWidget()
+        sizes = self.splitter.sizes() if self.splitter else []
+        
+        def key(item):
+            index, lazy_view = item
+            has_focus = focus_widget is not None and lazy_view.isAncestorOf(focus_widget)
+            return (not has_focus, -self.services[index].preload_priority,
+                    -sizes[index] if index < len(sizes) else 0, index)
+        
+        return [lazy_view for _, lazy_view in sorted(enumerate(self.lazy_views), key=key)]
+    
+    def _schedule_load(self, lazy_view: LazyWebView, start, priority: int = LoadScheduler.PRIORITY_VISIBLE):
+        """ペインの読み込みをスケジューラーに予約（スケジューラーが無い場合は即座に開始）"""
+        if self.load_scheduler:
+            self.load_scheduler.schedule(lazy_view, start, priority)
+        else:
+            start()
+    
+    def initialize_views(self, priority: int = LoadScheduler.PRIORITY_VISIBLE):
         """ビューを初期化（遅延ロード）"""
         if not self.is_initialized:
+            self.build()
             print(f"ビューを初期化中... ({len(self.lazy_views)}個のビュー)")
             
             # このタブがアクティブになったら、全てのビューをロード
             # （タブ遅延ロードは「タブ間」の遅延であり、タブ内は全て表示）
-            for i, lazy_view in enumerate(self.lazy_views):
-                print(f"  ビュー {i+1}/{len(self.lazy_views)} をロード中...")
-                lazy_view.load_content()
+            # 一斉に開始するとCPU・回線を奪い合うため、優先度の高いペインから順に開始する
+            for lazy_view in self._load_order():
+                self._schedule_load(lazy_view, lambda v=lazy_view: self._load_view(v), priority)
             
             self.is_initialized = True
-            print("全てのビューのロードが完了しました")
+    
+    def _load_view(self, lazy_view: LazyWebView):
+        """ペインを読み込み（先読みの場合は段階的サスペンドの対象にする）"""
+        lazy_view.load_content()
+        # 非表示のまま読み込むため、通常の非表示タブと同様に段階的サスペンドの対象にする
+        if self.is_preloaded and self.settings.get('auto_suspend', True):
+            lazy_view.schedule_suspend()
+    
+    def preload(self):
+        """表示前にビューを先読み（予測プリロード）"""
+        if self.is_initialized:
+            return
+        self.is_preloaded = True
+        self.initialize_views(LoadScheduler.PRIORITY_PRELOAD)
+    
+    def cancel_preload(self):
+        """表示されないままのプリロードを取り消してビューを解放"""
+        if not self.is_preloaded:
+            return
+        print(f"プリロードを取り消し ({len(self.lazy_views)}個のビュー)")
+        for lazy_view in self.lazy_views:
+            if self.load_scheduler:
+                self.load_scheduler.cancel(lazy_view)
+            lazy_view.unload()
+        self.is_initialized = False
+        self.is_preloaded = False
     
     def on_tab_show(self):
         """タブが表示された時の処理"""
         self.initialize_views()
+        self.is_preloaded = False
         self.tab_activated.emit()
         
-        # サスペンド中のビューを再開
+        # サスペンド中のビューを再開（先読み待ちのペインは表示中のタブとして優先）
         for lazy_view in self.lazy_views:
+            if self.load_scheduler:
+                self.load_scheduler.promote(lazy_view)
             if lazy_view.is_view_loaded():
                 lazy_view.resume()
+            if self.lifecycle_manager:
+                self.lifecycle_manager.touch(lazy_view)
     
     def on_tab_hide(self):
         """タブが非表示になった時の処理"""
-        # 自動サスペンドが有効な場合のみ、ビューをサスペンド
-        # デフォルトはFalse（タブ切り替え時にビュー状態を維持）
-        if self.settings.get('auto_suspend', False):
+        # 自動サスペンドが有効な場合のみ、段階的サスペンド（凍結→破棄）を開始
+        # 凍結・破棄とLRUの順序はペインごとの最後の操作（タブの表示・入力）から数えるため、
+        # 操作していたペインほど長く残り、表示していただけのペインは先に止まる
+        if self.settings.get('auto_suspend', True):
             for i, lazy_view in enumerate(self.lazy_views):
                 if lazy_view.is_view_loaded():
-                    lazy_view.suspend()
+                    lazy_view.schedule_suspend()
+    
+    # 実行中のビューに反映する設定項目
+    LIFECYCLE_KEYS = ('freeze_timeout', 'suspend_timeout')
+    RETRY_KEYS = ('load_timeout', 'load_retry_base_delay', 'load_retry_max_delay',
+                  'load_retry_max_attempts', 'load_retry_cooldown')
+    CRASH_KEYS = ('crash_loop_max_crashes', 'crash_loop_window')
+    CACHE_KEYS = ('http_cache_type', 'http_cache_size_mb', 'http_cache_profile_sizes_mb')
+    
+    def apply_setting(self, key: str, value):
+        """設定の変更を作成済みのビュー・プロファイルに反映（再読み込みはしない）"""
+        if not self.is_built:
+            return  # 未作成のタブは作成時に最新の設定を使う
+        views = list(zip(self.services, self.lazy_views))
+        if key in self.LIFECYCLE_KEYS:
+            for service, lazy_view in views:
+                lazy_view.set_lifecycle_timeouts(*self._lifecycle_timeouts(service))
+        elif key in self.RETRY_KEYS:
+            for service, lazy_view in views:
+                lazy_view.set_retry_policy(*self._retry_policy(service))
+        elif key in self.CRASH_KEYS:
+            for _, lazy_view in views:
+                lazy_view.set_crash_policy(
+                    self.settings.get('crash_loop_max_crashes', 3),
+                    self.settings.get('crash_loop_window', 300)
+                )
+        elif key in self.CACHE_KEYS:
+            for service, profile in zip(self.services, self.profiles):
+                configure_http_cache(profile, *self._http_cache_config(service))
+        elif key == 'page_pool_size':
+            for pool in self.page_pools:
+                pool.set_capacity(value)
+        elif key == 'auto_suspend' and not self.isVisible():
+            for _, lazy_view in views:
+                if value:
+                    lazy_view.schedule_suspend()
+                else:
+                    lazy_view.cancel_scheduled_suspend()
     
     def reload_all(self):
-        """全てのビューを再読み込み"""
-        for lazy_view in self.lazy_views:
+        """全てのビューを再読み込み（優先度の高いペインから順に開始）"""
+        for lazy_view in self._load_order():
             if lazy_view.is_view_loaded():
-                web_view = lazy_view.get_web_view()
-                web_view.reload()
+                self._schedule_load(lazy_view, lazy_view.get_web_view().reload)
     
     def go_back_all(self):
         """全てのビューで戻る"""
-        for lazy_view in self.lazy_views:
+        for lazy_view in self._load_order():
             if lazy_view.is_view_loaded():
                 web_view = lazy_view.get_web_view()
-                if web_view.history().canGoBack():
-                    web_view.back()
+                self._schedule_load(lazy_view, lambda v=web_view: _navigate(v, -1))
     
     def go_forward_all(self):
         """全てのビューで進む"""
-        for lazy_view in self.lazy_views:
+        for lazy_view in self._load_order():
             if lazy_view.is_view_loaded():
                 web_view = lazy_view.get_web_view()
-                if web_view.history().canGoForward():
-                    web_view.forward()
+                self._schedule_load(lazy_view, lambda v=web_view: _navigate(v, 1))
     
     def _handle_download(self, download):
-        """ダウンロードリクエストのハンドリング"""
-        # ユーザーのダウンロードフォルダを取得
-        downloads_path = QStandardPaths.writableLocation(
-            QStandardPaths.StandardLocation.DownloadLocation
-        )
-        
-        # ファイル名の取得
-        file_name = download.downloadFileName()
-        
-        # Windowsで無効な文字を置換（: / \ ? * " < > |）
-        file_name = re.sub(r'[\\/:*?"<>|]', '_', file_name)
-        
-        # 拡張子がない場合の補完処理
-        base_name, ext = os.path.splitext(file_name)
-        if not ext:
-            mime_type = download.mimeType()
-            if mime_type:
-                # 一般的な画像形式のフォールバック
-                if mime_type == "image/png":
-                    ext = ".png"
-                elif mime_type == "image/jpeg":
-                    ext = ".jpg"
-                elif mime_type == "image/webp":
-                    ext = ".webp"
-                else:
-                    # その他の形式はmimetypesで推測
-                    guessed = mimetypes.guess_extension(mime_type)
-                    if guessed:
-                        ext = guessed
-            
-            # それでも拡張子がない場合、デフォルトでpngを試す（Geminiの画像生成用）
-            if not ext and "image" in str(mime_type):
-                 ext = ".png"
-                 
-            if ext:
-                file_name = f"{base_name}{ext}"
-        
-        file_path = os.path.join(downloads_path, file_name)
-        
-        # 同名ファイルが存在する場合は番号を付ける
-        counter = 1
-        base_name, ext = os.path.splitext(file_name)
-        while os.path.exists(file_path):
-            file_name = f"{base_name} ({counter}){ext}"
-            file_path = os.path.join(downloads_path, file_name)
-            counter += 1
-        
-        # ダウンロードパスを設定して開始
-        download.setDownloadDirectory(downloads_path)
-        download.setDownloadFileName(file_name)
-        download.accept()
-        
-        # ダウンロード状態の監視
-        download.stateChanged.connect(
-            lambda state: self._on_download_state_changed(state, download)
-        )
-        
-        print(f"ダウンロード開始: {file_name} -> {file_path}")
-    
-    def _on_download_state_changed(self, state, download):
-        """ダウンロード状態変更時の処理"""
-        if state == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
-            print(f"ダウンロード完了: {download.downloadFileName()}")
-        elif state == QWebEngineDownloadRequest.DownloadState.DownloadCancelled:
-            print(f"ダウンロードキャンセル: {download.downloadFileName()}")
-        elif state == QWebEngineDownloadRequest.DownloadState.DownloadInterrupted:
-            print(f"ダウンロード中断: {download.downloadFileName()}")
+        """ダウンロードリクエストのハンドリング（保存先の決定・後処理はDownloadManagerのワーカーで行う）"""
+        self.download_manager.add(download)
     
     def get_memory_info(self) -> dict:
         """メモリ情報を取得"""
@@ -280,6 +507,32 @@ class AIComparisonWidget(QWidget):
             'total_views': len(self.lazy_views),
             'loaded_views': sum(1 for v in self.lazy_views if v.is_view_loaded()),
             'suspended_views': sum(1 for v in self.lazy_views 
-                                  if v.is_view_loaded() and v.web_view.is_suspended)
+                                  if v.is_view_loaded() and v.web_view.is_suspended),
+            'frozen_views': sum(1 for v in self.lazy_views
+                               if v.is_view_loaded() and v.web_view.is_frozen),
+            'discarded_views': sum(1 for v in self.lazy_views
+                                  if v.is_view_loaded() and v.web_view.is_discarded),
+            'services': {}  # サービス名 -> レンダラーのメモリ・CPU・JSヒープ
         }
+        if self.lifecycle_manager:
+            for service, lazy_view in zip(self.services, self.lazy_views):
+                metrics = self.lifecycle_manager.get_view_metrics(lazy_view)
+                if metrics:
+                    info['services'][service.display_name] = metrics
         return info
+    
+    def get_block_counts(self) -> dict[str, int]:
+        """サービスごとのブロックしたリクエスト数"""
+        return {name: blocker.blocked_count for name, blocker in self.request_blockers.items()}
+
+
+def _navigate(web_view, step: int) -> bool:
+    """履歴を戻る・進む（移動できない場合はFalse）"""
+    history = web_view.history()
+    if step < 0 and history.canGoBack():
+        web_view.back()
+    elif step > 0 and history.canGoForward():
+        web_view.forward()
+    else:
+        return False
+    return True
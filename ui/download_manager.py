@@ -0,0 +1,314 @@
+"""
+AI比較アプリケーション - ダウンロード管理モジュール
+全プロファイルのダウンロードを1つのキューで管理し、同時にダウンロードする数を制限する。
+進捗・速度を通知し、キャンセル・再試行ができる。完了したファイルの保存先の決定（同名ファイルの回避）と
+後処理（WebP→PNG変換・メタデータ削除）はワーカースレッドで行い、UIスレッドを止めない
+"""
+
+import itertools
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QStandardPaths, QThreadPool, Signal
+from PySide6.QtGui import QImage
+from PySide6.QtWebEngineCore import QWebEngineDownloadRequest
+
+from utils.downloads import reserve_unique_path, strip_metadata, suggested_file_name
+
+
+DownloadState = QWebEngineDownloadRequest.DownloadState
+
+# ダウンロードの状態
+QUEUED = 'queued'  # 同時実行数の上限のため一時停止中
+DOWNLOADING = 'downloading'
+PROCESSING = 'processing'  # 保存先の決定・後処理中（ワーカースレッド）
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+MAX_FINISHED_ITEMS = 100  # 一覧に残す終了済みの項目数（古いものから除く）
+
+
+@dataclass(eq=False)
+class DownloadItem:
+    """1件のダウンロード"""
+    id: int
+    request: QWebEngineDownloadRequest
+    file_name: str  # 保存する名前（同名ファイルがあれば番号を付ける）
+    directory: Path
+    staging_path: Path  # ダウンロード中の一時的な名前
+    state: str = QUEUED
+    received_bytes: int = 0
+    total_bytes: int = -1  # 不明な場合は-1
+    bytes_per_second: float = 0.0
+    final_path: Optional[Path] = None
+    error: str = ""
+    created: float = field(default_factory=time.monotonic)
+    _speed_sample: tuple = (0.0, 0)  # 速度計算用 (時刻, 受信バイト数)
+
+    @property
+    def progress(self) -> Optional[float]:
+        """0〜1（サイズ不明の場合はNone）"""
+        if self.total_bytes <= 0:
+            return None
+        return min(self.received_bytes / self.total_bytes, 1.0)
+
+    @property
+    def is_active(self) -> bool:
+        return self.state in (QUEUED, DOWNLOADING, PROCESSING)
+
+
+def convert_webp_to_png(path: Path) -> Path:
+    """WebPをPNGに変換して元のファイルを削除（WebP以外・読み込めない場合はそのまま）"""
+    if path.suffix.lower() != '.webp':
+        return path
+    image = QImage(str(path))  # QImageはワーカースレッドでも使える
+    if image.isNull():
+        print(f"WebPを読み込めないため変換しません: {path.name}")
+        return path
+    png_path = path.with_suffix('.png')
+    if not image.save(str(png_path), 'PNG'):
+        raise OSError(f"PNGとして保存できません: {png_path}")
+    os.remove(path)
+    return png_path
+
+
+def _strip_metadata_processor(path: Path) -> Path:
+    strip_metadata(path)
+    return path
+
+
+class _FinalizeSignals(QObject):
+    finished = Signal(object, object, str)  # DownloadItem, 保存先Path（失敗時None）, エラー
+
+
+class _FinalizeTask(QRunnable):
+    """後処理を行い、同名ファイルと衝突しない名前で保存先に移動する（ワーカースレッドで実行）"""
+
+    def __init__(self, item: DownloadItem, processors: list, signals: _FinalizeSignals):
+        super().__init__()
+        self.item = item
+        self.processors = processors
+        self.signals = signals
+
+    def run(self):
+        path = self.item.staging_path
+        for processor in self.processors:
+            # 後処理は任意のため、失敗しても直前までのファイルをそのまま保存する
+            try:
+                path = processor(path)
+            except Exception as e:
+                print(f"ダウンロードの後処理に失敗（処理前のファイルを保存します）: {self.item.file_name} ({e})")
+        self.item.staging_path = path  # 保存に失敗した場合に残るファイル
+        # 後処理で拡張子が変わった場合（WebP→PNG）は保存する名前も合わせる
+        file_name = Path(self.item.file_name).stem + path.suffix
+        try:
+            final_path = reserve_unique_path(self.item.directory, file_name)
+        except OSError as e:
+            self.signals.finished.emit(self.item, None, str(e))
+            return
+        try:
+            os.replace(path, final_path)
+        except OSError as e:
+            try:
+                final_path.unlink(missing_ok=True)  # 確保した空のファイル
+            except OSError:
+                pass
+            self.signals.finished.emit(self.item, None, str(e))
+            return
+        self.signals.finished.emit(self.item, final_path, "")
+
+
+class DownloadManager(QObject):
+    """ダウンロードのキュー（同時実行数の制限・進捗・キャンセル・再試行・後処理）"""
+
+    item_added = Signal(object)  # DownloadItem
+    item_changed = Signal(object)  # 状態・進捗（進捗は progress_interval ごと）の変化
+    item_finished = Signal(object)  # 完了・失敗・キャンセル
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+
+        self.settings = settings
+        self.max_concurrent = settings.get('download_concurrency', 3)
+        self.progress_interval = 0.5  # 進捗の通知・速度の計算間隔（秒）
+        self.items: list[DownloadItem] = []
+        self._ids = itertools.count(1)
+        self._finalize_signals = _FinalizeSignals(self)
+        self._finalize_signals.finished.connect(self._on_finalized)
+        self.worker_pool = QThreadPool(self)
+        self.worker_pool.setMaxThreadCount(settings.get('download_workers', 2))
+
+    # --- 受け付け ---
+
+    def add(self, request: QWebEngineDownloadRequest) -> DownloadItem:
+        """プロファイルのdownloadRequestedで受け取ったダウンロードを受け付ける
+
+        一時的な名前（ダウンロードごとに一意）で開始し、同名ファイルの確認は完了後にワーカーで行う
+        """
+        directory = Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation))
+        file_name = suggested_file_name(request.downloadFileName(), request.mimeType())
+        item_id = next(self._ids)
+        staging_name = f".download-{os.getpid()}-{item_id}{Path(file_name).suffix}"
+        item = DownloadItem(item_id, request, file_name, directory, directory / staging_name)
+
+        request.setDownloadDirectory(str(directory))
+        request.setDownloadFileName(staging_name)
+        request.stateChanged.connect(lambda state: self._on_state_changed(item, state))
+        request.receivedBytesChanged.connect(lambda: self._on_progress(item))
+        request.totalBytesChanged.connect(lambda: self._on_progress(item))
+        request.accept()
+        self.items.append(item)
+
+        if self._running_count() < self.max_concurrent:
+            self._start(item)
+        else:
+            request.pause()
+            print(f"ダウンロード待機: {file_name} (同時{self.max_concurrent}件まで)")
+        self.item_added.emit(item)
+        return item
+
+    def _running_count(self) -> int:
+        return sum(1 for item in self.items if item.state == DOWNLOADING)
+
+    def _start(self, item: DownloadItem):
+        item.state = DOWNLOADING
+        item._speed_sample = (time.monotonic(), item.received_bytes)
+        if item.request.isPaused():
+            item.request.resume()
+        print(f"ダウンロード開始: {item.file_name} -> {item.directory}")
+        self.item_changed.emit(item)
+
+    def _pump(self):
+        """空きがあれば待機中のダウンロードを古い順に再開"""
+        for item in self.items:
+            if self._running_count() >= self.max_concurrent:
+                break
+            if item.state == QUEUED:
+                self._start(item)
+
+    def configure(self, max_concurrent: int):
+        """同時実行数を変更（減らした場合、実行中のものはそのまま）"""
+        self.max_concurrent = max_concurrent
+        self._pump()
+
+    # --- 進捗・状態 ---
+
+    def _on_progress(self, item: DownloadItem):
+        request = item.request
+        item.received_bytes = request.receivedBytes()
+        item.total_bytes = request.totalBytes()
+        now = time.monotonic()
+        sample_time, sample_bytes = item._speed_sample
+        if now - sample_time >= self.progress_interval:
+            item.bytes_per_second = (item.received_bytes - sample_bytes) / (now - sample_time)
+            item._speed_sample = (now, item.received_bytes)
+            self.item_changed.emit(item)
+
+    def _on_state_changed(self, item: DownloadItem, state):
+        if state == DownloadState.DownloadInProgress:
+            if item.state == QUEUED and not item.request.isPaused():
+                item.request.pause()  # 受け付け直後の一時停止が効かなかった場合
+        elif state == DownloadState.DownloadCompleted:
+            item.received_bytes = item.request.receivedBytes()
+            item.bytes_per_second = 0.0
+            item.state = PROCESSING
+            self.item_changed.emit(item)
+            self.worker_pool.start(_FinalizeTask(item, self._processors(), self._finalize_signals))
+            self._pump()
+        elif state == DownloadState.DownloadCancelled:
+            if item.state != CANCELLED:
+                self._discard_staging(item)
+                self._finish(item, CANCELLED)
+                print(f"ダウンロードキャンセル: {item.file_name}")
+        elif state == DownloadState.DownloadInterrupted:
+            self._discard_staging(item)
+            self._finish(item, FAILED, item.request.interruptReasonString())
+            print(f"ダウンロード中断: {item.file_name} ({item.error})")
+
+    def _processors(self) -> list[Callable[[Path], Path]]:
+        """設定で有効な後処理（順に適用し、それぞれ処理後のパスを返す）"""
+        processors = []
+        if self.settings.get('download_convert_webp', False):
+            processors.append(convert_webp_to_png)
+        if self.settings.get('download_strip_metadata', False):
+            processors.append(_strip_metadata_processor)
+        return processors
+
+    def _on_finalized(self, item: DownloadItem, final_path: Optional[Path], error: str):
+        if final_path is None:
+            # ダウンロード自体は完了しているため、一時的な名前のファイルは削除せずに残す
+            self._finish(item, FAILED, error)
+            print(f"ダウンロードの保存に失敗: {item.file_name} ({error}、データは {item.staging_path} に残しています)")
+            return
+        item.final_path = final_path
+        self._finish(item, COMPLETED)
+        print(f"ダウンロード完了: {final_path.name}")
+
+    def _finish(self, item: DownloadItem, state: str, error: str = ""):
+        item.state = state
+        item.error = error
+        item.bytes_per_second = 0.0
+        finished = [other for other in self.items if not other.is_active]
+        for other in finished[:-MAX_FINISHED_ITEMS]:
+            self.items.remove(other)
+        self.item_changed.emit(item)
+        self.item_finished.emit(item)
+        self._pump()
+
+    def _discard_staging(self, item: DownloadItem):
+        """キャンセル・中断したダウンロードの途中までのデータを削除"""
+        try:
+            item.staging_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    # --- 操作 ---
+
+    def cancel(self, item: DownloadItem):
+        """ダウンロードをキャンセル（待機中・ダウンロード中のみ）"""
+        if item.state in (QUEUED, DOWNLOADING):
+            self._discard_staging(item)
+            self._finish(item, CANCELLED)
+            item.request.cancel()
+            print(f"ダウンロードキャンセル: {item.file_name}")
+
+    def cancel_all(self):
+        for item in list(self.items):
+            self.cancel(item)
+
+    def retry(self, item: DownloadItem) -> bool:
+        """失敗・キャンセルしたダウンロードを、元のページから同じURLで再開（新しい項目として受け付ける）"""
+        if item.state not in (FAILED, CANCELLED):
+            return False
+        page = item.request.page()
+        if page is None:
+            print(f"再試行できません（ページが閉じられています）: {item.file_name}")
+            return False
+        self.items.remove(item)
+        page.download(item.request.url(), item.file_name)
+        return True
+
+    def shutdown(self):
+        """終了時に未完了のダウンロードを取り消し、後処理中のファイルの保存を待つ"""
+        self.cancel_all()
+        self.worker_pool.waitForDone(5000)
+
+    def clear_finished(self):
+        """完了・失敗・キャンセルした項目を一覧から除く"""
+        self.items = [item for item in self.items if item.is_active]
+
+    # --- 集計 ---
+
+    def summary(self) -> dict:
+        """実行中・待機中の件数と合計速度（バイト/秒）"""
+        return {
+            'downloading': sum(1 for item in self.items if item.state == DOWNLOADING),
+            'queued': sum(1 for item in self.items if item.state == QUEUED),
+            'processing': sum(1 for item in self.items if item.state == PROCESSING),
+            'failed': sum(1 for item in self.items if item.state == FAILED),
+            'bytes_per_second': sum(item.bytes_per_second for item in self.items if item.state == DOWNLOADING),
+        }
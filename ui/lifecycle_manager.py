@@ -0,0 +1,307 @@
+"""
+AI比較アプリケーション - ビューライフサイクル管理モジュール
+全てのLazyWebViewの使用履歴を一元管理し、メモリ予算を超えた場合に
+最も長く使われていないビューから破棄する
+"""
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .web_view import LazyWebView
+from .page_pool import PagePool
+from .metrics_sampler import MetricsSampler
+from models.ai_service import AIService
+from utils.process_metrics import ProcessMetricsCollector, MB
+
+
+class ViewLifecycleManager(QObject):
+    """全タブのビューを横断してメモリ予算を強制するマネージャー"""
+
+    view_discarded = Signal(object)  # 予算超過で破棄されたLazyWebView
+    budget_exceeded = Signal()  # 予算超過を検出した（破棄より先に通知）
+    budget_unresolved = Signal()  # 予算超過だが破棄できるビューが残っていない（子プロセスの終了などを促す）
+    timing_recorded = Signal(str, str, float)  # ロード計測値（サービス名, 指標名, ミリ秒）
+    view_event = Signal(str, str)  # ビューのイベント（サービス名, load / freeze / discard / resume）
+    metrics_updated = Signal(dict)  # バックグラウンド計測の結果を反映した（プロセスツリーのスナップショット）
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+
+        self.settings = settings
+        self._last_used: dict[LazyWebView, float] = {}  # ビュー -> 最終使用時刻（monotonic）
+        self._service_names: dict[LazyWebView, str] = {}
+        self._services: dict[LazyWebView, AIService] = {}  # ポリシー（固定・メモリ上限）の参照先
+        self.metrics = ProcessMetricsCollector()
+        self.view_metrics: dict[LazyWebView, dict] = {}  # 直近の計測結果
+        self.last_snapshot: dict = None
+        self.last_sample_time = 0.0
+        self.last_total_mb = 0.0
+
+        # プロセスツリーの計測はワーカースレッドで行い、結果だけをUIスレッドで受け取る
+        self.sampler = MetricsSampler(
+            self.settings.get('metrics_sample_interval', 2) * 1000,
+            self.settings.get('metrics_idle_interval', 10) * 1000,
+            self.settings.get('metrics_change_mb', 5),
+            self
+        )
+        self.sampler.snapshot_ready.connect(self._on_snapshot)
+        self.sampler.start()
+
+        # 予算チェックタイマー（直近の計測結果を使う）
+        self.check_interval = self.settings.get('memory_check_interval', 5) * 1000
+        self.check_timer = QTimer(self)
+        self.check_timer.timeout.connect(self.enforce_budget)
+        self.check_timer.start(self.check_interval)
+
+    def register(self, lazy_view: LazyWebView, service_name: str = "", service: AIService = None):
+        """ビューを管理対象に登録（serviceのポリシーは破棄の判断時に毎回参照するため、再読み込みも反映される）"""
+        self._last_used[lazy_view] = time.monotonic()
+        self._service_names[lazy_view] = service_name
+        if service is not None:
+            self._services[lazy_view] = service
+        lazy_view.destroyed.connect(lambda *_: self.unregister(lazy_view))
+        lazy_view.timing_recorded.connect(
+            lambda metric, value: self._on_timing_recorded(lazy_view, metric, value)
+        )
+        lazy_view.lifecycle_changed.connect(
+            lambda state: self._on_lifecycle_changed(lazy_view, state)
+        )
+
+    # ライフサイクル状態 -> 履歴に残すイベント名
+    LIFECYCLE_EVENTS = {'Frozen': 'freeze', 'Discarded': 'discard', 'Active': 'resume'}
+
+    def _on_timing_recorded(self, lazy_view: LazyWebView, metric: str, value: float):
+        service = self._service_names.get(lazy_view) or lazy_view.url
+        self.timing_recorded.emit(service, metric, value)
+        if metric == 'load_finished':
+            self.view_event.emit(service, 'load')
+
+    def _on_lifecycle_changed(self, lazy_view: LazyWebView, state: str):
+        event = self.LIFECYCLE_EVENTS.get(state)
+        if event:
+            self.view_event.emit(self._service_names.get(lazy_view) or lazy_view.url, event)
+
+    def unregister(self, lazy_view: LazyWebView):
+        """ビューを管理対象から外す"""
+        self._last_used.pop(lazy_view, None)
+        self._service_names.pop(lazy_view, None)
+        self._services.pop(lazy_view, None)
+        self.view_metrics.pop(lazy_view, None)
+
+    def touch(self, lazy_view: LazyWebView):
+        """ビューの最終使用時刻を更新"""
+        if lazy_view in self._last_used:
+            self._last_used[lazy_view] = time.monotonic()
+
+    def _renderer_views(self) -> dict[int, list[LazyWebView]]:
+        """レンダラーPID -> そのプロセスで動いているビュー（JSヒープの更新も依頼する）"""
+        pid_views: dict[int, list[LazyWebView]] = {}
+        for view in self._last_used:
+            if not view.is_view_loaded():
+                continue
+            pid = view.web_view.render_process_pid()
+            if pid:
+                pid_views.setdefault(pid, []).append(view)
+            view.web_view.request_js_heap_update()
+        return pid_views
+
+    def sample_metrics(self) -> dict:
+        """UIスレッドでプロセスツリーを同期的に計測して反映する（ベンチマーク用。通常はsamplerの結果を使う）"""
+        pid_views = self._renderer_views()
+        snapshot = self.metrics.sample_tree(full_pids=set(pid_views))
+        self.apply_snapshot(snapshot, pid_views)
+        return snapshot
+
+    def _on_snapshot(self, snapshot: dict):
+        """バックグラウンド計測の結果を受け取り、次回USS/PSSを取得するレンダラーを伝える"""
+        pid_views = self._renderer_views()
+        self.apply_snapshot(snapshot, pid_views)
+        self.sampler.set_full_pids(set(pid_views))
+        self.metrics_updated.emit(snapshot)
+
+    def apply_snapshot(self, snapshot: dict, pid_views: dict[int, list[LazyWebView]]):
+        """計測結果の各レンダラープロセスをビューに対応付ける
+
+        同じレンダラーを共有するビューには使用量を均等に按分する
+        """
+        view_metrics = {}
+        for pid, views in pid_views.items():
+            process = snapshot['processes'].get(pid)
+            if not process:
+                continue
+            share = len(views)
+            for view in views:
+                js_heap = view.web_view.js_heap_bytes
+                view_metrics[view] = {
+                    'service': self._service_names.get(view) or view.url,
+                    'pid': pid,
+                    'shared_with': share,
+                    'state': view.web_view.lifecycle_state.name,
+                    'rss_mb': process['rss_mb'] / share,
+                    'uss_mb': _divide(process['uss_mb'], share),
+                    'pss_mb': _divide(process['pss_mb'], share),
+                    'cpu_percent': process['cpu_percent'] / share,
+                    'js_heap_mb': js_heap / MB if js_heap is not None else None,
+                }
+
+        self.view_metrics = view_metrics
+        self.last_snapshot = snapshot
+        self.last_sample_time = time.monotonic()
+        self.last_total_mb = snapshot['total_rss_mb']
+
+    def get_view_metrics(self, lazy_view: LazyWebView) -> dict:
+        """ビューの直近の計測結果を取得（未計測の場合はNone）"""
+        return self.view_metrics.get(lazy_view)
+
+    def get_service_metrics(self) -> dict[str, dict]:
+        """サービス名ごとの直近の計測結果を取得"""
+        return {metrics['service']: metrics for metrics in self.view_metrics.values()}
+
+    def get_renderer_summary(self) -> dict:
+        """レンダラープロセスの数・合計RSSと、プロセスを共有するサービスのグループ
+
+        同じグループのサービスは、レンダラーがクラッシュすると同時に落ちる
+        """
+        groups: dict[int, list[str]] = {}
+        rss_mb = 0.0
+        for metrics in self.view_metrics.values():
+            pid = metrics['pid']
+            if pid not in groups:
+                groups[pid] = []
+                process = self.last_snapshot['processes'].get(pid) if self.last_snapshot else None
+                if process:
+                    rss_mb += process['rss_mb']
+            groups[pid].append(metrics['service'])
+        return {
+            'renderer_count': len(groups),
+            'renderer_rss_mb': rss_mb,
+            'shared_groups': [services for services in groups.values() if len(services) > 1],
+        }
+
+    def get_budget_mb(self) -> int:
+        """メモリ予算（MB）を取得。0以下は無制限"""
+        return self.settings.get('memory_budget_mb', 4096)
+
+    def has_headroom(self, required_mb: float) -> bool:
+        """直近の計測値に対して、予算内にrequired_mbの余裕があるか"""
+        budget = self.get_budget_mb()
+        if budget <= 0:
+            return True
+        return self.last_total_mb + required_mb <= budget
+
+    def last_used(self, lazy_view: LazyWebView) -> float:
+        """最終使用時刻（タブを表示した時刻とビュー内の操作のうち新しい方。タブを隠した時刻は含めない）"""
+        return max(self._last_used.get(lazy_view, 0.0), lazy_view.last_interaction())
+
+    def _is_pinned(self, lazy_view: LazyWebView) -> bool:
+        service = self._services.get(lazy_view)
+        return service is not None and service.pinned
+
+    def _discard_candidates(self) -> list[LazyWebView]:
+        """破棄可能なビューを最終使用時刻の古い順に返す"""
+        candidates = [
+            view for view in self._last_used
+            if view.is_view_loaded()
+            and not view.web_view.is_discarded  # 凍結中のビューもDOMを保持しているため対象
+            and not view.isVisible()  # 表示中のタブは対象外
+            and not self._is_pinned(view)  # 固定されたサービスは対象外
+        ]
+        return sorted(candidates, key=self.last_used)
+
+    def _over_memory_cap(self) -> tuple[LazyWebView, float, int]:
+        """サービスごとのメモリ上限を超えている破棄可能なビュー（(ビュー, 使用量MB, 上限MB)、無ければNone）"""
+        for view in self._discard_candidates():
+            service = self._services.get(view)
+            metrics = self.view_metrics.get(view)
+            if service is None or not service.memory_cap_mb or metrics is None:
+                continue
+            used_mb = next(metrics[key] for key in ('pss_mb', 'uss_mb', 'rss_mb') if metrics[key] is not None)
+            if used_mb > service.memory_cap_mb:
+                return view, used_mb, service.memory_cap_mb
+        return None
+
+    def enforce_budget(self):
+        """サービスごとのメモリ上限を超えた非表示のビュー、または合計メモリが予算を超えていればLRUのビューを1つ破棄"""
+        if not self.last_sample_time:
+            return  # まだ計測結果が無い
+
+        over_cap = self._over_memory_cap()
+        if over_cap:
+            victim, used_mb, cap_mb = over_cap
+            print(f"メモリ上限超過 ({used_mb:.0f}/{cap_mb} MB) - "
+                  f"{self._service_names.get(victim) or victim.url} を破棄")
+            victim.suspend()
+            self.view_discarded.emit(victim)
+            self.sampler.request_sample(1500)
+            return
+
+        budget = self.get_budget_mb()
+        if budget <= 0:
+            return
+        total_mb = self.last_total_mb
+        if total_mb <= budget:
+            if PagePool.refill_paused:
+                # 予算内に戻ったので予備ビューの補充を再開
+                PagePool.refill_paused = False
+                PagePool.prewarm_all(start_delay=self.check_interval)
+            self._restore_check_interval()
+            return
+
+        # プリロード中のタブを取り消してもらう
+        self.budget_exceeded.emit()
+
+        # まず予備ビューを手放し、予算内に戻るまで補充も止める
+        PagePool.refill_paused = True
+        if PagePool.drain_all():
+            print(f"メモリ予算超過 ({total_mb:.0f}/{budget} MB) - 予備ビューを破棄")
+            self.sampler.request_sample(1500)
+            self.check_timer.start(2000)
+            return
+
+        candidates = self._discard_candidates()
+        if not candidates:
+            print(f"⚠️ メモリ予算超過 ({total_mb:.0f}/{budget} MB) - 破棄できるビューがありません")
+            self._restore_check_interval()
+            self.budget_unresolved.emit()
+            return
+
+        victim = candidates[0]
+        idle_sec = time.monotonic() - self.last_used(victim)
+        print(f"メモリ予算超過 ({total_mb:.0f}/{budget} MB) - "
+              f"{self._service_names.get(victim) or victim.url} を破棄 (未使用 {idle_sec:.0f}秒)")
+        victim.suspend()
+        self.view_discarded.emit(victim)
+
+        # レンダラー終了を待って短い間隔で再計測し、まだ超過していれば次を破棄
+        self.sampler.request_sample(1500)
+        self.check_timer.start(2000)
+
+    def apply_setting(self, key: str, value):
+        """設定の変更を実行中に反映"""
+        if key == 'memory_check_interval':
+            self.check_interval = value * 1000
+            self.check_timer.start(self.check_interval)
+        elif key in ('metrics_sample_interval', 'metrics_idle_interval', 'metrics_change_mb'):
+            self.sampler.set_intervals(
+                self.settings.get('metrics_sample_interval', 2) * 1000,
+                self.settings.get('metrics_idle_interval', 10) * 1000,
+                self.settings.get('metrics_change_mb', 5)
+            )
+        elif key == 'memory_budget_mb':
+            self.enforce_budget()
+
+    def shutdown(self):
+        """計測スレッドを停止（ウィンドウを閉じる時）"""
+        self.check_timer.stop()
+        self.sampler.stop()
+
+    def _restore_check_interval(self):
+        """再計測用の短い間隔から通常のチェック間隔に戻す"""
+        if self.check_timer.interval() != self.check_interval:
+            self.check_timer.start(self.check_interval)
+
+
+def _divide(value, divisor):
+    """Noneを許容する除算"""
+    return value / divisor if value is not None else None
@@ -0,0 +1,139 @@
+"""
+AI比較アプリケーション - ロードスケジューラーモジュール
+複数ペインの読み込み・再読み込みを同時実行数の上限つきで順番に開始し、
+先に開始したペインが描画を始める（First Paint）か一定時間が経つまで次を待たせる
+"""
+
+import itertools
+
+from PySide6.QtCore import QObject, QTimer
+
+from .web_view import LazyWebView
+
+
+class _LoadJob:
+    """スケジューラーの待ち行列に入る1件の読み込み"""
+
+    def __init__(self, lazy_view: LazyWebView, start, priority: int, seq: int):
+        self.lazy_view = lazy_view
+        self.start = start  # 読み込みを開始する関数（Falseを返した場合は読み込みが始まらなかったとみなす）
+        self.priority = priority
+        self.seq = seq
+        self.timer: QTimer = None
+        self.connections = []  # (シグナル, スロット)
+
+    @property
+    def sort_key(self):
+        return self.priority, self.seq
+
+
+class LoadScheduler(QObject):
+    """全タブ共通のペイン読み込みスケジューラー"""
+
+    PRIORITY_VISIBLE = 0  # 表示中のタブ
+    PRIORITY_PRELOAD = 10  # 先読み
+
+    # 次のペインを開始してよい合図とする計測値
+    FIRST_PAINT_METRICS = ('first_paint', 'first_contentful_paint')
+
+    def __init__(self, max_concurrent: int = 1, release_timeout: int = 3000, parent=None):
+        super().__init__(parent)
+
+        self.max_concurrent = max_concurrent  # 同時に読み込みを開始している（描画前の）ペイン数の上限
+        self.release_timeout = release_timeout  # 描画を待つ上限（ミリ秒）
+        self._pending: list[_LoadJob] = []
+        self._running: dict[LazyWebView, _LoadJob] = {}
+        self._seq = itertools.count()
+
+    def configure(self, max_concurrent: int, release_timeout: int):
+        """同時実行数と描画を待つ上限を変更（実行中のペインの待ち時間はそのまま）"""
+        self.max_concurrent = max_concurrent
+        self.release_timeout = release_timeout
+        self._pump()
+
+    def schedule(self, lazy_view: LazyWebView, start, priority: int = PRIORITY_VISIBLE):
+        """ペインの読み込みを予約（同じペインの予約は置き換える）"""
+        self._remove_pending(lazy_view)
+        self._pending.append(_LoadJob(lazy_view, start, priority, next(self._seq)))
+        self._pending.sort(key=lambda job: job.sort_key)
+        self._pump()
+
+    def promote(self, lazy_view: LazyWebView, priority: int = PRIORITY_VISIBLE):
+        """予約済みのペインの優先度を上げる（先読み中のタブが表示された場合など）"""
+        for job in self._pending:
+            if job.lazy_view is lazy_view and job.priority > priority:
+                job.priority = priority
+        self._pending.sort(key=lambda job: job.sort_key)
+        self._pump()
+
+    def cancel(self, lazy_view: LazyWebView):
+        """ペインの予約を取り消し、実行中であれば枠を空ける"""
+        self._remove_pending(lazy_view)
+        job = self._running.get(lazy_view)
+        if job:
+            self._release(job)
+
+    def is_pending(self, lazy_view: LazyWebView) -> bool:
+        """読み込み開始待ちかどうか"""
+        return any(job.lazy_view is lazy_view for job in self._pending)
+
+    def _remove_pending(self, lazy_view: LazyWebView):
+        self._pending = [job for job in self._pending if job.lazy_view is not lazy_view]
+
+    def _pump(self):
+        """空いている枠の分だけ、優先度の高い順に読み込みを開始"""
+        while self._pending and len(self._running) < max(self.max_concurrent, 1):
+            job = self._pending.pop(0)
+            try:
+                self._start(job)
+            except RuntimeError as e:
+                print(f"ペインの読み込みを開始できません（削除済み）: {e}")
+                self._release(job)
+
+    def _start(self, job: _LoadJob):
+        """読み込みを開始し、描画開始・ロード完了・時間切れのいずれかで枠を空ける"""
+        previous = self._running.get(job.lazy_view)
+        if previous is not None:
+            # 読み込み中に再読み込みした場合は前の読み込みの接続・タイマーを外してから置き換える
+            self._release(previous)
+        self._running[job.lazy_view] = job
+
+        def on_timing(metric, value):
+            if metric in self.FIRST_PAINT_METRICS:
+                self._release(job)
+
+        job.connections.append((job.lazy_view.timing_recorded, on_timing))
+        job.connections.append((job.lazy_view.destroyed, lambda *_: self._release(job)))
+        job.timer = QTimer(self)
+        job.timer.setSingleShot(True)
+        job.timer.timeout.connect(lambda: self._release(job))
+        job.timer.start(self.release_timeout)
+        for signal, slot in job.connections:
+            signal.connect(slot)
+
+        if job.start() is False:
+            self._release(job)
+            return
+
+        # ページ側の計測が使えない場合（about:blank・WebChannel無し）はロード完了で枠を空ける
+        web_view = job.lazy_view.web_view
+        if web_view is not None and job.lazy_view in self._running:
+            slot = lambda ok: self._release(job)
+            web_view.loadFinished.connect(slot)
+            job.connections.append((web_view.loadFinished, slot))
+
+    def _release(self, job: _LoadJob):
+        """実行中の枠を空けて次を開始"""
+        if self._running.get(job.lazy_view) is not job:
+            return
+        del self._running[job.lazy_view]
+        if job.timer is not None:
+            job.timer.stop()
+            job.timer.deleteLater()
+        for signal, slot in job.connections:
+            try:
+                signal.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass  # ビューが既に削除されている
+        job.connections.clear()
+        QTimer.singleShot(0, self._pump)
@@ -2,35 +2,90 @@
 AI比較アプリケーション - メインウィンドウモジュール
 """
 
-import psutil
 import webbrowser
 from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QEvent, QByteArray
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QMainWindow, QTabWidget, QStatusBar,
-    QLabel, QStyle, QToolButton, QHBoxLayout, QWidget
+    QLabel, QMenu, QStyle, QToolButton, QHBoxLayout, QWidget
 )
 
 from .comparison_widget import AIComparisonWidget
 from .comparison_widget import AIComparisonWidget
 from .web_editor_widget import WebEditorWidget
 from .sora_widget import SoraWidget
+from .lifecycle_manager import ViewLifecycleManager
+from .load_scheduler import LoadScheduler
+from .metrics_timeline import MetricsHistoryDialog
+from .settings_watcher import ServiceRegistryWatcher, SettingsWatcher
+from .download_manager import CANCELLED, FAILED, PROCESSING, DownloadManager
+from .page_pool import PagePool
 from models.ai_service import AIServiceManager
 from utils.settings import Settings
+from utils.usage_stats import TabUsageModel
+from utils.load_metrics import LoadMetricsStore
+from utils.metrics_history import MetricsHistory, rotate_history_file
+from utils.storage_manager import StorageManager, qt_default_cache_root
 
 
 class MainWindow(QMainWindow):
     """メインウィンドウクラス"""
     
-    def __init__(self):
+    def __init__(self, settings: Settings = None, ai_manager: AIServiceManager = None):
         super().__init__()
         
-        # 設定とモデルの初期化
-        self.settings = Settings()
-        self.ai_manager = AIServiceManager()
+        # 設定とモデルの初期化（パフォーマンスプロファイル適用済みの設定を受け取る）
+        self.settings = settings or Settings()
+        self.ai_manager = ai_manager or AIServiceManager()
+        
+        # 全ビュー共通のメモリ予算管理
+        self.lifecycle_manager = ViewLifecycleManager(self.settings, self)
+        
+        # プロファイルフォルダの使用量管理（起動が落ち着いてから、以前のバージョンのキャッシュと
+        # 未使用のプロファイルの古いキャッシュを削除）
+        self.storage_manager = StorageManager.from_settings(self.settings, qt_default_cache_root())
+        if self.settings.get('storage_auto_prune', True):
+            self.storage_manager.start_background_prune(self.settings.get('storage_prune_delay', 60))
+        
+        # 全タブ共通のダウンロードキュー（同時実行数の制限・保存先の決定と後処理はワーカースレッド）
+        self.download_manager = DownloadManager(self.settings, self)
+        
+        # 全タブ共通のペイン読み込みスケジューラー（一斉に読み込んでCPU・回線を奪い合うのを防ぐ）
+        self.load_scheduler = LoadScheduler(
+            self.settings.get('load_concurrency', 1),
+            self.settings.get('load_stagger_timeout', 3) * 1000,
+            self
+        )
+        
+        # タブ切り替え履歴（予測プリロード用）
+        self.tab_usage = TabUsageModel(self.settings.get('tab_usage'))
+        self._previous_tab_index = -1
+        self._usage_changes = 0
+        self._hovered_tab_index = -1
+        
+        # サービスごとのロード時間統計（プリロード対象の判断・性能劣化の検出用）
+        self.load_metrics = LoadMetricsStore(
+            self.settings.config_dir / 'load_metrics.json',
+            max_samples=self.settings.get('load_metrics_max_samples', 200)
+        )
+        self.lifecycle_manager.timing_recorded.connect(self.load_metrics.record)
+        
+        # メモリ・CPU・ビューのイベントの履歴（異常終了しても残るよう設定フォルダのファイルにメモリマップ）
+        history_path = None
+        if self.settings.get('metrics_history_file', True):
+            history_path = self.settings.config_dir / 'metrics_history.bin'
+            rotate_history_file(history_path)  # 前回セッションの履歴は .prev.bin に残す
+        self.metrics_history = MetricsHistory(
+            self.settings.get('metrics_history_capacity', 3600), path=history_path
+        )
+        self.lifecycle_manager.metrics_updated.connect(self._record_metrics_history)
+        self.lifecycle_manager.view_event.connect(
+            lambda service, kind: self.metrics_history.add_event(kind, service)
+        )
+        self.history_dialog: MetricsHistoryDialog = None
         
         # ウィンドウ設定
         self.setWindowTitle("AI比較アプリケーション")
@@ -44,62 +99,90 @@ class MainWindow(QMainWindow):
         # ウィンドウジオメトリの復元
         self._restore_geometry()
         
-        # メモリ監視タイマー
-        self.memory_timer = QTimer(self)
-        self.memory_timer.timeout.connect(self._update_memory_status)
-        self.memory_timer.start(2000)  # 2秒ごとに更新
+        # セッション（アクティブタブ・ペインのURL・スプリッターのサイズ）は定期的にも保存（異常終了に備える）
+        self.session_timer = QTimer(self)
+        self.session_timer.timeout.connect(self._save_session)
+        self.session_timer.start(self.settings.get('session_save_interval', 60) * 1000)
+        
+        # メモリ表示（計測はワーカースレッド、表示は値が表示の区切りをまたいだ時だけ更新）
+        self._memory_display = None
+        self.lifecycle_manager.metrics_updated.connect(self._update_memory_status)
+        
+        # 予測プリロード（操作が落ち着いてから、次に開かれそうなタブを先読み）
+        self.preload_timer = QTimer(self)
+        self.preload_timer.setSingleShot(True)
+        self.preload_timer.timeout.connect(self._preload_predicted_tab)
+        self.hover_preload_timer = QTimer(self)
+        self.hover_preload_timer.setSingleShot(True)
+        self.hover_preload_timer.timeout.connect(self._preload_hovered_tab)
+        self.tab_widget.tabBar().setMouseTracking(True)
+        self.tab_widget.tabBar().installEventFilter(self)
+        self.lifecycle_manager.budget_exceeded.connect(self._cancel_preloads)
+        self.lifecycle_manager.budget_exceeded.connect(self._teardown_idle_tabs)
+        self.lifecycle_manager.budget_unresolved.connect(self._shutdown_idle_sora)
+        self._tore_down_tabs = False  # 直近の予算超過でタブを解放した（解放後の計測を待つ）
+        self._schedule_predictive_preload()
+        
+        # 設定の変更（settings.jsonの外部編集を含む）を再起動せずに反映
+        self.settings_watcher = SettingsWatcher(self.settings, self)
+        self.settings_watcher.setting_changed.connect(self.lifecycle_manager.apply_setting)
+        self.settings_watcher.setting_changed.connect(self._apply_setting)
+        # サービス定義（services.json）のポリシーの変更も同様に反映
+        self.service_watcher = ServiceRegistryWatcher(self.ai_manager, self)
+        for index in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, AIComparisonWidget):
+                self.settings_watcher.setting_changed.connect(widget.apply_setting)
+                self.service_watcher.policies_changed.connect(widget.apply_service_policies)
         
         # スタイルシートの適用
         self._apply_stylesheet()
     
+    def _apply_setting(self, key: str, value):
+        """ウィンドウが持つタイマー・表示・スケジューラーに設定の変更を反映"""
+        if key in ('load_concurrency', 'load_stagger_timeout'):
+            self.load_scheduler.configure(
+                self.settings.get('load_concurrency', 1),
+                self.settings.get('load_stagger_timeout', 3) * 1000
+            )
+        elif key in ('memory_warning_threshold', 'memory_display_step_mb'):
+            self._memory_display = None  # 次の表示で必ず描き直す
+            self._update_memory_status()
+        elif key in ('storage_quota_mb', 'storage_max_age_days', 'storage_prune_indexeddb'):
+            # 次の削除（起動時・CLI）から反映
+            self.storage_manager.quota_mb = self.settings.get('storage_quota_mb', 1024)
+            self.storage_manager.max_age_days = self.settings.get('storage_max_age_days', 30)
+            self.storage_manager.prune_indexeddb = self.settings.get('storage_prune_indexeddb', False)
+        elif key == 'download_concurrency':
+            self.download_manager.configure(value)
+        elif key == 'session_save_interval':
+            self.session_timer.start(value * 1000)
+        elif key in ('predictive_preload', 'preload_idle_delay'):
+            self.preload_timer.stop()
+            self._schedule_predictive_preload()
+    
     def _init_ui(self):
         """UIの初期化"""
         # タブウィジェットの作成
         self.tab_widget = QTabWidget()
-        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
-        # 文章AI比較タブ
-        text_ai_services = self.ai_manager.get_all_text_ai_services()
-        self.text_ai_widget = AIComparisonWidget(
-            text_ai_services, 
-            self.settings, 
-            self
-        )
-        self.tab_widget.addTab(self.text_ai_widget, "AIアシスタント")
+        # 前回セッション（各タブは構築時に復元先のURL・サイズを使う）
+        session = self.settings.get('session') if self.settings.get('session_restore', True) else None
+        session = session if isinstance(session, dict) else {}
+        tab_states = session.get('tabs') if isinstance(session.get('tabs'), dict) else {}
         
-        # 画像AI比較タブ
-        image_ai_services = self.ai_manager.get_all_image_ai_services()
-        self.image_ai_widget = AIComparisonWidget(
-            image_ai_services, 
-            self.settings, 
-            self,
-            custom_sizes=[2, 1]  # ImageFX:DeepL = 2:1
-        )
-        self.tab_widget.addTab(self.image_ai_widget, "音楽や動画など(Test版)")
-        
-        # 音声要約などタブ
-        audio_ai_services = self.ai_manager.get_all_audio_ai_services()
-        self.audio_ai_widget = AIComparisonWidget(
-            audio_ai_services, 
-            self.settings, 
-            self
-        )
-        self.tab_widget.addTab(self.audio_ai_widget, "音声や資料の要約")
+        # 比較タブ（サービスとタブのグループは models/services.json で定義）
+        self.text_ai_widget = self._add_comparison_tab('text')  # 文章AI比較タブ
+        self.image_ai_widget = self._add_comparison_tab('image')  # 画像AI比較タブ
+        self.audio_ai_widget = self._add_comparison_tab('audio')  # 音声要約などタブ
         
-        # 動画生成AIタブ（タブ4）
         # 動画生成AIタブ（タブ4）
         # Sora専用のWebView2ランチャーを使用
         self.video_ai_widget = SoraWidget(self)
-        self.tab_widget.addTab(self.video_ai_widget, "動画生成")
+        self.tab_widget.addTab(self.video_ai_widget, self.ai_manager.get_group('video').title)
         
         # 開発者AIタブ（タブ5）
-        developer_ai_services = self.ai_manager.get_all_developer_ai_services()
-        self.developer_ai_widget = AIComparisonWidget(
-            developer_ai_services, 
-            self.settings, 
-            self
-        )
-        self.tab_widget.addTab(self.developer_ai_widget, "開発者用")
+        self.developer_ai_widget = self._add_comparison_tab('developer')
         
         # 画像編集(WEB)タブ - 外部ブラウザで開くボタン
         self.web_editor_widget = WebEditorWidget(self)
@@ -108,8 +191,37 @@ class MainWindow(QMainWindow):
         # 中央ウィジェットとして設定
         self.setCentralWidget(self.tab_widget)
         
-        # 最初のタブを初期化
-        self.text_ai_widget.initialize_views()
+        for index in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, AIComparisonWidget):
+                widget.set_restore_state(tab_states.get(self.tab_widget.tabText(index)))
+        
+        # 前回のアクティブタブだけをすぐに読み込む（切り替えの通知は、最初のタブを読み込まないよう選択後に接続）
+        for index in range(self.tab_widget.count()):
+            if self.tab_widget.tabText(index) == session.get('active_tab'):
+                self.tab_widget.setCurrentIndex(index)
+                break
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        self._on_tab_changed(self.tab_widget.currentIndex())
+        
+        # 落ち着いてから各プロファイルの予備ビューを事前生成
+        PagePool.prewarm_all()
+    
+    def _add_comparison_tab(self, group_id: str) -> AIComparisonWidget:
+        """サービスのグループを横並びで比較するタブを追加"""
+        group = self.ai_manager.get_group(group_id)
+        widget = AIComparisonWidget(
+            group.services,
+            self.settings,
+            self,
+            custom_sizes=group.splitter_sizes,
+            lifecycle_manager=self.lifecycle_manager,
+            load_scheduler=self.load_scheduler,
+            storage_manager=self.storage_manager,
+            download_manager=self.download_manager
+        )
+        self.tab_widget.addTab(widget, group.title)
+        return widget
     
     def _create_tab_corner_controls(self):
         """タブバー右側のコントロールを作成"""
@@ -165,6 +277,14 @@ class MainWindow(QMainWindow):
         reload_btn.setStyleSheet(btn_style)
         layout.addWidget(reload_btn)
         
+        # メモリ・CPUの履歴ボタン
+        history_btn = QToolButton()
+        history_btn.setText("📈")
+        history_btn.setToolTip("メモリ・CPUの履歴")
+        history_btn.clicked.connect(self._show_metrics_history)
+        history_btn.setStyleSheet(btn_style)
+        layout.addWidget(history_btn)
+        
         # 音量ミュートボタン（強調カラー）
         volume_btn_style = """
             QToolButton {
@@ -209,12 +329,67 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("準備完了")
         statusbar.addWidget(self.status_label)
         
+        # サービスごとのメモリ使用量ラベル（表示中のタブ）
+        self.service_memory_label = QLabel()
+        self.service_memory_label.setStyleSheet("font-size: 11px; color: #A0A0A0;")
+        statusbar.addPermanentWidget(self.service_memory_label)
+        
+        # ダウンロードの状況（クリックでキャンセル・再試行のメニュー）
+        self.download_button = QToolButton()
+        self.download_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.download_button.setStyleSheet("font-size: 11px; padding: 2px 6px;")
+        self.download_menu = QMenu(self.download_button)
+        self.download_menu.aboutToShow.connect(self._build_download_menu)
+        self.download_button.setMenu(self.download_menu)
+        self.download_button.hide()
+        statusbar.addPermanentWidget(self.download_button)
+        self.download_manager.item_changed.connect(self._update_download_status)
+        
         # メモリ使用量ラベル
         self.memory_label = QLabel()
         statusbar.addPermanentWidget(self.memory_label)
         
         self._update_memory_status()
     
+    def _update_download_status(self, item=None):
+        """ダウンロード中・待機中の件数と合計速度を表示（何も無ければ隠す）"""
+        summary = self.download_manager.summary()
+        active = summary['downloading'] + summary['queued'] + summary['processing']
+        if not active and not summary['failed']:
+            self.download_button.hide()
+            return
+        text = f"⬇ {active}件"
+        if summary['queued']:
+            text += f"（待機 {summary['queued']}）"
+        if summary['bytes_per_second']:
+            text += f" {summary['bytes_per_second'] / (1024 * 1024):.1f} MB/s"
+        if summary['failed']:
+            text += f" ⚠️ 失敗 {summary['failed']}"
+        if text != self.download_button.text():
+            self.download_button.setText(text)
+        self.download_button.show()
+    
+    def _build_download_menu(self):
+        """ダウンロードの一覧メニュー（実行中・待機中はキャンセル、失敗・キャンセルは再試行）"""
+        self.download_menu.clear()
+        manager = self.download_manager
+        for item in reversed(manager.items[-20:]):
+            if item.state == PROCESSING:
+                self.download_menu.addAction(f"{item.file_name} - 保存中").setEnabled(False)
+            elif item.is_active:
+                progress = f"{item.progress:.0%}" if item.progress is not None else f"{item.received_bytes // 1024} KB"
+                action = self.download_menu.addAction(f"{item.file_name} - {progress}（クリックでキャンセル）")
+                action.triggered.connect(lambda _=False, i=item: manager.cancel(i))
+            elif item.state in (FAILED, CANCELLED):
+                reason = '失敗' if item.state == FAILED else 'キャンセル'
+                action = self.download_menu.addAction(f"{item.file_name} - {reason}（クリックで再試行）")
+                action.triggered.connect(lambda _=False, i=item: manager.retry(i))
+            else:
+                self.download_menu.addAction(f"✓ {item.final_path.name}").setEnabled(False)
+        self.download_menu.addSeparator()
+        clear_action = self.download_menu.addAction("終了した項目を消去")
+        clear_action.triggered.connect(lambda: (manager.clear_finished(), self._update_download_status()))
+    
     def _apply_stylesheet(self):
         """スタイルシートの適用"""
         qss = """
@@ -293,10 +468,117 @@ class MainWindow(QMainWindow):
         elif isinstance(current_widget, WebEditorWidget):
             current_widget.on_tab_show()
         
+        # 切り替え履歴を記録し、次のタブの先読みを予約
+        self._record_tab_switch(index)
+        
         # 説明文を更新
         self._update_title_description()
         self._update_status_message()
     
+    def _record_tab_switch(self, index: int):
+        """タブ切り替えを履歴に記録"""
+        previous = self._previous_tab_index
+        self._previous_tab_index = index
+        if previous >= 0 and previous != index:
+            self.tab_usage.record(self.tab_widget.tabText(previous), self.tab_widget.tabText(index))
+            self._usage_changes += 1
+            if self._usage_changes >= 10:
+                self._save_tab_usage()
+        if hasattr(self, 'preload_timer'):
+            self._schedule_predictive_preload()
+    
+    def _save_tab_usage(self):
+        """タブ切り替え履歴を保存"""
+        self.settings.set('tab_usage', self.tab_usage.to_dict())
+        self._usage_changes = 0
+    
+    def _schedule_predictive_preload(self):
+        """予測プリロードを予約（切り替えのたびにやり直す）"""
+        if self.settings.get('predictive_preload', True):
+            self.preload_timer.start(self.settings.get('preload_idle_delay', 5) * 1000)
+    
+    def _preload_predicted_tab(self):
+        """現在のタブから次に開かれる可能性が高いタブを先読み"""
+        prediction = self.tab_usage.predict(self.tab_widget.tabText(self.tab_widget.currentIndex()))
+        if not prediction:
+            return
+        tab_text, probability = prediction
+        if probability < self.settings.get('preload_min_probability', 0.3):
+            return
+        for index in range(self.tab_widget.count()):
+            if self.tab_widget.tabText(index) == tab_text:
+                self._preload_tab(index, f"予測 {probability:.0%}")
+                break
+    
+    def _preload_hovered_tab(self):
+        """マウスを乗せたタブを先読み（クリックされる可能性が高い）"""
+        if self._hovered_tab_index >= 0 and self.settings.get('predictive_preload', True):
+            self._preload_tab(self._hovered_tab_index, "ホバー")
+    
+    def _preload_tab(self, index: int, reason: str):
+        """メモリ予算に余裕があればタブのビューを先読み"""
+        widget = self.tab_widget.widget(index)
+        if (index == self.tab_widget.currentIndex()
+                or not isinstance(widget, AIComparisonWidget) or widget.is_initialized
+                or not widget.can_preload()):
+            return
+        required_mb = self.settings.get('preload_estimated_view_mb', 300) * len(widget.services)
+        if not self.lifecycle_manager.has_headroom(required_mb):
+            print(f"プリロード見送り（メモリ予算不足）: {self.tab_widget.tabText(index)}")
+            return
+        print(f"プリロード開始 ({reason}): {self.tab_widget.tabText(index)}")
+        widget.preload()
+    
+    def _cancel_preloads(self):
+        """メモリ予算超過時に、まだ表示されていないプリロードを取り消す"""
+        self.preload_timer.stop()
+        self.hover_preload_timer.stop()
+        for index in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, AIComparisonWidget):
+                widget.cancel_preload()
+    
+    def _teardown_idle_tabs(self):
+        """メモリ予算超過時に、非表示で全ビューが破棄済みのタブのプロファイルと子プロセスを解放"""
+        current = self.tab_widget.currentWidget()
+        self._tore_down_tabs = False
+        for index in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            if widget is not current and isinstance(widget, AIComparisonWidget) and widget.can_teardown():
+                widget.teardown()
+                self._tore_down_tabs = True
+        if self._tore_down_tabs:
+            # 解放した分を再計測してから、まだ超過していればビューの破棄・Soraの終了を判断する
+            self.lifecycle_manager.sampler.request_sample(1500)
+    
+    def _shutdown_idle_sora(self):
+        """破棄できるビューが無くなっても予算を超えている場合に、非表示でアイドルのSoraを終了"""
+        if self._tore_down_tabs:
+            return  # 同じチェックで解放したタブの分がまだ計測に反映されていない
+        sora = self.video_ai_widget
+        if sora is self.tab_widget.currentWidget() or not sora.is_running():
+            return
+        if sora.is_idle(self.settings.get('sora_idle_shutdown_delay', 120),
+                        self.settings.get('sora_idle_cpu_percent', 5)):
+            print("メモリ予算超過 - 非表示でアイドルのSoraを終了")
+            sora.shutdown()
+    
+    def eventFilter(self, obj, event):
+        """タブバーのホバーを検出"""
+        if obj is self.tab_widget.tabBar():
+            if event.type() == QEvent.Type.MouseMove:
+                index = obj.tabAt(event.position().toPoint())
+                if index != self._hovered_tab_index:
+                    self._hovered_tab_index = index
+                    if index >= 0 and index != self.tab_widget.currentIndex():
+                        self.hover_preload_timer.start(self.settings.get('preload_hover_delay', 300))
+                    else:
+                        self.hover_preload_timer.stop()
+            elif event.type() == QEvent.Type.Leave:
+                self._hovered_tab_index = -1
+                self.hover_preload_timer.stop()
+        return super().eventFilter(obj, event)
+    
     def _go_back(self):
         """戻る"""
         current_widget = self.tab_widget.currentWidget()
@@ -315,27 +597,125 @@ class MainWindow(QMainWindow):
         if isinstance(current_widget, AIComparisonWidget):
             current_widget.reload_all()
     
-    def _update_memory_status(self):
-        """メモリ使用状況を更新"""
+    def _update_memory_status(self, snapshot: dict = None):
+        """メモリ使用状況の表示を更新（メインプロセス＋全レンダラープロセス）
+
+        計測はViewLifecycleManagerのバックグラウンドスレッドで行われ、ここでは直近の結果を表示するだけ。
+        表示単位（memory_display_step_mb）に丸めた値か警告状態が変わった時だけラベルを書き換える
+        """
+        if not self.lifecycle_manager.last_sample_time:
+            self.memory_label.setText("メモリ: 計測中")
+            return
         try:
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / 1024 / 1024
+            memory_mb = self.lifecycle_manager.last_total_mb
+            step = max(self.settings.get('memory_display_step_mb', 10), 1)
             
             # メモリ警告の確認
             threshold = self.settings.get('memory_warning_threshold', 6144)
-            if memory_mb > threshold:
-                color = "#FF9800"  # 警告色
-                status = "⚠️"
-            else:
-                color = "#4CAF50"  # 成功色
-                status = "✓"
-            
-            self.memory_label.setText(
-                f"{status} メモリ: {memory_mb:.0f} MB"
-            )
-            self.memory_label.setStyleSheet(f"color: {color}; font-size: 11px;")
+            display = (round(memory_mb / step) * step, memory_mb > threshold)
+            if display != self._memory_display:
+                shown_mb, warning = display
+                if warning:
+                    color = "#FF9800"  # 警告色
+                    status = "⚠️"
+                else:
+                    color = "#4CAF50"  # 成功色
+                    status = "✓"
+                
+                self.memory_label.setText(
+                    f"{status} メモリ: {shown_mb:.0f} MB"
+                )
+                if self._memory_display is None or self._memory_display[1] != warning:
+                    self.memory_label.setStyleSheet(f"color: {color}; font-size: 11px;")
+                self._memory_display = display
+            self._update_service_memory()
         except Exception as e:
+            print(f"メモリ使用量の表示を更新できません: {e}")
             self.memory_label.setText(f"メモリ: N/A")
+            self._memory_display = None
+    
+    def _record_metrics_history(self, snapshot: dict):
+        """計測結果を履歴に追加"""
+        services = {
+            name: _private_memory_mb(metrics)
+            for name, metrics in self.lifecycle_manager.get_service_metrics().items()
+        }
+        self.metrics_history.append(snapshot['total_rss_mb'], snapshot['total_cpu_percent'], services)
+    
+    def _show_metrics_history(self):
+        """メモリ・CPUの履歴ダイアログを表示"""
+        if self.history_dialog is None:
+            self.history_dialog = MetricsHistoryDialog(self.metrics_history, self)
+        self.history_dialog.show()
+        self.history_dialog.raise_()
+    
+    def _update_service_memory(self):
+        """サービスごとのメモリ使用量を更新（文字列が変わった時のみ）"""
+        current_widget = self.tab_widget.currentWidget()
+        services = {}
+        if isinstance(current_widget, AIComparisonWidget):
+            services = current_widget.get_memory_info()['services']
+        step = max(self.settings.get('memory_display_step_mb', 10), 1)
+        text = " | ".join(
+            f"{name}: {round(_private_memory_mb(metrics) / step) * step:.0f} MB"
+            for name, metrics in services.items()
+        )
+        if text != self.service_memory_label.text():
+            self.service_memory_label.setText(text)
+        
+        # ツールチップには全タブのサービスの詳細を表示
+        lines = []
+        for name, metrics in self.lifecycle_manager.get_service_metrics().items():
+            line = (f"{name} [{metrics['state']}] PID {metrics['pid']}: "
+                    f"RSS {metrics['rss_mb']:.0f} MB")
+            if metrics['uss_mb'] is not None:
+                line += f" / USS {metrics['uss_mb']:.0f} MB"
+            if metrics['pss_mb'] is not None:
+                line += f" / PSS {metrics['pss_mb']:.0f} MB"
+            line += f" / CPU {metrics['cpu_percent']:.1f}%"
+            if metrics['js_heap_mb'] is not None:
+                line += f" / JSヒープ {metrics['js_heap_mb']:.0f} MB"
+            if metrics['shared_with'] > 1:
+                line += f" （{metrics['shared_with']}ビューで共有）"
+            lines.append(line)
+        
+        # ロード時間のパーセンタイル（LCP・ロード完了）
+        summary = self.load_metrics.summary()
+        if summary:
+            lines.append("")
+            lines.append("ロード時間 p50 / p90 / p95（ミリ秒）")
+        for name, metrics in summary.items():
+            for metric, label in (('largest_contentful_paint', 'LCP'), ('load_finished', 'ロード完了')):
+                stats = metrics.get(metric)
+                if stats:
+                    lines.append(f"{name} {label}: {stats['p50']:.0f} / {stats['p90']:.0f} / "
+                                 f"{stats['p95']:.0f} （{stats['count']}件）")
+        
+        # レンダラープロセスモデルの効果（プロセス数・合計RSS・クラッシュ時の巻き込み範囲）
+        renderers = self.lifecycle_manager.get_renderer_summary()
+        if renderers['renderer_count']:
+            lines.append("")
+            lines.append(f"プロファイル: {self.settings.active_performance_profile or '-'} / "
+                         f"プロセスモデル: {self.settings.get('process_model', 'process_per_site_instance')} / "
+                         f"レンダラー {renderers['renderer_count']}個 / "
+                         f"合計 RSS {renderers['renderer_rss_mb']:.0f} MB")
+            for services in renderers['shared_groups']:
+                lines.append("クラッシュ時に同時に停止: " + ", ".join(services))
+        
+        # リクエストブロック数（有効な場合のみ）
+        block_counts = {}
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if isinstance(widget, AIComparisonWidget):
+                block_counts.update(widget.get_block_counts())
+        if block_counts:
+            lines.append("")
+            lines.append("ブロックしたリクエスト: " + " / ".join(
+                f"{name} {count}" for name, count in block_counts.items()
+            ))
+        tooltip = "\n".join(lines)
+        if tooltip != self.service_memory_label.toolTip():
+            self.service_memory_label.setToolTip(tooltip)
     
     def _update_status_message(self):
         """ステータスメッセージを更新"""
@@ -346,7 +726,7 @@ class MainWindow(QMainWindow):
         if isinstance(current_widget, AIComparisonWidget):
             info = current_widget.get_memory_info()
             msg = (f"ビュー: {info['loaded_views']}/{info['total_views']} ロード済 | "
-                   f"{info['suspended_views']} サスペンド中")
+                   f"{info['frozen_views']} 凍結中 | {info['discarded_views']} 破棄済")
             self.status_label.setText(msg)
     
     def _update_title_description(self):
@@ -372,16 +752,36 @@ class MainWindow(QMainWindow):
         self.title_label.setText(text)
     
     def _restore_geometry(self):
-        """ウィンドウジオメトリの復元"""
+        """ウィンドウジオメトリの復元（復元できた場合は geometry_restored がTrue）"""
+        self.geometry_restored = False
         geometry = self.settings.get('window_geometry')
-        if geometry:
-            # 実装は省略（必要に応じてQByteArrayから復元）
-            pass
+        if geometry and isinstance(geometry, str):
+            self.geometry_restored = self.restoreGeometry(QByteArray.fromBase64(geometry.encode('ascii')))
     
     def _save_geometry(self):
-        """ウィンドウジオメトリの保存"""
-        # 実装は省略（必要に応じてQByteArrayとして保存）
-        pass
+        """ウィンドウジオメトリの保存（最大化の状態を含む）"""
+        geometry = bytes(self.saveGeometry().toBase64()).decode('ascii')
+        if geometry != self.settings.get('window_geometry'):
+            self.settings.set('window_geometry', geometry)
+    
+    def _save_session(self):
+        """セッション（アクティブタブ・各タブのペインのURLとスプリッターのサイズ）とウィンドウジオメトリを保存"""
+        self._save_geometry()
+        if not self.settings.get('session_restore', True):
+            return
+        tabs = {}
+        for index in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, AIComparisonWidget):
+                state = widget.session_state()
+                if state:
+                    tabs[self.tab_widget.tabText(index)] = state
+        session = {
+            'active_tab': self.tab_widget.tabText(self.tab_widget.currentIndex()),
+            'tabs': tabs,
+        }
+        if session != self.settings.get('session'):
+            self.settings.set('session', session)
     
     def _init_volume_control(self):
         """音量制御の初期化"""
@@ -455,5 +855,22 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """ウィンドウを閉じる時の処理"""
-        self._save_geometry()
+        self._save_session()
+        self._save_tab_usage()
+        self.load_metrics.save()
+        self.settings_watcher.stop()
+        self.service_watcher.stop()
+        self.lifecycle_manager.shutdown()
+        self.storage_manager.stop()
+        self.download_manager.shutdown()
+        self.metrics_history.close()
+        self.settings.flush()
         event.accept()
+
+
+def _private_memory_mb(metrics: dict) -> float:
+    """表示用のメモリ量（PSS → USS → RSS の順に利用可能なものを使用）"""
+    for key in ('pss_mb', 'uss_mb', 'rss_mb'):
+        if metrics[key] is not None:
+            return metrics[key]
+    return 0.0
@@ -0,0 +1,143 @@
+"""
+AI比較アプリケーション - バックグラウンドメトリクス計測モジュール
+プロセスツリー（メインプロセス＋QtWebEngineProcess）の計測をワーカースレッドで行い、
+結果をキューイングされたシグナルでUIスレッドに渡す（psutilの呼び出しでUIを止めない）
+"""
+
+from PySide6.QtCore import QCoreApplication, QObject, QThread, QTimer, Signal, Slot
+
+from utils.process_metrics import ProcessMetricsCollector
+
+
+class _SamplerWorker(QObject):
+    """ワーカースレッド側で計測を行うオブジェクト"""
+
+    snapshot_ready = Signal(dict)
+
+    def __init__(self, interval_ms: int, idle_interval_ms: int, change_mb: float):
+        super().__init__()
+
+        self.interval_ms = interval_ms  # 通常の計測間隔
+        self.idle_interval_ms = max(idle_interval_ms, interval_ms)  # 変化が無い間に延ばす上限
+        self.change_mb = change_mb  # これ未満の増減は「変化なし」とみなす
+        self.current_interval_ms = interval_ms
+        self.full_pids: set = set()
+        self.collector: ProcessMetricsCollector = None
+        self.timer: QTimer = None
+        self._last_total_mb = None
+
+    @Slot()
+    def start(self):
+        """スレッド開始時に呼ばれる（タイマーはこのスレッドで作成する）"""
+        self.collector = ProcessMetricsCollector()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.sample)
+        self.timer.start(0)
+
+    @Slot(object)
+    def set_full_pids(self, pids: set):
+        """USS/PSSまで取得するプロセス（レンダラー）を更新"""
+        self.full_pids = set(pids)
+
+    @Slot(int)
+    def request_sample(self, delay_ms: int = 0):
+        """間隔を通常に戻し、delay_ms後に計測する（ビュー破棄後の再確認など）"""
+        if self.timer is None:
+            return
+        self.current_interval_ms = self.interval_ms
+        if not self.timer.isActive() or self.timer.remainingTime() > delay_ms:
+            self.timer.start(delay_ms)
+
+    @Slot(int, int, float)
+    def set_intervals(self, interval_ms: int, idle_interval_ms: int, change_mb: float):
+        """計測間隔を変更（次回の計測から反映）"""
+        self.interval_ms = interval_ms
+        self.idle_interval_ms = max(idle_interval_ms, interval_ms)
+        self.change_mb = change_mb
+        self.request_sample(interval_ms)
+
+    @Slot()
+    def stop(self):
+        if self.timer is not None:
+            self.timer.stop()
+
+    @Slot()
+    def sample(self):
+        """プロセスツリーを計測して通知し、変化が無ければ次回までの間隔を延ばす"""
+        try:
+            snapshot = self.collector.sample_tree(full_pids=self.full_pids)
+        except Exception as e:
+            print(f"メトリクスの計測に失敗: {e}")
+            self.timer.start(self.idle_interval_ms)
+            return
+
+        total_mb = snapshot['total_rss_mb']
+        if self._last_total_mb is not None and abs(total_mb - self._last_total_mb) < self.change_mb:
+            # 落ち着いている間は間隔を倍々に延ばす（アイドル時の計測コストをほぼ無くす）
+            self.current_interval_ms = min(self.current_interval_ms * 2, self.idle_interval_ms)
+        else:
+            self.current_interval_ms = self.interval_ms
+            self._last_total_mb = total_mb
+        snapshot['interval_ms'] = self.current_interval_ms
+
+        self.snapshot_ready.emit(snapshot)
+        self.timer.start(self.current_interval_ms)
+
+
+class MetricsSampler(QObject):
+    """ワーカースレッドでプロセスツリーを定期計測し、snapshot_readyでUIスレッドに通知する"""
+
+    snapshot_ready = Signal(dict)  # ProcessMetricsCollector.sample_treeの結果（UIスレッドで受信）
+
+    # ワーカーへの指示（キューイングされてワーカースレッドで実行される）
+    _full_pids_changed = Signal(object)
+    _sample_requested = Signal(int)
+    _intervals_changed = Signal(int, int, float)
+    _stop_requested = Signal()
+
+    def __init__(self, interval_ms: int = 2000, idle_interval_ms: int = 10000,
+                 change_mb: float = 5.0, parent=None):
+        super().__init__(parent)
+
+        self.worker_thread = QThread()
+        self.worker_thread.setObjectName("MetricsSampler")
+        self.worker = _SamplerWorker(interval_ms, idle_interval_ms, change_mb)
+        self.worker.moveToThread(self.worker_thread)
+
+        self.worker_thread.started.connect(self.worker.start)
+        self.worker_thread.finished.connect(self.worker.deleteLater)
+        self.worker.snapshot_ready.connect(self.snapshot_ready)
+        self._full_pids_changed.connect(self.worker.set_full_pids)
+        self._sample_requested.connect(self.worker.request_sample)
+        self._intervals_changed.connect(self.worker.set_intervals)
+        self._stop_requested.connect(self.worker.stop)
+
+        # 終了時にスレッドを止めずに破棄するとクラッシュするため、アプリ終了時にも停止する
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def start(self):
+        """計測スレッドを開始（UIより低い優先度）"""
+        if not self.worker_thread.isRunning():
+            self.worker_thread.start(QThread.Priority.LowPriority)
+
+    def stop(self):
+        """計測スレッドを停止して終了を待つ"""
+        if self.worker_thread.isRunning():
+            self._stop_requested.emit()
+            self.worker_thread.quit()
+            self.worker_thread.wait(3000)
+
+    def set_full_pids(self, pids: set):
+        """USS/PSSまで取得するプロセス（レンダラー）を指定"""
+        self._full_pids_changed.emit(set(pids))
+
+    def request_sample(self, delay_ms: int = 0):
+        """通常の間隔に戻し、delay_ms後に計測させる"""
+        self._sample_requested.emit(delay_ms)
+
+    def set_intervals(self, interval_ms: int, idle_interval_ms: int, change_mb: float):
+        """計測間隔・間隔を戻す変化量を変更"""
+        self._intervals_changed.emit(int(interval_ms), int(idle_interval_ms), float(change_mb))
@@ -0,0 +1,147 @@
+"""
+AI比較アプリケーション - メトリクス履歴の表示モジュール
+MetricsHistoryの合計メモリ・CPUの推移と凍結/破棄/再開/ロードのイベントを小さなタイムラインで表示し、
+CSV/JSONに書き出すダイアログ
+"""
+
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QPointF, QTimer
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import (
+    QDialog, QFileDialog, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+)
+
+from utils.metrics_history import MetricsHistory
+
+
+MEMORY_COLOR = QColor("#4CAF50")
+CPU_COLOR = QColor("#FF9800")
+EVENT_COLORS = {
+    'load': QColor("#5B9BD5"),
+    'freeze': QColor("#9C7BD8"),
+    'discard': QColor("#E05A5A"),
+    'resume': QColor("#A0A0A0"),
+}
+
+
+class MetricsTimelineWidget(QWidget):
+    """合計メモリ（実線）・CPU（破線、右軸）とイベント（下端の目盛り）のタイムライン"""
+
+    MARGIN = 8
+    EVENT_HEIGHT = 10
+
+    def __init__(self, history: MetricsHistory, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.setMinimumSize(480, 160)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor("#1E1E1E"))
+
+        samples = self.history.samples()
+        if len(samples) < 2:
+            painter.setPen(QColor("#A0A0A0"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "記録がありません")
+            return
+
+        area = self.rect().adjusted(self.MARGIN, self.MARGIN + 12, -self.MARGIN,
+                                    -self.MARGIN - self.EVENT_HEIGHT)
+        start, end = samples[0]['time'], samples[-1]['time']
+        span = max(end - start, 1.0)
+        max_mb = max(sample['total_mb'] for sample in samples) * 1.1 or 1.0
+        max_cpu = max(100.0, max(sample['cpu_percent'] for sample in samples))
+
+        def x_of(timestamp):
+            return area.left() + (timestamp - start) / span * area.width()
+
+        def polyline(key, maximum):
+            return QPolygonF([
+                QPointF(x_of(sample['time']), area.bottom() - sample[key] / maximum * area.height())
+                for sample in samples
+            ])
+
+        painter.setPen(QPen(QColor("#3A3A3A"), 1))
+        painter.drawRect(area)
+
+        cpu_pen = QPen(CPU_COLOR, 1)
+        cpu_pen.setStyle(Qt.PenStyle.DashLine)
+        painter.setPen(cpu_pen)
+        painter.drawPolyline(polyline('cpu_percent', max_cpu))
+        painter.setPen(QPen(MEMORY_COLOR, 2))
+        painter.drawPolyline(polyline('total_mb', max_mb))
+
+        # イベントは期間内のものだけ下端に縦線で表示
+        for item in self.history.events():
+            if start <= item['time'] <= end:
+                x = x_of(item['time'])
+                painter.setPen(QPen(EVENT_COLORS[item['kind']], 2))
+                painter.drawLine(QPointF(x, area.bottom() + 2),
+                                 QPointF(x, area.bottom() + self.EVENT_HEIGHT))
+
+        painter.setPen(QColor("#A0A0A0"))
+        painter.drawText(self.MARGIN, self.MARGIN + 8,
+                         f"最大 {max_mb / 1.1:.0f} MB / "
+                         f"{datetime.fromtimestamp(start):%H:%M:%S} - {datetime.fromtimestamp(end):%H:%M:%S}")
+
+
+class MetricsHistoryDialog(QDialog):
+    """メトリクス履歴のタイムラインと書き出しボタン（開いている間だけ定期的に再描画）"""
+
+    def __init__(self, history: MetricsHistory, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.setWindowTitle("メモリ・CPUの履歴")
+        self.resize(720, 280)
+
+        layout = QVBoxLayout(self)
+        self.timeline = MetricsTimelineWidget(history, self)
+        layout.addWidget(self.timeline, 1)
+
+        legend = QLabel(
+            f"<span style='color:{MEMORY_COLOR.name()}'>━ 合計メモリ</span>　"
+            f"<span style='color:{CPU_COLOR.name()}'>┅ CPU</span>　" + "　".join(
+                f"<span style='color:{color.name()}'>┃ {kind}</span>" for kind, color in EVENT_COLORS.items()
+            )
+        )
+        legend.setStyleSheet("font-size: 11px; color: #A0A0A0;")
+        layout.addWidget(legend)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        for text, slot in (("CSVで保存", self._export_csv), ("JSONで保存", self._export_json),
+                           ("閉じる", self.close)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.timeline.update)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start(2000)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def _export(self, caption: str, suffix: str, write):
+        default_name = f"metrics_{datetime.now():%Y%m%d_%H%M%S}.{suffix}"
+        path, _ = QFileDialog.getSaveFileName(self, caption, default_name, f"*.{suffix}")
+        if not path:
+            return
+        try:
+            write(path)
+            print(f"メトリクス履歴を保存: {path}")
+        except OSError as e:
+            print(f"メトリクス履歴の保存に失敗: {e}")
+
+    def _export_csv(self):
+        self._export("CSVで保存", "csv", self.history.to_csv)
+
+    def _export_json(self):
+        self._export("JSONで保存", "json", self.history.to_json)
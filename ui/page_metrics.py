@@ -0,0 +1,131 @@
+"""
+AI比較アプリケーション - ページ読み込み計測モジュール
+ページに計測スクリプトを挿入し、First Paint / LCP / DOMContentLoaded 等を
+QWebChannel経由で受け取る
+"""
+
+from PySide6.QtCore import QObject, Signal, Slot, QFile, QIODevice
+from PySide6.QtWebChannel import QWebChannel
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineScript
+
+
+# ページのスクリプトと干渉しないよう、分離されたワールドで実行する
+METRICS_WORLD = QWebEngineScript.ScriptWorldId.ApplicationWorld
+
+# 値はいずれもナビゲーション開始（performance.timeOrigin）からのミリ秒
+METRICS_SCRIPT = """
+(function() {
+    var reporter = null;
+    var pending = [];
+    var reported = {};
+
+    function report(name, value) {
+        if (reported[name]) {
+            return;
+        }
+        reported[name] = true;
+        if (reporter) {
+            reporter.report(name, value);
+        } else {
+            pending.push([name, value]);
+        }
+    }
+
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        reporter = channel.objects.loadMetrics;
+        pending.forEach(function(item) { reporter.report(item[0], item[1]); });
+        pending = [];
+    });
+
+    try {
+        new PerformanceObserver(function(list) {
+            list.getEntries().forEach(function(entry) {
+                if (entry.name === 'first-paint') {
+                    report('first_paint', entry.startTime);
+                } else if (entry.name === 'first-contentful-paint') {
+                    report('first_contentful_paint', entry.startTime);
+                }
+            });
+        }).observe({type: 'paint', buffered: true});
+    } catch (e) {}
+
+    // LCPは更新され続けるため、最初のユーザー操作・非表示化・load後5秒のいずれかで確定する
+    var lcp = null;
+    try {
+        new PerformanceObserver(function(list) {
+            var entries = list.getEntries();
+            lcp = entries[entries.length - 1].startTime;
+        }).observe({type: 'largest-contentful-paint', buffered: true});
+    } catch (e) {}
+
+    function finalizeLcp() {
+        if (lcp !== null) {
+            report('largest_contentful_paint', lcp);
+        }
+    }
+    ['keydown', 'pointerdown'].forEach(function(type) {
+        addEventListener(type, finalizeLcp, {once: true, capture: true});
+    });
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden') {
+            finalizeLcp();
+        }
+    });
+
+    document.addEventListener('DOMContentLoaded', function() {
+        report('dom_content_loaded', performance.now());
+    });
+    addEventListener('load', function() {
+        setTimeout(finalizeLcp, 5000);
+    });
+})();
+"""
+
+_qwebchannel_source = None
+
+
+def _load_qwebchannel_source() -> str:
+    """Qtに同梱されているqwebchannel.jsを読み込む"""
+    global _qwebchannel_source
+    if _qwebchannel_source is None:
+        file = QFile(":/qtwebchannel/qwebchannel.js")
+        if file.open(QIODevice.OpenModeFlag.ReadOnly):
+            _qwebchannel_source = bytes(file.readAll()).decode('utf-8')
+            file.close()
+        else:
+            print("qwebchannel.jsの読み込みに失敗 - ページ計測を無効化")
+            _qwebchannel_source = ""
+    return _qwebchannel_source
+
+
+class LoadMetricsBridge(QObject):
+    """ページ側の計測スクリプトから値を受け取るオブジェクト"""
+
+    metric_reported = Signal(str, float)  # (指標名, ミリ秒)
+
+    @Slot(str, float)
+    def report(self, name: str, value: float):
+        self.metric_reported.emit(name, value)
+
+
+def install_load_metrics(page: QWebEnginePage) -> LoadMetricsBridge:
+    """ページに計測スクリプトとWebChannelを設定し、値を受け取るブリッジを返す"""
+    bridge = LoadMetricsBridge(page)
+
+    qwebchannel_source = _load_qwebchannel_source()
+    if not qwebchannel_source:
+        return bridge
+
+    channel = QWebChannel(page)
+    channel.registerObject('loadMetrics', bridge)
+    page.setWebChannel(channel, METRICS_WORLD)
+
+    script = QWebEngineScript()
+    script.setName('ai-comparison-load-metrics')
+    script.setSourceCode(qwebchannel_source + METRICS_SCRIPT)
+    script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+    script.setWorldId(METRICS_WORLD)
+    script.setRunsOnSubFrames(False)
+    page.scripts().insert(script)
+
+    return bridge
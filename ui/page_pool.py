@@ -0,0 +1,189 @@
+"""
+AI比較アプリケーション - 事前生成ページプールモジュール
+プロファイルごとにWebView/ページの組を事前に作っておき、
+初回表示のビュー作成を待たずに済むようにする（ポップアップの管理も行う）
+"""
+
+from PySide6.QtCore import QObject, QTimer, QUrl, Qt
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineDownloadRequest
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+
+from .web_view import CustomWebEnginePage, SuspendableWebView
+
+
+class PagePool(QObject):
+    """プロファイルごとの事前生成WebViewプール（ポップアップの管理も行う）"""
+
+    _pools: dict[QWebEngineProfile, 'PagePool'] = {}
+    refill_paused = False  # メモリ予算超過中は補充しない（ViewLifecycleManagerが設定）
+
+    @classmethod
+    def for_profile(cls, profile: QWebEngineProfile) -> 'PagePool':
+        """プロファイルのプールを取得（未作成の場合は事前生成なしで作成）"""
+        pool = cls._pools.get(profile)
+        if pool is None:
+            pool = cls(profile, capacity=0)
+        return pool
+
+    @classmethod
+    def prewarm_all(cls, start_delay: int = 10000, stagger: int = 2000):
+        """全プールの事前生成を予約（起動直後の負荷を避け、プールごとに時間をずらす）"""
+        for i, pool in enumerate(list(cls._pools.values())):
+            pool.schedule_refill(start_delay + i * stagger)
+
+    @classmethod
+    def drain_all(cls) -> int:
+        """全プールの予備ビューを破棄（メモリ予算超過時）し、破棄した数を返す"""
+        return sum(pool.drain() for pool in list(cls._pools.values()))
+
+    def __init__(self, profile: QWebEngineProfile, capacity: int = 1, refill_delay: int = 3000):
+        # プロファイルと同じ寿命にする
+        super().__init__(profile)
+
+        self.profile = profile
+        self.capacity = capacity  # 予備ビューの上限
+        self.refill_delay = refill_delay  # 補充までの待ち時間（ミリ秒、操作が落ち着いてから作成）
+        self._spares: list[SuspendableWebView] = []
+        self._popups: dict[QWidget, QWebEngineView] = {}  # ポップアップ -> ビュー
+
+        self.refill_timer = QTimer(self)
+        self.refill_timer.setSingleShot(True)
+        self.refill_timer.timeout.connect(self._refill_one)
+
+        # ポップアップのダウンロード監視はプロファイルごとに1回だけ接続する
+        profile.downloadRequested.connect(self._on_download_requested)
+
+        PagePool._pools[profile] = self
+        profile.destroyed.connect(lambda *_: PagePool._pools.pop(profile, None))
+
+    def schedule_refill(self, delay: int = None):
+        """予備ビューの補充を予約"""
+        if len(self._spares) < self.capacity and not self.refill_timer.isActive():
+            self.refill_timer.start(self.refill_delay if delay is None else delay)
+
+    def _refill_one(self):
+        """予備ビューを1つ作成（不足していれば次も予約）"""
+        if len(self._spares) >= self.capacity or PagePool.refill_paused:
+            return
+        view = SuspendableWebView(self.profile)
+        # about:blankを読み込んでレンダラープロセスを起動しておく
+        view.setUrl(QUrl("about:blank"))
+        self._spares.append(view)
+        self.schedule_refill()
+
+    def acquire(self, parent: QWidget = None) -> SuspendableWebView:
+        """予備ビューを取り出す（無い場合はその場で作成）"""
+        if self._spares:
+            view = self._spares.pop()
+            view.setParent(parent)
+            self._forget_blank_page(view)
+        else:
+            view = SuspendableWebView(self.profile, parent)
+        self.schedule_refill()
+        return view
+
+    @staticmethod
+    def _forget_blank_page(view: SuspendableWebView):
+        """予備として読み込んだabout:blankが「戻る」の履歴に残らないよう、最初のページの読み込み後に履歴を消す"""
+        def on_load_finished(ok):
+            if view.history().currentItem().url() == QUrl("about:blank"):
+                return  # about:blank自体の読み込み完了（次のページはまだ確定していない）
+            view.loadFinished.disconnect(on_load_finished)
+            view.history().clear()  # 現在のページ以外を削除
+
+        view.loadFinished.connect(on_load_finished)
+
+    def set_capacity(self, capacity: int):
+        """予備ビューの上限を変更（超えた分は破棄し、不足していれば補充を予約）"""
+        self.capacity = capacity
+        while len(self._spares) > capacity:
+            self._spares.pop().deleteLater()
+        self.schedule_refill()
+
+    def drain(self) -> int:
+        """予備ビューを全て破棄"""
+        self.refill_timer.stop()
+        count = len(self._spares)
+        for view in self._spares:
+            view.deleteLater()
+        self._spares.clear()
+        return count
+
+    def has_popups(self) -> bool:
+        """ポップアップを開いているかどうか"""
+        return bool(self._popups)
+
+    def open_popup(self):
+        """ポップアップウィンドウを開き、そのページを返す（Googleログイン・ダウンロード用）"""
+        # 親ウィンドウとなるコンテナを作成
+        popup = QWidget()
+        popup.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        popup.setWindowTitle("ダウンロード中－完了後に自動で閉じます")
+        popup.resize(600, 750)
+
+        layout = QVBoxLayout(popup)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        # URL表示用ラベル（セキュリティ対策）
+        url_label = QLabel("URL: Loading...")
+        url_label.setStyleSheet("""
+            QLabel {
+                background-color: #f0f0f0;
+                color: #333;
+                padding: 8px;
+                border-bottom: 1px solid #ccc;
+                font-family: monospace;
+            }
+        """)
+        layout.addWidget(url_label)
+
+        # 新しいページとビューを作成
+        # （createWindowで返したページには開き元が作ったWebContentsが入るため、予備ビューのレンダラーは使われない。
+        #   再試行・クラッシュ復旧の表示を持たない通常のビューで開く）
+        page = CustomWebEnginePage(self.profile, popup)
+        view = QWebEngineView(popup)
+        view.setPage(page)
+
+        # URL変更時にラベルを更新（長すぎる場合は省略）
+        def update_url_label(url):
+            try:
+                url_str = url.toString()
+                if len(url_str) > 150:
+                    url_str = url_str[:150] + "..."
+                url_label.setText(f"URL: {url_str}")
+            except RuntimeError:
+                # ウィンドウが閉じられてラベルが削除された場合に発生するエラーを無視
+                pass
+
+        view.urlChanged.connect(update_url_label)
+        # ページ側のwindow.close()（ログイン完了時など）でポップアップを閉じる
+        page.windowCloseRequested.connect(popup.close)
+
+        layout.addWidget(view)
+
+        # ウィンドウを表示
+        popup.show()
+
+        # ウィンドウへの参照を保持してGCを防ぎ、閉じられたら削除
+        self._popups[popup] = view
+        popup.destroyed.connect(lambda *_: self._popups.pop(popup, None))
+
+        return page
+
+    def _on_download_requested(self, download):
+        """ポップアップからのダウンロードが完了したらウィンドウを自動で閉じる"""
+        # 注意: download.page() が None の場合もあるため安全策をとる
+        page = download.page()
+        if page is None:
+            return
+        for popup, view in self._popups.items():
+            if view.page() == page:
+                def on_state_changed(state, popup=popup):
+                    if state == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
+                        # 少し遅延させてから閉じる（完了の余韻）
+                        QTimer.singleShot(1000, popup.close)
+
+                download.stateChanged.connect(on_state_changed)
+                break
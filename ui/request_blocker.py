@@ -0,0 +1,102 @@
+"""
+AI比較アプリケーション - リクエストブロックモジュール
+プロファイルごとにURLリクエストインターセプターを設定し、
+トラッカー・解析ビーコン等のサードパーティリクエストを遮断する
+"""
+
+import os
+from collections import Counter
+from typing import Iterable, Optional
+
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+
+from utils.domain_filter import DomainFilter, site_of
+
+
+_filter_cache: dict[str, tuple[float, DomainFilter]] = {}
+
+
+def load_block_filter(path: str) -> Optional[DomainFilter]:
+    """ブロックリストを読み込む（全プロファイルで共有し、ファイル更新時のみ再読み込み）
+
+    ファイルが無い・読めない場合はNone
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _filter_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        domain_filter = DomainFilter.from_file(path)
+    except Exception as e:
+        print(f"ブロックリストの読み込みに失敗: {e}")
+        return None
+    print(f"ブロックリストを読み込み: {len(domain_filter)}ドメイン ({path})")
+    _filter_cache[path] = (mtime, domain_filter)
+    return domain_filter
+
+
+class RequestBlocker(QWebEngineUrlRequestInterceptor):
+    """ブロックリストに一致するサードパーティリクエストを遮断するインターセプター"""
+
+    def __init__(self, domain_filter: DomainFilter, service_name: str = "", parent=None):
+        super().__init__(parent)
+
+        self.domain_filter = domain_filter
+        self.service_name = service_name
+        self.blocked_count = 0
+        self.blocked_hosts = Counter()  # ホスト名 -> ブロック回数
+        self._site_cache: dict[str, str] = {}  # ファーストパーティのホスト名 -> サイト
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo):
+        """リクエストごとに呼ばれる（UIスレッドで実行されるため、集合の照合のみで判定する）"""
+        # ページ自体の読み込みは遮断しない
+        if info.resourceType() == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            return
+        host = info.requestUrl().host()
+        if not self.domain_filter.is_blocked(host):
+            return
+
+        # ファーストパーティ（表示中のサイト自身）へのリクエストは遮断しない
+        first_party = info.firstPartyUrl().host()
+        site = self._site_cache.get(first_party)
+        if site is None:
+            site = self._site_cache[first_party] = site_of(first_party)
+        if site and (host == site or host.endswith('.' + site)):
+            return
+
+        info.block(True)
+        self.blocked_count += 1
+        self.blocked_hosts[host] += 1
+
+
+def build_block_filter(settings, extra_domains: Iterable[str] = ()) -> Optional[DomainFilter]:
+    """ブロックリスト（設定で有効な場合）とサービスごとの追加ドメインを合わせたフィルタ（どちらも無ければNone）"""
+    domain_filter = None
+    if settings.get('request_blocking', False):
+        path = settings.get('block_list_file') or str(settings.config_dir / 'blocklist.txt')
+        domain_filter = load_block_filter(path)
+    extra_domains = list(extra_domains)
+    if extra_domains:
+        base = domain_filter or DomainFilter()
+        domain_filter = DomainFilter(base.blocked | {domain.lower() for domain in extra_domains}, base.allowed)
+    if domain_filter is None or not len(domain_filter):
+        return None
+    return domain_filter
+
+
+def install_request_blocker(profile: QWebEngineProfile, settings, service_name: str = "",
+                            extra_domains: Iterable[str] = ()) -> Optional[RequestBlocker]:
+    """遮断するドメインがある場合、プロファイルにリクエストブロックを設定する（無い場合はNone）
+
+    ブロックリストは設定で有効な場合のみ使い、サービスごとの追加ドメイン（block_list）は常に遮断する
+    """
+    domain_filter = build_block_filter(settings, extra_domains)
+    if domain_filter is None:
+        return None
+    # インターセプターはプロファイルに所有されないため、プロファイルを親にして寿命を揃える
+    blocker = RequestBlocker(domain_filter, service_name, profile)
+    profile.setUrlRequestInterceptor(blocker)
+    return blocker
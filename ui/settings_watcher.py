@@ -0,0 +1,104 @@
+"""
+AI比較アプリケーション - 設定変更の監視モジュール
+Settingsの変更通知をQtのシグナルに中継し、settings.jsonやサービス定義（services.json）が
+外部で編集された場合は読み直して、実行中のビュー・タイマーに反映させる
+"""
+
+from pathlib import Path
+from typing import Callable
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from models.ai_service import AIServiceManager
+from utils.settings import Settings
+from utils.settings_schema import requires_restart
+
+
+class _FileReloader(QObject):
+    """ファイルの変更を監視し、連続した変更が落ち着いてから reload を1回呼ぶ"""
+
+    def __init__(self, path: Path, reload: Callable[[], None], parent=None):
+        super().__init__(parent)
+
+        self.path = Path(path)
+        self.reload_callback = reload
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self._on_file_changed)
+        # ファイルがまだ無い場合（初回起動）や置き換えで保存された場合に備えてフォルダーも監視する
+        self.file_watcher.directoryChanged.connect(self._on_directory_changed)
+        if self.path.parent.is_dir():
+            self.file_watcher.addPath(str(self.path.parent))
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.timeout.connect(self._on_reload_timer)
+        self._watch_file()
+
+    def _watch_file(self):
+        """ファイルを監視対象にする（置き換えで保存されると監視が外れるため、その都度追加し直す）"""
+        path = str(self.path)
+        if self.path.exists() and path not in self.file_watcher.files():
+            self.file_watcher.addPath(path)
+
+    def _on_file_changed(self, path: str):
+        self.reload_timer.start(500)
+
+    def _on_directory_changed(self, path: str):
+        # 監視していないファイルが現れた（新規作成・置き換え）場合だけ読み直す
+        if self.path.exists() and str(self.path) not in self.file_watcher.files():
+            self._watch_file()
+            self.reload_timer.start(500)
+
+    def _on_reload_timer(self):
+        self._watch_file()
+        self.reload_callback()
+
+    def stop(self):
+        """監視を止める（ウィンドウを閉じる時）"""
+        self.reload_timer.stop()
+        paths = self.file_watcher.files() + self.file_watcher.directories()
+        if paths:
+            self.file_watcher.removePaths(paths)
+
+
+class SettingsWatcher(_FileReloader):
+    """設定の変更を setting_changed(キー, 新しい値) で通知する"""
+
+    setting_changed = Signal(str, object)
+
+    def __init__(self, settings: Settings, parent=None):
+        super().__init__(settings.config_file, self.reload, parent)
+
+        self.settings = settings
+        settings.add_listener(self._on_setting_changed)
+
+    def reload(self):
+        changed = self.settings.reload()
+        if changed:
+            print(f"設定ファイルの変更を反映: {', '.join(sorted(changed))}")
+
+    def _on_setting_changed(self, key: str, value):
+        if requires_restart(key):
+            print(f"設定 {key} の変更は再起動後に反映されます")
+        self.setting_changed.emit(key, value)
+
+    def stop(self):
+        """通知と監視を止める（ウィンドウを閉じる時）"""
+        self.settings.remove_listener(self._on_setting_changed)
+        super().stop()
+
+
+class ServiceRegistryWatcher(_FileReloader):
+    """サービス定義の変更を policies_changed(ポリシーが変わったAIServiceのリスト) で通知する"""
+
+    policies_changed = Signal(list)
+
+    def __init__(self, ai_manager: AIServiceManager, parent=None):
+        super().__init__(ai_manager.registry_path, self.reload, parent)
+
+        self.ai_manager = ai_manager
+
+    def reload(self):
+        changed = self.ai_manager.reload()
+        if changed:
+            print(f"サービス定義の変更を反映: {', '.join(service.name for service in changed)}")
+            self.policies_changed.emit(changed)
@@ -1,11 +1,14 @@
 import sys
 import os
 import subprocess
+import time
 import ctypes
 from ctypes import wintypes
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PySide6.QtCore import Qt, QTimer
 
+from utils.process_metrics import ProcessMetricsCollector
+
 # Win32 API 定義
 user32 = ctypes.windll.user32
 kernel32 = ctypes.windll.kernel32
@@ -33,6 +36,10 @@ class SoraWidget(QWidget):
         self.my_thread_id = 0
         self.threads_attached = False
         
+        # 非表示の間のアイドル判定（メモリ逼迫時に生成中のSoraを終了させないため）
+        self.hidden_since = None  # 非表示になった時刻（monotonic、表示中はNone）
+        self.cpu_metrics: ProcessMetricsCollector = None  # Soraのプロセスツリーの計測（CPU使用率は前回呼び出しとの差分）
+        
         # フォーカスポリシーを設定
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         
@@ -42,13 +49,76 @@ class SoraWidget(QWidget):
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_label)
         
-        # プロセス起動
-        self._launch_process()
-        
         # ウィンドウ検索タイマー
         self.search_timer = QTimer(self)
         self.search_timer.timeout.connect(self._search_window)
-        self.search_timer.start(500)
+        
+        # プロセスはタブが初めて表示されたときに起動する（起動時間・メモリを節約）
+    
+    def showEvent(self, event):
+        """初回表示時（またはshutdown後・プロセスが自ら終了した後の再表示時）にプロセスを起動"""
+        super().showEvent(event)
+        self.hidden_since = None
+        if not self.is_running():
+            if self.process is not None:
+                print(f"Soraのプロセスが終了していたため再起動します (終了コード {self.process.returncode})")
+            self.shutdown()  # 終了したプロセスの埋め込み状態（ウィンドウ・スレッド入力・CPU計測）を片付ける
+            self.status_label.setText("Initializing WebView2 for Sora...")
+            self.status_label.show()
+            self._launch_process()
+            if self.process is not None:
+                self.search_timer.start(500)
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.hidden_since = time.monotonic()
+    
+    def is_running(self) -> bool:
+        """Soraのプロセスが起動しているかどうか"""
+        return self.process is not None and self.process.poll() is None
+    
+    def is_idle(self, min_hidden_sec: float, max_cpu_percent: float) -> bool:
+        """非表示のままmin_hidden_sec秒以上経ち、前回の確認からのCPU使用率がmax_cpu_percent未満か
+
+        動画の生成・再生中はWebView2のプロセスがCPUを使い続けるため、アイドルとみなさない。
+        CPU使用率は前回の呼び出しとの差分のため、初回は計測の起点にするだけでFalseを返す
+        """
+        if not self.is_running() or self.hidden_since is None:
+            return False
+        if self.cpu_metrics is None:
+            try:
+                self.cpu_metrics = ProcessMetricsCollector(self.process.pid)
+                self.cpu_metrics.sample_tree()
+            except Exception as e:
+                print(f"SoraのCPU使用率を取得できません: {e}")
+                self.cpu_metrics = None
+            return False
+        cpu_percent = self.cpu_metrics.sample_tree()['total_cpu_percent']
+        if cpu_percent >= max_cpu_percent:
+            print(f"Soraは処理中のため終了しません (CPU {cpu_percent:.0f}%)")
+            return False
+        return time.monotonic() - self.hidden_since >= min_hidden_sec
+    
+    def shutdown(self):
+        """埋め込みを解除してプロセスを終了（終了時・メモリ逼迫時）"""
+        self.search_timer.stop()
+        
+        # スレッド入力の切断
+        if self.threads_attached:
+            user32.AttachThreadInput(self.foreign_thread_id, self.my_thread_id, False)
+            self.threads_attached = False
+            
+        # プロセスを終了させる
+        if self.process:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+        self.cpu_metrics = None
+        self.hwnd_sora = 0
+        self.is_embedded = False
     
     def _launch_process(self):
         """別プロセスでSoraを起動"""
@@ -164,17 +234,7 @@ class SoraWidget(QWidget):
 
     def closeEvent(self, event):
         """終了時の処理"""
-        # スレッド入力の切断
-        if self.threads_attached:
-            user32.AttachThreadInput(self.foreign_thread_id, self.my_thread_id, False)
-            
-        # プロセスを終了させる
-        if self.process:
-            self.process.terminate()
-            try:
-                self.process.wait(timeout=1.0)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
+        self.shutdown()
         super().closeEvent(event)
         
     def __del__(self):
@@ -3,10 +3,19 @@ AI比較アプリケーション - カスタムWebビューモジュール
 メモリ最適化機能を備えたWebViewコンポーネント
 """
 
-from PySide6.QtCore import QUrl, QTimer, Signal, Qt
-from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage, QWebEngineSettings
+import time
+
+from PySide6.QtCore import QUrl, QTimer, Signal, Qt, QByteArray, QDataStream, QIODevice, QElapsedTimer, QEvent
+from PySide6.QtWebEngineCore import (
+    QWebEngineProfile, QWebEnginePage, QWebEngineSettings, QWebEngineScript, QWebEngineLoadingInfo
+)
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
+
+from utils.network_monitor import NetworkMonitor
+from utils.recovery import CircuitBreaker, RetryPolicy, SlidingWindowCounter
+
+from .page_metrics import install_load_metrics
 
 
 class CustomWebEnginePage(QWebEnginePage):
@@ -17,100 +26,23 @@ class CustomWebEnginePage(QWebEnginePage):
     
     def createWindow(self, window_type):
         """新しいウィンドウ/タブを作成（Googleログインのポップアップ対応）"""
-        # 親ウィンドウとなるコンテナを作成
-        popup = QWidget()
-        popup.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
-        popup.setWindowTitle("ダウンロード中－完了後に自動で閉じます")
-        popup.resize(600, 750)
-        
-        layout = QVBoxLayout(popup)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-        
-        # URL表示用ラベル（セキュリティ対策）
-        url_label = QLabel("URL: Loading...")
-        url_label.setStyleSheet("""
-            QLabel {
-                background-color: #f0f0f0;
-                color: #333;
-                padding: 8px;
-                border-bottom: 1px solid #ccc;
-                font-family: monospace;
-            }
-        """)
-        layout.addWidget(url_label)
-        
-        # 新しいページとビューを作成
-        page = CustomWebEnginePage(self.profile(), popup)
-        view = QWebEngineView(popup)
-        view.setPage(page)
-        
-        # URL変更時にラベルを更新（長すぎる場合は省略）
-        def update_url_label(url):
-            try:
-                url_str = url.toString()
-                if len(url_str) > 150:
-                    url_str = url_str[:150] + "..."
-                url_label.setText(f"URL: {url_str}")
-            except RuntimeError:
-                # ウィンドウが閉じられてラベルが削除された場合に発生するエラーを無視
-                pass
-            
-        view.urlChanged.connect(update_url_label)
-        
-        layout.addWidget(view)
-        
-        # ウィンドウを表示
-        popup.show()
-        
-        # ウィンドウへの参照を保持してGCを防ぐ
-        if not hasattr(self, '_popups'):
-            self._popups = []
-        self._popups.append(popup)
-        
-        # ダウンロード完了時にウィンドウを自動で閉じる
-        from PySide6.QtWebEngineCore import QWebEngineDownloadRequest
-        
-        def handle_download(download_item):
-            # このページからのダウンロードリクエストか確認
-            # 注意: download_item.page() が None の場合もあるため安全策をとる
-            if download_item.page() == page:
-                def on_state_changed(state):
-                    if state == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
-                        # 少し遅延させてから閉じる（完了の余韻）
-                        QTimer.singleShot(1000, popup.close)
-                
-                download_item.stateChanged.connect(on_state_changed)
-        
-        # プロファイルのシグナルに接続
-        # 注意: 厳密にはdisconnectが必要だが、popupが消えればハンドラもGCされることを期待
-        # ただしプロファイルは長生きするので、ハンドラが残り続けるリスクがある。
-        # 接続オブジェクトを保持して、popup破棄時に切断するのが正しい。
-        conn = self.profile().downloadRequested.connect(handle_download)
-        
-        # ウィンドウが閉じられたらリストから削除 & シグナル切断
-        def cleanup():
-            if popup in self._popups:
-                self._popups.remove(popup)
-            self.profile().downloadRequested.disconnect(conn)
-            
-        popup.destroyed.connect(cleanup)
-        
-        return page
-        
-
-
+        # ポップアップの生成・管理はプロファイルごとのページプールに任せる
+        from .page_pool import PagePool
+        return PagePool.for_profile(self.profile()).open_popup()
 
 
 class SuspendableWebView(QWebEngineView):
-    """サスペンド機能を持つWebView"""
+    """段階的サスペンド機能を持つWebView（Active → Frozen → Discarded）"""
     
     suspended = Signal(bool)  # サスペンド状態変更シグナル
+    circuit_changed = Signal(bool, str)  # 再試行停止状態の変更シグナル（停止中か, 理由）
+    crash_loop_changed = Signal(bool, str)  # クラッシュループによる自動復元停止の変更シグナル（停止中か, 理由）
+    timing_recorded = Signal(str, float)  # ロード計測値（指標名, ナビゲーション開始からのミリ秒）
+    lifecycle_changed = Signal(str)  # ライフサイクル状態の変更（Active / Frozen / Discarded）
     
     def __init__(self, profile: QWebEngineProfile, parent=None):
         super().__init__(parent)
         
-        # プロファイルの設定（カスタムページを使用）
         # プロファイルの設定（カスタムページを使用）
         page = CustomWebEnginePage(profile, self)
         
@@ -120,10 +52,24 @@ class SuspendableWebView(QWebEngineView):
         self.setPage(page)
         
         # サスペンド管理
-        self.is_suspended = False
-        self.suspend_timer = QTimer(self)
-        self.suspend_timer.timeout.connect(self._auto_suspend)
-        self.suspend_timeout = 300000  # 5分（ミリ秒）
+        # 最後の操作から freeze_timeout 後に Frozen（JS・タイマー停止、DOMは保持）、
+        # さらに discard_timeout 後に Discarded（ページ破棄、復帰時に再読み込み）
+        self.lifecycle_state = QWebEnginePage.LifecycleState.Active
+        self.freeze_timeout = 30000  # 30秒（ミリ秒）
+        self.discard_timeout = 300000  # 5分（ミリ秒、凍結後）
+        
+        # 最終操作時刻（monotonic）。キーボード・マウス・スクロール・タブの表示・音声再生で更新
+        # （非表示になった時点では更新しないため、同じタブのペインでも操作していたものほど長く残る）
+        self.last_interaction = time.monotonic()
+        
+        self.freeze_timer = QTimer(self)
+        self.freeze_timer.setSingleShot(True)
+        self.freeze_timer.timeout.connect(self._check_idle)
+        
+        self.discard_timer = QTimer(self)
+        self.discard_timer.setSingleShot(True)
+        self.discard_timer.timeout.connect(self._check_idle)
+        self._suspend_requested = False  # 非表示のタブから段階的サスペンドを依頼されている（自動サスペンド有効時）
         
         # ロードタイムアウト管理（Adobe Express対策）
         self.load_timeout_timer = QTimer(self)
@@ -131,15 +77,72 @@ class SuspendableWebView(QWebEngineView):
         self.load_timeout_timer.timeout.connect(self._on_load_timeout)
         self.load_timeout_duration = 30000  # 30秒
         
+        # 再試行管理（指数バックオフ＋サーキットブレーカー）
+        self.circuit = CircuitBreaker(RetryPolicy())
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self._retry_load)
+        self.cooldown_timer = QTimer(self)
+        self.cooldown_timer.setSingleShot(True)
+        self.cooldown_timer.timeout.connect(self.retry_now)
+        self._waiting_for_network = False
+        
+        # クラッシュ復旧管理（直近の履歴とURLを保持し、クラッシュ後に復元）
+        self.crash_counter = SlidingWindowCounter(300)  # 5分間
+        self.max_crashes = 3  # ウィンドウ内でこの回数クラッシュすると自動復元を停止
+        self.crash_restore_policy = RetryPolicy(base_delay=1.0, max_delay=30.0)
+        self.crash_loop_stopped = False
+        self._nav_snapshot: tuple = None  # (シリアライズした履歴, URL)
+        self.crash_restore_timer = QTimer(self)
+        self.crash_restore_timer.setSingleShot(True)
+        self.crash_restore_timer.timeout.connect(self._restore_navigation)
+        
+        # オフライン中は再試行を保留し、復帰時に再開
+        self.network_monitor = NetworkMonitor.instance()
+        self.network_monitor.online_changed.connect(self._on_online_changed)
+        
+        # JSヒープ使用量（バイト、request_js_heap_updateで非同期に更新）
+        self.js_heap_bytes = None
+        
+        # ロード計測（ページ側の値はQWebChannel経由で受け取る）
+        self.navigation_timer = QElapsedTimer()
+        self.load_metrics_bridge = install_load_metrics(page)
+        self.load_metrics_bridge.metric_reported.connect(self._on_page_metric_reported)
+        
         # イベント接続
         self.loadStarted.connect(self._on_load_started)
         self.loadProgress.connect(self._on_load_progress)
         self.loadFinished.connect(self._on_load_finished)
+        self.urlChanged.connect(self._save_navigation_snapshot)
         self.renderProcessTerminated.connect(self._on_render_process_terminated)
+        page.lifecycleStateChanged.connect(self._on_lifecycle_state_changed)
+        page.loadingChanged.connect(self._on_loading_changed)
+        page.recentlyAudibleChanged.connect(lambda audible: self.mark_activity())
+        
+        # 入力イベントはビュー本体ではなく内部の描画ウィジェット（フォーカスプロキシ）に届く
+        self._watched_input_widget = None
+        self._watch_input_widget()
+    
+    @property
+    def is_suspended(self) -> bool:
+        """FrozenまたはDiscarded状態かどうか"""
+        return self.lifecycle_state != QWebEnginePage.LifecycleState.Active
+    
+    @property
+    def is_frozen(self) -> bool:
+        """Frozen状態かどうか"""
+        return self.lifecycle_state == QWebEnginePage.LifecycleState.Frozen
+    
+    @property
+    def is_discarded(self) -> bool:
+        """Discarded状態かどうか"""
+        return self.lifecycle_state == QWebEnginePage.LifecycleState.Discarded
     
     def _on_load_started(self):
         """ページロード開始時の処理"""
         print(f"Load started: {self.url().toString()}")
+        self.navigation_timer.start()
+        self.retry_timer.stop()  # ユーザー操作による遷移が始まった場合は予約済みの再試行を取り消す
         self.load_timeout_timer.start(self.load_timeout_duration)
     
     def _on_load_progress(self, progress):
@@ -149,97 +152,366 @@ class SuspendableWebView(QWebEngineView):
     
     def _on_load_timeout(self):
         """ロードタイムアウト時の処理"""
-        print(f"⚠️ Load timeout - Auto reload: {self.url().toString()}")
+        print(f"⚠️ Load timeout: {self.url().toString()}")
+        self.load_timeout_timer.stop()
+        self.stop()  # 応答のない読み込みを中止
+        self._handle_load_failure("タイムアウト")
+    
+    def _on_loading_changed(self, info: QWebEngineLoadingInfo):
+        """メインフレームの読み込み結果を再試行制御に反映"""
+        status = info.status()
+        if status == QWebEngineLoadingInfo.LoadStatus.LoadSucceededStatus:
+            was_open = self.circuit.state != CircuitBreaker.CLOSED
+            self.circuit.record_success()
+            if was_open:
+                self.circuit_changed.emit(False, "")
+        elif status == QWebEngineLoadingInfo.LoadStatus.LoadFailedStatus:
+            domain = info.errorDomain()
+            code = info.errorCode()
+            # 別のナビゲーションによる中断（ERR_ABORTED）やクライアントエラーは再試行しない
+            if domain == QWebEngineLoadingInfo.ErrorDomain.InternalErrorDomain and code == -3:
+                return
+            if domain == QWebEngineLoadingInfo.ErrorDomain.HttpStatusCodeDomain and code < 500:
+                return
+            self.load_timeout_timer.stop()
+            self._handle_load_failure(info.errorString() or f"{domain.name} {code}")
+    
+    def _handle_load_failure(self, reason: str):
+        """ロード失敗時にバックオフ後の再試行、または再試行停止を行う"""
+        if not self.network_monitor.is_online:
+            print(f"オフラインのため再試行を保留: {self.url().toString()}")
+            self.retry_timer.stop()
+            self._waiting_for_network = True
+            return
+        
+        delay = self.circuit.record_failure()
+        if delay is None:
+            self._open_circuit(reason)
+            return
+        print(f"再試行 {self.circuit.failures}/{self.circuit.policy.max_attempts}: "
+              f"{delay:.1f}秒後 ({reason}) {self.url().toString()}")
+        self.retry_timer.start(int(delay * 1000))
+    
+    def _retry_load(self):
+        """予約された再試行を実行"""
+        if not self.network_monitor.is_online:
+            self._waiting_for_network = True
+            return
+        self.reload()
+    
+    def _open_circuit(self, reason: str):
+        """再試行を停止してプレースホルダー表示に切り替える"""
+        self.retry_timer.stop()
         self.load_timeout_timer.stop()
-        QTimer.singleShot(500, self.reload)
+        self.stop()
+        print(f"✗ 再試行を停止 ({reason}): {self.url().toString()}")
+        cooldown = self.circuit.cooldown_remaining()
+        if cooldown is not None:
+            self.cooldown_timer.start(int(cooldown * 1000))
+        self.circuit_changed.emit(True, reason)
+    
+    def retry_now(self):
+        """再試行停止中のビューで1回だけ読み込みを試す（プレースホルダーの再試行ボタン等）"""
+        self.cooldown_timer.stop()
+        self.retry_timer.stop()
+        self.circuit.half_open()
+        was_discarded = self.is_discarded
+        # プレースホルダーを閉じてビューを表示（破棄済みページは再開時に再読み込みされる）
+        self.circuit_changed.emit(False, "")
+        if not was_discarded:
+            self.reload()
+    
+    def _on_online_changed(self, online: bool):
+        """ネットワーク復帰時に保留中・停止中の再試行を再開"""
+        if not online:
+            self.retry_timer.stop()
+            return
+        if self._waiting_for_network or self.circuit.is_open:
+            self._waiting_for_network = False
+            is_open = self.circuit.is_open
+            self.circuit.reset()
+            # 全ペインが同時に再読み込みしないようジッター付きで遅延
+            delay = self.circuit.policy.delay_for(1)
+            if is_open:
+                self.cooldown_timer.start(int(delay * 1000))
+            else:
+                self.retry_timer.start(int(delay * 1000))
     
     def _on_render_process_terminated(self, termination_status, exit_code):
-        """レンダリングプロセスクラッシュ時の処理"""
-        print(f"Render process terminated - Auto reload")
-        QTimer.singleShot(1000, self.reload)
+        """レンダリングプロセスクラッシュ時の処理（履歴とURLを復元、クラッシュループでは停止）"""
+        status_name = getattr(termination_status, 'name', str(termination_status))
+        print(f"Render process terminated: {status_name} (exit code {exit_code}) {self.url().toString()}")
+        if termination_status == QWebEnginePage.RenderProcessTerminationStatus.NormalTerminationStatus:
+            return
+        
+        self.load_timeout_timer.stop()
+        self.retry_timer.stop()
+        crashes = self.crash_counter.record()
+        if crashes >= self.max_crashes:
+            self.crash_restore_timer.stop()
+            self.crash_loop_stopped = True
+            print(f"✗ {self.crash_counter.window:.0f}秒間に{crashes}回クラッシュ - 自動復元を停止: "
+                  f"{self.url().toString()}")
+            self.crash_loop_changed.emit(True, f"{status_name}, exit code {exit_code}")
+            return
+        
+        # 連続クラッシュほど復元を遅らせてCPUを占有しないようにする
+        delay = self.crash_restore_policy.delay_for(crashes)
+        print(f"クラッシュ {crashes}/{self.max_crashes}: {delay:.1f}秒後に復元")
+        self.crash_restore_timer.start(int(delay * 1000))
+    
+    def _save_navigation_snapshot(self, *args):
+        """クラッシュ時の復元用に現在の履歴とURLを保存"""
+        url = self.url()
+        if url.isEmpty() or self.crash_restore_timer.isActive():
+            return
+        data = QByteArray()
+        try:
+            stream = QDataStream(data, QIODevice.OpenModeFlag.WriteOnly)
+            stream << self.history()
+        except Exception as e:
+            print(f"履歴の保存に失敗: {e}")
+            data = None
+        self._nav_snapshot = (data, QUrl(url))
+    
+    def _restore_navigation(self):
+        """保存した履歴とURLを復元して再読み込み"""
+        if not self._nav_snapshot:
+            self.reload()
+            return
+        data, url = self._nav_snapshot
+        if data is not None and not data.isEmpty():
+            try:
+                stream = QDataStream(data)
+                stream >> self.history()
+                if stream.status() == QDataStream.Status.Ok:
+                    print(f"履歴を復元: {url.toString()}")
+                    return
+            except Exception as e:
+                print(f"履歴の復元に失敗: {e}")
+        self.setUrl(url)
+    
+    def restore_after_crash(self):
+        """クラッシュループで停止したビューを手動で復元（プレースホルダーの復元ボタン）"""
+        self.crash_loop_stopped = False
+        self.crash_counter.clear()
+        self.crash_loop_changed.emit(False, "")
+        self._restore_navigation()
+    
+    def set_crash_policy(self, max_crashes: int, window_sec: float):
+        """クラッシュループと判定する回数と期間を設定"""
+        self.max_crashes = max_crashes
+        self.crash_counter.window = window_sec
     
     def _on_load_finished(self, ok):
         """ページロード完了時の処理"""
         self.load_timeout_timer.stop()
         if ok:
             print(f"✓ Load finished: {self.url().toString()}")
-            self._reset_suspend_timer()
+            if self.navigation_timer.isValid():
+                self._record_timing('load_finished', float(self.navigation_timer.elapsed()))
+                self.navigation_timer.invalidate()
         else:
             print(f"✗ Load failed: {self.url().toString()}")
     
-    def _reset_suspend_timer(self):
-        """サスペンドタイマーをリセット"""
-        if hasattr(self, 'suspend_timer'):
-            self.suspend_timer.stop()
-            if not self.is_suspended:
-                self.suspend_timer.start(self.suspend_timeout)
+    def _on_page_metric_reported(self, name: str, value: float):
+        """ページ側の計測スクリプトから報告された値（First Paint / LCP等）"""
+        self._record_timing(name, value)
+    
+    def _record_timing(self, name: str, value: float):
+        """計測値を通知（about:blank等の内部ページは除外）"""
+        if self.url().scheme() not in ('http', 'https'):
+            return
+        self.timing_recorded.emit(name, value)
+    
+    def render_process_pid(self) -> int:
+        """レンダラープロセス（QtWebEngineProcess）のPIDを取得（未起動の場合は0）"""
+        return self.page().renderProcessPid()
+    
+    def request_js_heap_update(self):
+        """JSヒープ使用量を非同期に取得（Chromium独自のperformance.memoryを使用）"""
+        if self.is_suspended:
+            return  # 凍結中・破棄済みのページではスクリプトを実行しない
+        self.page().runJavaScript(
+            "performance.memory ? performance.memory.usedJSHeapSize : null",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld,
+            self._on_js_heap_result
+        )
+    
+    def _on_js_heap_result(self, value):
+        """JSヒープ使用量の取得結果"""
+        self.js_heap_bytes = value if isinstance(value, (int, float)) else None
+    
+    # 操作とみなす入力イベント
+    ACTIVITY_EVENTS = {
+        QEvent.Type.KeyPress, QEvent.Type.MouseButtonPress, QEvent.Type.MouseMove,
+        QEvent.Type.Wheel, QEvent.Type.TouchBegin, QEvent.Type.InputMethod,
+    }
+    
+    def _watch_input_widget(self):
+        """フォーカスプロキシ（描画ウィジェット）の入力イベントを監視"""
+        proxy = self.focusProxy()
+        if proxy is not None and proxy is not self._watched_input_widget:
+            proxy.installEventFilter(self)
+            self._watched_input_widget = proxy
+    
+    def event(self, event):
+        """描画ウィジェットが作り直された場合に監視を付け直す"""
+        if event.type() == QEvent.Type.ChildPolished:
+            self._watch_input_widget()
+        return super().event(event)
+    
+    def eventFilter(self, watched, event):
+        """入力イベントで最終操作時刻を更新（イベントは通常どおり処理させる）"""
+        if watched is self._watched_input_widget and event.type() in self.ACTIVITY_EVENTS:
+            self.last_interaction = time.monotonic()
+        return super().eventFilter(watched, event)
+    
+    def mark_activity(self):
+        """最終操作時刻を更新（入力・表示・音声再生）"""
+        self.last_interaction = time.monotonic()
+    
+    def idle_seconds(self) -> float:
+        """最後の操作からの経過秒数"""
+        return time.monotonic() - self.last_interaction
+    
+    def schedule_suspend(self):
+        """段階的サスペンドを開始（非表示になったタブから呼ばれる）"""
+        self.cancel_scheduled_suspend()
+        self._suspend_requested = True
+        self._check_idle()
+    
+    def cancel_scheduled_suspend(self):
+        """段階的サスペンドのタイマーを停止"""
+        self._suspend_requested = False
+        self.freeze_timer.stop()
+        self.discard_timer.stop()
+    
+    def _check_idle(self):
+        """最終操作からの経過時間に応じて凍結・破棄し、未到達の段階は残り時間でタイマーを設定"""
+        if self.isVisible() or self.is_discarded:
+            return
+        if self.page().recentlyAudible():
+            self.mark_activity()  # 音声再生中（読み上げ等）は操作中とみなす
+        idle_ms = self.idle_seconds() * 1000
+        
+        if self.lifecycle_state == QWebEnginePage.LifecycleState.Active and self.freeze_timeout > 0:
+            if idle_ms < self.freeze_timeout:
+                self.freeze_timer.start(int(self.freeze_timeout - idle_ms))
+                return
+            self.freeze()
+            if not self.is_frozen:
+                return
+        
+        # 凍結済み、または凍結段階を省略する場合は破棄へ（破棄の期限は凍結の期限から数える）
+        if self.discard_timeout > 0:
+            deadline = max(self.freeze_timeout, 0) + self.discard_timeout
+            if idle_ms < deadline:
+                self.discard_timer.start(int(deadline - idle_ms))
+            else:
+                self.discard()
+    
+    def _set_lifecycle_state(self, state) -> bool:
+        """ページのライフサイクル状態を変更"""
+        if self.lifecycle_state == state:
+            return False
+        # 表示中のページはFrozen/Discardedにできない
+        if state != QWebEnginePage.LifecycleState.Active and self.isVisible():
+            return False
+        try:
+            self.page().setLifecycleState(state)
+        except Exception as e:
+            print(f"ライフサイクル変更失敗 ({state.name}): {e}")
+            return False
+        self._on_lifecycle_state_changed(state)
+        return True
     
-    def _auto_suspend(self):
-        """自動サスペンド処理"""
-        self.suspend()
+    def _on_lifecycle_state_changed(self, state):
+        """ページ側のライフサイクル状態変更を反映（Qtによる自動復帰も含む）"""
+        if self.lifecycle_state == state:
+            return
+        was_suspended = self.is_suspended
+        self.lifecycle_state = state
+        self.lifecycle_changed.emit(state.name)
+        if was_suspended != self.is_suspended:
+            self.suspended.emit(self.is_suspended)
+    
+    def freeze(self):
+        """JSとタイマーを停止（DOMは保持するため復帰が速い）"""
+        if self.lifecycle_state == QWebEnginePage.LifecycleState.Active:
+            if self._set_lifecycle_state(QWebEnginePage.LifecycleState.Frozen):
+                self.freeze_timer.stop()
+                print(f"WebView 凍結: {self.url().toString()}")
+    
+    def discard(self):
+        """ページを破棄してメモリを解放（復帰時は再読み込み）"""
+        if self._set_lifecycle_state(QWebEnginePage.LifecycleState.Discarded):
+            self.cancel_scheduled_suspend()
+            print(f"WebView 破棄: {self.url().toString()}")
     
     def suspend(self):
         """レンダリングを停止してメモリを解放"""
-        if not self.is_suspended:
-            try:
-                self.page().setLifecycleState(
-                    QWebEnginePage.LifecycleState.Discarded
-                )
-                self.is_suspended = True
-                self.suspend_timer.stop()
-                self.suspended.emit(True)
-                print(f"WebView サスペンド: {self.url().toString()}")
-            except Exception as e:
-                print(f"サスペンド失敗: {e}")
+        self.discard()
     
     def resume(self):
         """レンダリングを再開"""
+        self.cancel_scheduled_suspend()
+        if self.circuit.is_open:
+            return  # 再試行停止中はプレースホルダーを表示したまま
         if self.is_suspended:
-            try:
-                self.page().setLifecycleState(
-                    QWebEnginePage.LifecycleState.Active
-                )
-                self.is_suspended = False
-                self._reset_suspend_timer()
-                self.suspended.emit(False)
-                print(f"WebView 再開: {self.url().toString()}")
-            except Exception as e:
-                print(f"再開失敗: {e}")
-                # Adobe Express等の複雑なアプリでは、リロードすると状態が壊れるため
-                # エラー時でもリロードしない
+            previous = self.lifecycle_state
+            if self._set_lifecycle_state(QWebEnginePage.LifecycleState.Active):
+                print(f"WebView 再開 ({previous.name}): {self.url().toString()}")
+            # Adobe Express等の複雑なアプリでは、リロードすると状態が壊れるため
+            # エラー時でもリロードしない
+    
+    def set_lifecycle_timeouts(self, freeze_ms: int, discard_ms: int):
+        """凍結・破棄までの時間を設定（ミリ秒、0でその段階を行わない）
+
+        段階的サスペンド中の非表示のビューは、タイマーの有無によらず新しい時間で予定を立て直す
+        （0から正の値に変えた場合も、次の表示切り替えを待たない）
+        """
+        self.freeze_timeout = freeze_ms
+        self.discard_timeout = discard_ms
+        if self._suspend_requested and not self.isVisible() and not self.is_discarded:
+            self.schedule_suspend()
+    
+    def set_retry_policy(self, policy: RetryPolicy, load_timeout_ms: int):
+        """ロードタイムアウトと再試行ポリシーを設定"""
+        self.circuit.policy = policy
+        self.load_timeout_duration = load_timeout_ms
     
     def set_suspend_timeout(self, timeout_ms: int):
-        """サスペンドタイムアウトを設定（ミリ秒）"""
-        self.suspend_timeout = timeout_ms
-        if self.suspend_timer.isActive():
-            self._reset_suspend_timer()
+        """破棄までのタイムアウトを設定（ミリ秒）"""
+        self.set_lifecycle_timeouts(self.freeze_timeout, timeout_ms)
     
     def showEvent(self, event):
-        """表示時に自動的に再開"""
+        """表示時に自動的に再開（タブを開いたことを操作とみなす）"""
         super().showEvent(event)
-        if self.is_suspended:
-            self.resume()
-        else:
-            self._reset_suspend_timer()
-    
-    def hideEvent(self, event):
-        """非表示時にタイマーを停止"""
-        super().hideEvent(event)
-        self.suspend_timer.stop()
+        self.mark_activity()
+        self.resume()
 
 
 class LazyWebView(QWidget):
     """遅延ロード機能を持つWebViewラッパー"""
     
     loaded = Signal()  # ロード完了シグナル
+    timing_recorded = Signal(str, float)  # WebViewのロード計測値を中継（指標名, ミリ秒）
+    lifecycle_changed = Signal(str)  # WebViewのライフサイクル状態の変更を中継
     
-    def __init__(self, url: str, profile: QWebEngineProfile, parent=None):
+    def __init__(self, url: str, profile: QWebEngineProfile, parent=None, page_pool=None):
         super().__init__(parent)
         
         self.url = url
         self.profile = profile
+        self.page_pool = page_pool  # 事前生成ビューのプール（Noneの場合はその場で作成）
         self.web_view: SuspendableWebView = None
         self.is_loaded = False
+        self.lifecycle_timeouts = None  # (凍結ms, 破棄ms)、Noneの場合はWebViewの既定値
+        self.retry_policy = None  # (RetryPolicy, ロードタイムアウトms)、Noneの場合はWebViewの既定値
+        self.crash_policy = None  # (最大クラッシュ回数, 期間秒)、Noneの場合はWebViewの既定値
+        self.error_placeholder: QWidget = None  # 再試行・復元停止中に表示する軽量なプレースホルダー
+        self._placeholder_action = None
         
         # レイアウトの準備
         self.layout = QVBoxLayout(self)
@@ -251,8 +523,21 @@ class LazyWebView(QWidget):
         if not self.is_loaded:
             print(f"遅延ロード開始: {self.url}")
             
-            # WebViewを作成
-            self.web_view = SuspendableWebView(self.profile, self)
+            # WebViewを作成（プールに予備があれば再利用）
+            if self.page_pool:
+                self.web_view = self.page_pool.acquire(self)
+            else:
+                self.web_view = SuspendableWebView(self.profile, self)
+            if self.lifecycle_timeouts:
+                self.web_view.set_lifecycle_timeouts(*self.lifecycle_timeouts)
+            if self.retry_policy:
+                self.web_view.set_retry_policy(*self.retry_policy)
+            if self.crash_policy:
+                self.web_view.set_crash_policy(*self.crash_policy)
+            self.web_view.circuit_changed.connect(self._on_circuit_changed)
+            self.web_view.crash_loop_changed.connect(self._on_crash_loop_changed)
+            self.web_view.timing_recorded.connect(self.timing_recorded)
+            self.web_view.lifecycle_changed.connect(self.lifecycle_changed)
             self.web_view.setUrl(QUrl(self.url))
             
             # レイアウトに追加
@@ -263,6 +548,17 @@ class LazyWebView(QWidget):
         
         return self.web_view
     
+    def unload(self):
+        """WebViewを削除して未ロード状態に戻す（プリロードの取り消し等）"""
+        if not self.is_loaded:
+            return
+        if self.error_placeholder is not None:
+            self.error_placeholder.hide()
+        self.layout.removeWidget(self.web_view)
+        self.web_view.deleteLater()
+        self.web_view = None
+        self.is_loaded = False
+    
     def get_web_view(self) -> SuspendableWebView:
         """WebViewを取得（未ロードの場合はロード）"""
         if not self.is_loaded:
@@ -273,8 +569,125 @@ class LazyWebView(QWidget):
         """ロード済みかどうかを確認"""
         return self.is_loaded
     
+    def current_url(self) -> str:
+        """表示中のURL（未ロード・エラーページなどの場合は読み込む予定のURL）"""
+        if self.is_loaded:
+            url = self.web_view.url()
+            if url.scheme() in ('http', 'https'):
+                return url.toString()
+        return self.url
+    
+    def set_lifecycle_timeouts(self, freeze_ms: int, discard_ms: int):
+        """凍結・破棄までの時間を設定（ミリ秒）"""
+        self.lifecycle_timeouts = (freeze_ms, discard_ms)
+        if self.is_loaded and self.web_view:
+            self.web_view.set_lifecycle_timeouts(freeze_ms, discard_ms)
+    
+    def set_retry_policy(self, policy: RetryPolicy, load_timeout_ms: int):
+        """ロードタイムアウトと再試行ポリシーを設定"""
+        self.retry_policy = (policy, load_timeout_ms)
+        if self.is_loaded and self.web_view:
+            self.web_view.set_retry_policy(policy, load_timeout_ms)
+    
+    def set_crash_policy(self, max_crashes: int, window_sec: float):
+        """クラッシュループと判定する回数と期間を設定"""
+        self.crash_policy = (max_crashes, window_sec)
+        if self.is_loaded and self.web_view:
+            self.web_view.set_crash_policy(max_crashes, window_sec)
+    
+    def _create_error_placeholder(self):
+        """再試行・復元停止中のプレースホルダーを作成"""
+        self.error_placeholder = QWidget(self)
+        self.error_placeholder.setStyleSheet("background-color: #1E1E1E;")
+        layout = QVBoxLayout(self.error_placeholder)
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        self.error_label = QLabel()
+        self.error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.error_label.setWordWrap(True)
+        self.error_label.setStyleSheet("color: #E0E0E0; font-size: 13px; padding: 10px;")
+        layout.addWidget(self.error_label)
+        
+        self.placeholder_button = QPushButton()
+        self.placeholder_button.setFixedWidth(160)
+        self.placeholder_button.setStyleSheet("""
+            QPushButton {
+                background-color: #3A3A3A;
+                border: 1px solid #505050;
+                border-radius: 3px;
+                padding: 6px;
+                color: #FFFFFF;
+            }
+            QPushButton:hover {
+                background-color: #4A7BD8;
+                border: 1px solid #5B8DEE;
+            }
+        """)
+        self.placeholder_button.clicked.connect(self._on_placeholder_button_clicked)
+        layout.addWidget(self.placeholder_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        self.layout.addWidget(self.error_placeholder)
+    
+    def _show_placeholder(self, message: str, button_text: str, action):
+        """ページの代わりにプレースホルダーを表示"""
+        if self.error_placeholder is None:
+            self._create_error_placeholder()
+        self.error_label.setText(message)
+        self.placeholder_button.setText(button_text)
+        self._placeholder_action = action
+        self.web_view.hide()
+        self.error_placeholder.show()
+    
+    def _hide_placeholder(self):
+        """プレースホルダーを閉じてページを表示"""
+        if self.error_placeholder is not None and not self.error_placeholder.isHidden():
+            self.error_placeholder.hide()
+            self.web_view.show()
+    
+    def _on_placeholder_button_clicked(self):
+        if self._placeholder_action:
+            self._placeholder_action()
+    
+    def _on_circuit_changed(self, is_open: bool, reason: str):
+        """再試行停止時はページの代わりにプレースホルダーを表示"""
+        if is_open:
+            message = f"ページを読み込めませんでした（{reason}）\n自動再読み込みを停止しています"
+            cooldown = self.web_view.circuit.cooldown_remaining()
+            if cooldown is not None:
+                message += f"\n約{cooldown / 60:.0f}分後にもう一度試します"
+            self._show_placeholder(message, "再読み込み", self.web_view.retry_now)
+            # 非表示になったページを破棄してメモリを解放（再試行時に再読み込み）
+            self.web_view.discard()
+        else:
+            self._hide_placeholder()
+    
+    def _on_crash_loop_changed(self, stopped: bool, reason: str):
+        """クラッシュが繰り返された場合は自動復元を止めてプレースホルダーを表示"""
+        if stopped:
+            message = (f"ページのプロセスが繰り返し終了しました（{reason}）\n"
+                       f"自動復元を停止しています")
+            self._show_placeholder(message, "復元", self.web_view.restore_after_crash)
+        else:
+            self._hide_placeholder()
+    
+    def last_interaction(self) -> float:
+        """WebViewの最終操作時刻（monotonic、未ロードの場合は0）"""
+        if self.is_loaded and self.web_view:
+            return self.web_view.last_interaction
+        return 0.0
+    
+    def schedule_suspend(self):
+        """段階的サスペンド（凍結→破棄）を開始"""
+        if self.is_loaded and self.web_view:
+            self.web_view.schedule_suspend()
+    
+    def cancel_scheduled_suspend(self):
+        """段階的サスペンドの予約を取り消す"""
+        if self.is_loaded and self.web_view:
+            self.web_view.cancel_scheduled_suspend()
+    
     def suspend(self):
-        """WebViewをサスペンド"""
+        """WebViewをサスペンド（破棄）"""
         if self.is_loaded and self.web_view:
             self.web_view.suspend()
     
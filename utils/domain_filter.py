@@ -0,0 +1,147 @@
+"""
+AI比較アプリケーション - ドメインフィルタモジュール
+ブロックリストをドメインのハッシュ集合に変換し、ホスト名をサフィックス単位で照合する
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+# hostsファイル形式の行で、ドメインの前に書かれるアドレス
+_HOSTS_ADDRESSES = {'0.0.0.0', '127.0.0.1', '::', '::1'}
+
+
+def parse_rule(line: str) -> Optional[tuple[str, bool]]:
+    """ブロックリストの1行を (ドメイン, 例外ルールか) に変換（対象外の行はNone）
+
+    対応形式: ドメインのみ / hostsファイル形式 / Adblock形式の「||example.com^」「@@||example.com^」
+    """
+    line = line.strip()
+    if not line or line[0] in '#![':
+        return None
+    line = line.split('#', 1)[0].strip()
+
+    allow = line.startswith('@@')
+    if allow:
+        line = line[2:]
+
+    if line.startswith('||'):
+        line = line[2:]
+        end = len(line)
+        for separator in '^/$':
+            index = line.find(separator)
+            if index != -1:
+                end = min(end, index)
+        # パス・ワイルドカード付きのルールはドメイン単位の照合では扱えないため無視
+        if end < len(line) and line[end] != '^' and line[end] != '$':
+            return None
+        line = line[:end]
+    else:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0] in _HOSTS_ADDRESSES:
+            line = parts[1]
+        elif len(parts) != 1:
+            return None
+
+    domain = line.lower().strip('.')
+    if not domain or '*' in domain or '/' in domain or '.' not in domain:
+        return None
+    if domain in ('localhost', 'localhost.localdomain'):
+        return None
+    return domain, allow
+
+
+class DomainFilter:
+    """ドメインとそのサブドメインをブロックするフィルタ
+
+    ホスト名「a.b.example.com」は「a.b.example.com」「b.example.com」「example.com」「com」の
+    順に集合を引くため、照合コストはルール数によらずラベル数に比例する
+    """
+
+    def __init__(self, blocked: Iterable[str] = (), allowed: Iterable[str] = ()):
+        self.blocked = frozenset(d.lower() for d in blocked)
+        self.allowed = frozenset(d.lower() for d in allowed)
+
+    def __len__(self) -> int:
+        return len(self.blocked)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> 'DomainFilter':
+        """ブロックリストの各行からフィルタを作成"""
+        blocked, allowed = set(), set()
+        for line in lines:
+            rule = parse_rule(line)
+            if rule is None:
+                continue
+            domain, allow = rule
+            (allowed if allow else blocked).add(domain)
+        return cls(blocked, allowed)
+
+    @classmethod
+    def from_file(cls, path) -> 'DomainFilter':
+        """ブロックリストファイルからフィルタを作成"""
+        with open(Path(path), 'r', encoding='utf-8', errors='replace') as f:
+            return cls.from_lines(f)
+
+    def _match(self, host: str, domains: frozenset) -> bool:
+        """hostまたはその親ドメインがdomainsに含まれるか"""
+        index = 0
+        while True:
+            if host[index:] in domains:
+                return True
+            index = host.find('.', index) + 1
+            if index == 0:
+                return False
+
+    def is_blocked(self, host: str) -> bool:
+        """ホスト名がブロック対象かどうか（例外ルールが優先）"""
+        if not host or not self.blocked:
+            return False
+        host = host.lower().rstrip('.')
+        if not self._match(host, self.blocked):
+            return False
+        return not (self.allowed and self._match(host, self.allowed))
+
+
+# 2ラベル以上からなる主なパブリックサフィックス（この下の1ラベルまでを1つのサイトとみなす）
+# 完全なPublic Suffix Listではないため、載っていないサフィックスは末尾1ラベルとして扱う
+MULTI_LABEL_SUFFIXES = frozenset({
+    # 日本（属性型・汎用）
+    'ac.jp', 'ad.jp', 'co.jp', 'ed.jp', 'go.jp', 'gr.jp', 'lg.jp', 'ne.jp', 'or.jp',
+    # イギリス
+    'ac.uk', 'co.uk', 'gov.uk', 'ltd.uk', 'me.uk', 'net.uk', 'org.uk', 'plc.uk', 'sch.uk',
+    # オーストラリア・ニュージーランド
+    'asn.au', 'com.au', 'edu.au', 'gov.au', 'id.au', 'net.au', 'org.au',
+    'ac.nz', 'co.nz', 'geek.nz', 'govt.nz', 'net.nz', 'org.nz',
+    # アジア
+    'com.cn', 'edu.cn', 'gov.cn', 'net.cn', 'org.cn',
+    'com.hk', 'edu.hk', 'gov.hk', 'net.hk', 'org.hk',
+    'com.tw', 'edu.tw', 'gov.tw', 'net.tw', 'org.tw',
+    'ac.kr', 'co.kr', 'go.kr', 'ne.kr', 'or.kr', 're.kr',
+    'co.in', 'firm.in', 'gen.in', 'ind.in', 'net.in', 'org.in',
+    'com.sg', 'edu.sg', 'gov.sg', 'net.sg', 'org.sg',
+    'ac.th', 'co.th', 'go.th', 'in.th', 'or.th',
+    'co.id', 'or.id', 'web.id',
+    'com.my', 'com.ph', 'com.vn',
+    # その他
+    'com.br', 'net.br', 'org.br', 'com.ar', 'com.mx', 'com.tr', 'co.za', 'org.za', 'co.il', 'org.il',
+    # サブドメインごとに別の利用者が使うホスティング
+    'github.io', 'gitlab.io', 'pages.dev', 'vercel.app', 'netlify.app', 'herokuapp.com',
+    'appspot.com', 'web.app', 'firebaseapp.com', 'blogspot.com', 'cloudfront.net',
+})
+
+
+def site_of(host: str) -> str:
+    """ファーストパーティ判定用のサイト（パブリックサフィックス＋1ラベル）
+
+    例: 「a.example.com」→「example.com」、「tracker.example.co.jp」→「example.co.jp」
+    IPアドレスはホスト名のまま、サフィックスそのもの（「co.jp」等）は空文字を返す
+    """
+    host = host.lower().rstrip('.')
+    if host in MULTI_LABEL_SUFFIXES:
+        return ''
+    labels = host.split('.')
+    if len(labels) <= 2 or labels[-1].isdigit() or ':' in host:
+        return host
+    suffix_labels = 2 if '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES else 1
+    return '.'.join(labels[-(suffix_labels + 1):])
@@ -0,0 +1,132 @@
+"""
+AI比較アプリケーション - ダウンロードファイルの処理モジュール
+ファイル名の整形・拡張子の補完、同名ファイルと衝突しない保存先の確保、画像のメタデータ削除
+（いずれもUIスレッド以外のワーカーから呼ばれる想定で、Qtに依存しない）
+"""
+
+import mimetypes
+import os
+import re
+import struct
+from pathlib import Path
+
+
+# MIMEタイプ -> 拡張子（mimetypesの推測より優先する一般的な画像形式）
+IMAGE_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/webp': '.webp',
+}
+
+
+def suggested_file_name(file_name: str, mime_type: str = "") -> str:
+    """Windowsで無効な文字を置換し、拡張子が無ければMIMEタイプから補完したファイル名"""
+    file_name = re.sub(r'[\\/:*?"<>|]', '_', file_name) or 'download'
+    base_name, ext = os.path.splitext(file_name)
+    if ext:
+        return file_name
+    if mime_type:
+        ext = IMAGE_EXTENSIONS.get(mime_type) or mimetypes.guess_extension(mime_type) or ''
+        # それでも拡張子がない場合、画像ならpngを試す（Geminiの画像生成用）
+        if not ext and 'image' in mime_type:
+            ext = '.png'
+    return f"{base_name}{ext}"
+
+
+def reserve_unique_path(directory: Path, file_name: str) -> Path:
+    """同名ファイルがあれば「名前 (n).拡張子」にして、空のファイルを排他的に作成して確保する
+
+    確保したパスに os.replace で書き込めば、同時に保存する他のダウンロードと衝突しない
+    """
+    directory = Path(directory)
+    base_name, ext = os.path.splitext(file_name)
+    counter = 0
+    while True:
+        name = file_name if counter == 0 else f"{base_name} ({counter}){ext}"
+        path = directory / name
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return path
+        except FileExistsError:
+            counter += 1
+
+
+# --- メタデータの削除（再エンコードせずにチャンク・セグメント単位で取り除く） ---
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# 削除するPNGの補助チャンク（テキスト・EXIF・更新時刻）
+PNG_METADATA_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'eXIf', b'tIME'}
+
+# 削除するJPEGのセグメント（APP1: EXIF・XMP、APP13: Photoshop・IPTC、COM: コメント）
+# APP2のICCプロファイルやAPP14のAdobe（CMYK・YCCKの色変換の指定）は表示に影響するため残す
+JPEG_METADATA_MARKERS = {0xE1, 0xED, 0xFE}
+# 長さフィールドを持たない単独のマーカー（TEM・RST0〜RST7）
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+
+
+def strip_png_metadata(data: bytes) -> bytes:
+    """PNGからテキスト・EXIF・時刻のチャンクを取り除く"""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("PNGではありません")
+    result = [PNG_SIGNATURE]
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack_from('>I4s', data, offset)
+        end = offset + 12 + length  # 長さ・種類・データ・CRC
+        if end > len(data):
+            raise ValueError("PNGのチャンクが途中で切れています")
+        if chunk_type not in PNG_METADATA_CHUNKS:
+            result.append(data[offset:end])
+        offset = end
+        if chunk_type == b'IEND':
+            break
+    return b''.join(result)
+
+
+def strip_jpeg_metadata(data: bytes) -> bytes:
+    """JPEGからEXIF・XMP・IPTC・コメントのセグメントを取り除く（JFIF・ICCプロファイル・Adobeのセグメントは残す）"""
+    if not data.startswith(b'\xff\xd8'):
+        raise ValueError("JPEGではありません")
+    result = [b'\xff\xd8']
+    offset = 2
+    while offset + 2 <= len(data):
+        if data[offset] != 0xFF:
+            raise ValueError("JPEGのセグメントが不正です")
+        if data[offset + 1] == 0xFF:  # マーカー前の埋め草（0xFFの連続）は読み飛ばす
+            offset += 1
+            continue
+        marker = data[offset + 1]
+        if marker == 0xDA or marker == 0xD9:  # 画像データの開始（SOS）・終了（EOI）以降はそのまま
+            result.append(data[offset:])
+            return b''.join(result)
+        if marker in JPEG_STANDALONE_MARKERS:
+            result.append(data[offset:offset + 2])
+            offset += 2
+            continue
+        if offset + 4 > len(data):
+            raise ValueError("JPEGのセグメントが途中で切れています")
+        length = struct.unpack_from('>H', data, offset + 2)[0]
+        end = offset + 2 + length
+        if length < 2 or end > len(data):
+            raise ValueError("JPEGのセグメントが途中で切れています")
+        if marker not in JPEG_METADATA_MARKERS:
+            result.append(data[offset:end])
+        offset = end
+    result.append(data[offset:])
+    return b''.join(result)
+
+
+def strip_metadata(path: Path) -> bool:
+    """PNG・JPEGのメタデータを取り除いて上書きする（対象外の形式はFalse）"""
+    path = Path(path)
+    strippers = {'.png': strip_png_metadata, '.jpg': strip_jpeg_metadata, '.jpeg': strip_jpeg_metadata}
+    stripper = strippers.get(path.suffix.lower())
+    if stripper is None:
+        return False
+    data = path.read_bytes()
+    stripped = stripper(data)
+    if len(stripped) != len(data):
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_bytes(stripped)
+        os.replace(temp_path, path)
+    return True
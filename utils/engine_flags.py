@@ -0,0 +1,47 @@
+"""
+AI比較アプリケーション - Chromiumフラグ生成モジュール
+QTWEBENGINE_CHROMIUM_FLAGSを設定から組み立てる（QApplication作成前に呼ぶ必要がある）
+"""
+
+from typing import List
+
+
+# 常に付けるフラグ（コーデック・自動再生）
+BASE_FLAGS = [
+    "--enable-features=PlatformHEVCDecoderSupport,ProprietaryCodecs,ms-playready",
+    "--autoplay-policy=no-user-gesture-required",
+    "--enable-widevine",
+]
+
+# GPUが使える場合はブロックリストを無視してGPUラスタライズを強制し、
+# 使えない場合はソフトウェアラスタライズに切り替える（GPU初期化の失敗・遅いフォールバックを避ける）
+GPU_FLAGS = ["--ignore-gpu-blocklist", "--enable-gpu-rasterization"]
+SOFTWARE_RASTER_FLAGS = ["--disable-gpu", "--disable-gpu-rasterization"]
+
+# レンダラープロセスモデル
+# process_per_site_instance: Chromiumの既定。ペインごとに別プロセス（メモリ大、クラッシュは1ペインで完結）
+# process_per_site: 同じサイトのペインで1プロセスを共有（クラッシュすると同じサイトのペインが全て落ちる）
+# limited: レンダラープロセス数を上限で抑え、超えた分は既存プロセスに相乗り（サイトをまたいで巻き込まれる）
+PROCESS_MODELS = ('process_per_site_instance', 'process_per_site', 'limited')
+
+
+def process_model_flags(model: str, process_limit: int = 4) -> List[str]:
+    """プロセスモデルに対応するフラグ"""
+    if model == 'process_per_site':
+        return ["--process-per-site"]
+    if model == 'limited':
+        return [f"--renderer-process-limit={max(int(process_limit), 1)}"]
+    if model != 'process_per_site_instance':
+        print(f"不明なプロセスモデル: {model} - 既定（process_per_site_instance）を使用")
+    return []
+
+
+def build_chromium_flags(settings) -> str:
+    """設定からQTWEBENGINE_CHROMIUM_FLAGSの値を組み立てる"""
+    flags = list(BASE_FLAGS)
+    flags += GPU_FLAGS if settings.get('gpu_rasterization', True) else SOFTWARE_RASTER_FLAGS
+    flags += process_model_flags(
+        settings.get('process_model', 'process_per_site_instance'),
+        settings.get('renderer_process_limit', 4)
+    )
+    return " ".join(flags)
@@ -0,0 +1,107 @@
+"""
+AI比較アプリケーション - ロード時間統計モジュール
+サービスごとのロード各段階の計測値を保持し、パーセンタイルを計算する
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .persistence import atomic_write_json
+
+
+# 計測する指標（ナビゲーション開始からのミリ秒）
+LOAD_METRICS = (
+    'first_paint',
+    'first_contentful_paint',
+    'largest_contentful_paint',
+    'dom_content_loaded',
+    'load_finished',
+)
+
+PERCENTILES = (50, 90, 95)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """線形補間でpパーセンタイルを計算（値が無い場合はNone）"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class LoadMetricsStore:
+    """サービス・指標ごとに直近max_samples件の計測値を保持するクラス"""
+
+    def __init__(self, path: Path = None, max_samples: int = 200):
+        self.path = Path(path) if path else None
+        self.max_samples = max_samples
+        # サービス名 -> {指標名: 計測値（ミリ秒）}
+        self.samples: Dict[str, Dict[str, deque]] = {}
+        self.dirty = False
+        if self.path:
+            self.load()
+
+    def record(self, service: str, metric: str, value_ms: float):
+        """計測値を追加"""
+        if value_ms is None or value_ms < 0:
+            return
+        metrics = self.samples.setdefault(service, {})
+        values = metrics.get(metric)
+        if values is None:
+            values = metrics[metric] = deque(maxlen=self.max_samples)
+        values.append(float(value_ms))
+        self.dirty = True
+
+    def percentiles(self, service: str, metric: str) -> Dict[int, Optional[float]]:
+        """指標のパーセンタイル（p50/p90/p95）を返す"""
+        values = list(self.samples.get(service, {}).get(metric, ()))
+        return {p: percentile(values, p) for p in PERCENTILES}
+
+    def summary(self) -> Dict[str, Dict[str, dict]]:
+        """全サービスの集計（サービス名 -> 指標名 -> {count, p50, p90, p95}）"""
+        result = {}
+        for service, metrics in self.samples.items():
+            result[service] = {}
+            for metric, values in metrics.items():
+                stats = {'count': len(values)}
+                for p, value in self.percentiles(service, metric).items():
+                    stats[f'p{p}'] = value
+                result[service][metric] = stats
+        return result
+
+    def load(self):
+        """ファイルから読み込む"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"ロード時間統計の読み込みに失敗: {e}")
+            return
+        for service, metrics in data.get('samples', {}).items():
+            self.samples[service] = {
+                metric: deque((float(v) for v in values), maxlen=self.max_samples)
+                for metric, values in metrics.items()
+            }
+
+    def save(self):
+        """変更があればファイルに保存する"""
+        if not self.path or not self.dirty:
+            return
+        data = {
+            'samples': {
+                service: {metric: [round(v, 1) for v in values] for metric, values in metrics.items()}
+                for service, metrics in self.samples.items()
+            }
+        }
+        try:
+            atomic_write_json(self.path, data)
+            self.dirty = False
+        except Exception as e:
+            print(f"ロード時間統計の保存に失敗: {e}")
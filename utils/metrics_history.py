@@ -0,0 +1,338 @@
+"""
+AI比較アプリケーション - メトリクス履歴モジュール
+合計メモリ・CPU・サービスごとのメモリと、凍結/破棄/再開/ロードのイベントを
+固定サイズのリングバッファ（配列）に記録する。ファイルを指定するとメモリマップし、
+アプリが異常終了しても直前までの履歴が残る
+
+使い方（GUIを起動せずに前回セッションの履歴を書き出す）:
+    python -m utils.metrics_history ~/.ai_comparison_app/metrics_history.prev.bin --csv history.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+MAGIC = b'AICMHIS1'
+VERSION = 1
+# magic, version, サンプル容量, サービス列数, イベント容量, 書き込んだサンプル総数, 書き込んだイベント総数
+HEADER = struct.Struct('<8sIIIIQQ')
+NAME_BYTES = 64  # サービス名1つあたりのバイト数（UTF-8）
+
+EVENT_KINDS = ('load', 'freeze', 'discard', 'resume')
+NO_SERVICE = 255
+
+
+def _align8(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def _layout(capacity: int, max_services: int, event_capacity: int) -> Dict[str, tuple]:
+    """各配列の (開始位置, バイト数) と全体のサイズ"""
+    sections = [
+        ('names', max_services * NAME_BYTES),
+        ('times', capacity * 8),
+        ('total_mb', capacity * 4),
+        ('cpu_percent', capacity * 4),
+        ('services_mb', capacity * max_services * 4),
+        ('event_times', event_capacity * 8),
+        ('event_kinds', event_capacity),
+        ('event_services', event_capacity),
+    ]
+    layout = {}
+    offset = HEADER.size
+    for name, size in sections:
+        offset = _align8(offset)
+        layout[name] = (offset, size)
+        offset += size
+    layout['size'] = (0, _align8(offset))
+    return layout
+
+
+class MetricsHistory:
+    """メトリクスの固定サイズリングバッファ（古いものから上書き）"""
+
+    def __init__(self, capacity: int = 3600, max_services: int = 16, event_capacity: int = 1024,
+                 path: Path = None):
+        self.capacity = max(int(capacity), 2)
+        self.max_services = min(max(int(max_services), 1), NO_SERVICE)
+        self.event_capacity = max(int(event_capacity), 1)
+        self.path = Path(path) if path else None
+        self._file = None
+        self._mmap = None
+        self._service_columns: Dict[str, int] = {}
+        self.sample_total = 0
+        self.event_total = 0
+
+        self._layout = _layout(self.capacity, self.max_services, self.event_capacity)
+        size = self._layout['size'][1]
+        buffer = None
+        if self.path:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'w+b')
+                self._file.truncate(size)
+                self._mmap = mmap.mmap(self._file.fileno(), size)
+                buffer = self._mmap
+            except (OSError, ValueError) as e:
+                print(f"メトリクス履歴ファイルを作成できません（メモリ上のみに記録）: {e}")
+                self._close_file()
+        if buffer is None:
+            buffer = bytearray(size)
+        self._attach(buffer)
+        self.clear()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'MetricsHistory':
+        """保存済みの履歴（メモリマップしたファイルの内容）を読み込む"""
+        if len(data) < HEADER.size:
+            raise ValueError("メトリクス履歴のヘッダーがありません")
+        magic, version, capacity, max_services, event_capacity, sample_total, event_total = \
+            HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("メトリクス履歴の形式が異なります")
+        history = cls(capacity, max_services, event_capacity)
+        size = history._layout['size'][1]
+        if len(data) < size:
+            raise ValueError("メトリクス履歴ファイルが途中で切れています")
+        history._buffer[:size] = data[:size]
+        history.sample_total = sample_total
+        history.event_total = event_total
+        for column in range(history.max_services):
+            name = history._read_name(column)
+            if name:
+                history._service_columns[name] = column
+        return history
+
+    @classmethod
+    def load(cls, path: Path) -> 'MetricsHistory':
+        """履歴ファイルを読み込む（読み込んだ履歴はファイルに書き戻さない）"""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def _attach(self, buffer):
+        """バッファ上の各領域を型付きの配列（memoryview）として参照する"""
+        self._buffer = buffer
+        view = memoryview(buffer)
+
+        def section(name, fmt):
+            offset, size = self._layout[name]
+            return view[offset:offset + size].cast(fmt)
+
+        self.times = section('times', 'd')
+        self.total_mb = section('total_mb', 'f')
+        self.cpu_percent = section('cpu_percent', 'f')
+        self.services_mb = section('services_mb', 'f')
+        self.event_times = section('event_times', 'd')
+        self.event_kinds = section('event_kinds', 'B')
+        self.event_services = section('event_services', 'B')
+
+    def clear(self):
+        """履歴を空にする"""
+        self._buffer[:self._layout['size'][1]] = bytes(self._layout['size'][1])
+        self._service_columns.clear()
+        self.sample_total = 0
+        self.event_total = 0
+        self._write_header()
+
+    def _write_header(self):
+        HEADER.pack_into(self._buffer, 0, MAGIC, VERSION, self.capacity, self.max_services,
+                         self.event_capacity, self.sample_total, self.event_total)
+
+    def _read_name(self, column: int) -> str:
+        offset = self._layout['names'][0] + column * NAME_BYTES
+        return bytes(self._buffer[offset:offset + NAME_BYTES]).rstrip(b'\0').decode('utf-8', 'ignore')
+
+    def _service_column(self, name: str) -> Optional[int]:
+        """サービス名の列番号（新しいサービスには空き列を割り当て、満杯ならNone）"""
+        column = self._service_columns.get(name)
+        if column is not None or len(self._service_columns) >= self.max_services:
+            return column
+        column = len(self._service_columns)
+        encoded = name.encode('utf-8')[:NAME_BYTES]
+        encoded = encoded.decode('utf-8', 'ignore').encode('utf-8')  # 途中で切れた文字を除く
+        offset = self._layout['names'][0] + column * NAME_BYTES
+        self._buffer[offset:offset + NAME_BYTES] = encoded.ljust(NAME_BYTES, b'\0')
+        self._service_columns[name] = column
+        return column
+
+    def append(self, total_mb: float, cpu_percent: float, services: Dict[str, float] = None,
+               timestamp: float = None):
+        """計測値を1件記録"""
+        index = self.sample_total % self.capacity
+        self.times[index] = timestamp if timestamp is not None else time.time()
+        self.total_mb[index] = total_mb
+        self.cpu_percent[index] = cpu_percent
+        row = index * self.max_services
+        for column in range(self.max_services):
+            self.services_mb[row + column] = math.nan
+        for name, value in (services or {}).items():
+            column = self._service_column(name)
+            if column is not None:
+                self.services_mb[row + column] = value
+        self.sample_total += 1
+        self._write_header()
+
+    def add_event(self, kind: str, service: str = None, timestamp: float = None):
+        """凍結・破棄・再開・ロード完了などのイベントを記録"""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"不明なイベント: {kind}")
+        index = self.event_total % self.event_capacity
+        self.event_times[index] = timestamp if timestamp is not None else time.time()
+        self.event_kinds[index] = EVENT_KINDS.index(kind)
+        column = self._service_column(service) if service else None
+        self.event_services[index] = NO_SERVICE if column is None else column
+        self.event_total += 1
+        self._write_header()
+
+    def _ordered(self, total: int, capacity: int) -> range:
+        """古い順のバッファ位置"""
+        count = min(total, capacity)
+        return range(total - count, total)
+
+    @property
+    def service_names(self) -> List[str]:
+        return sorted(self._service_columns, key=self._service_columns.get)
+
+    def samples(self) -> List[dict]:
+        """記録中の計測値（古い順）"""
+        names = self.service_names
+        result = []
+        for position in self._ordered(self.sample_total, self.capacity):
+            index = position % self.capacity
+            row = index * self.max_services
+            services = {}
+            for column, name in enumerate(names):
+                value = self.services_mb[row + column]
+                if not math.isnan(value):
+                    services[name] = round(value, 1)
+            result.append({
+                'time': self.times[index],
+                'total_mb': round(self.total_mb[index], 1),
+                'cpu_percent': round(self.cpu_percent[index], 1),
+                'services': services,
+            })
+        return result
+
+    def events(self) -> List[dict]:
+        """記録中のイベント（古い順）"""
+        names = self.service_names
+        result = []
+        for position in self._ordered(self.event_total, self.event_capacity):
+            index = position % self.event_capacity
+            column = self.event_services[index]
+            result.append({
+                'time': self.event_times[index],
+                'kind': EVENT_KINDS[self.event_kinds[index]],
+                'service': names[column] if column < len(names) else None,
+            })
+        return result
+
+    def to_json(self, path: Path):
+        """JSONに書き出す"""
+        data = {
+            'capacity': self.capacity,
+            'samples': self.samples(),
+            'events': self.events(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def to_csv(self, path: Path):
+        """CSVに書き出す（計測値とイベントを時刻順に1つの表にまとめる。kind列がsampleの行が計測値）"""
+        names = self.service_names
+        rows = []
+        for sample in self.samples():
+            rows.append([sample['time'], 'sample', '', sample['total_mb'], sample['cpu_percent']]
+                        + [sample['services'].get(name, '') for name in names])
+        for event in self.events():
+            rows.append([event['time'], event['kind'], event['service'] or '', '', '']
+                        + [''] * len(names))
+        rows.sort(key=lambda row: row[0])
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['time', 'datetime', 'kind', 'service', 'total_mb', 'cpu_percent']
+                            + [f"{name}_mb" for name in names])
+            for row in rows:
+                writer.writerow([f"{row[0]:.3f}", datetime.fromtimestamp(row[0]).isoformat(timespec='seconds')]
+                                + row[1:])
+
+    def flush(self):
+        """メモリマップしたファイルをディスクに書き出す"""
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self):
+        """ファイルを閉じる（以降はメモリ上のみに記録）"""
+        if self._mmap is None:
+            return
+        buffer = bytearray(self._mmap)
+        self.flush()
+        # 配列の参照を先に切り替えないとmmapを閉じられない
+        self._release_views()
+        self._attach(buffer)
+        self._close_file()
+
+    def _release_views(self):
+        for name in ('times', 'total_mb', 'cpu_percent', 'services_mb',
+                     'event_times', 'event_kinds', 'event_services'):
+            getattr(self, name).release()
+
+    def _close_file(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def rotate_history_file(path: Path) -> Optional[Path]:
+    """前回セッションの履歴ファイルを .prev.bin に退避する（異常終了時の調査用）"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    previous = path.with_suffix('.prev.bin')
+    try:
+        os.replace(path, previous)
+    except OSError as e:
+        print(f"前回のメトリクス履歴を退避できません: {e}")
+        return None
+    return previous
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="メトリクス履歴ファイルの書き出し")
+    parser.add_argument('path', help="履歴ファイル（metrics_history.bin / metrics_history.prev.bin）")
+    parser.add_argument('--csv', help="CSVの出力先")
+    parser.add_argument('--json', help="JSONの出力先")
+    args = parser.parse_args()
+
+    history = MetricsHistory.load(args.path)
+    if args.csv:
+        history.to_csv(args.csv)
+    if args.json:
+        history.to_json(args.json)
+    samples = history.samples()
+    if samples:
+        peak = max(samples, key=lambda sample: sample['total_mb'])
+        print(f"{len(samples)}件 "
+              f"({datetime.fromtimestamp(samples[0]['time']):%Y-%m-%d %H:%M:%S} - "
+              f"{datetime.fromtimestamp(samples[-1]['time']):%H:%M:%S}), "
+              f"最大 {peak['total_mb']:.0f} MB, イベント {len(history.events())}件")
+    else:
+        print("記録がありません")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
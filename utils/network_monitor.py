@@ -0,0 +1,51 @@
+"""
+AI比較アプリケーション - ネットワーク接続状態監視モジュール
+オフライン中はロードの再試行を止め、復帰時にまとめて再開するために使用する
+"""
+
+from PySide6.QtCore import QObject, Signal, QCoreApplication
+from PySide6.QtNetwork import QNetworkInformation
+
+
+class NetworkMonitor(QObject):
+    """OSのネットワーク到達性を監視するクラス（アプリ全体で1つ）"""
+
+    online_changed = Signal(bool)  # オンライン状態変更シグナル
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'NetworkMonitor':
+        """共有インスタンスを取得"""
+        if cls._instance is None:
+            cls._instance = cls(QCoreApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._info = None
+        if QNetworkInformation.loadBackendByFeatures(QNetworkInformation.Feature.Reachability):
+            self._info = QNetworkInformation.instance()
+            self._info.reachabilityChanged.connect(self._on_reachability_changed)
+        else:
+            print("ネットワーク状態の監視に非対応のため、常にオンラインとして扱います")
+
+        self.is_online = self._check_online()
+
+    def _check_online(self) -> bool:
+        """インターネットに到達可能かどうか（判定できない場合はオンライン扱い）"""
+        if self._info is None:
+            return True
+        return self._info.reachability() in (
+            QNetworkInformation.Reachability.Online,
+            QNetworkInformation.Reachability.Unknown,
+        )
+
+    def _on_reachability_changed(self, reachability):
+        """到達性変更時の処理"""
+        online = self._check_online()
+        if online != self.is_online:
+            self.is_online = online
+            print("ネットワーク復帰" if online else "⚠️ オフラインを検出 - ロードの再試行を一時停止")
+            self.online_changed.emit(online)
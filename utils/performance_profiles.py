@@ -0,0 +1,127 @@
+"""
+AI比較アプリケーション - パフォーマンスプロファイルモジュール
+ハードウェア（搭載メモリ・CPU数・GPUの初期化可否）からプロファイルを選び、
+Chromiumフラグ・サスペンド・キャッシュ・プリロード関連の設定をまとめて切り替える
+"""
+
+import os
+from typing import Any, Dict
+
+import psutil
+
+
+# プロファイル名 -> 設定値（ユーザーが設定ファイルに書いた項目はそちらを優先）
+PERFORMANCE_PROFILES: Dict[str, Dict[str, Any]] = {
+    'low-memory': {
+        'freeze_timeout': 15,
+        'suspend_timeout': 120,
+        'auto_suspend': True,
+        'memory_budget_mb': 2048,
+        'memory_warning_threshold': 3072,
+        'page_pool_size': 0,
+        'predictive_preload': False,
+        'http_cache_size_mb': 50,
+        'process_model': 'process_per_site',
+    },
+    'balanced': {
+        'freeze_timeout': 30,
+        'suspend_timeout': 300,
+        'memory_budget_mb': 4096,
+        'page_pool_size': 1,
+        'predictive_preload': True,
+        'http_cache_size_mb': 100,
+    },
+    'max-performance': {
+        'freeze_timeout': 120,
+        'suspend_timeout': 1800,
+        'memory_budget_mb': 8192,
+        'memory_warning_threshold': 12288,
+        'page_pool_size': 2,
+        'predictive_preload': True,
+        'preload_min_probability': 0.2,
+        'load_concurrency': 2,
+        'http_cache_size_mb': 300,
+    },
+}
+
+# GPUが使えないと判定する（ソフトウェア実装の）OpenGLレンダラー名
+SOFTWARE_RENDERERS = ('llvmpipe', 'softpipe', 'swiftshader', 'microsoft basic render', 'gdi generic')
+
+
+def probe_gpu() -> dict:
+    """OpenGLコンテキストを作成してGPUが使えるか確認する（QApplication作成後に呼ぶ）"""
+    from PySide6.QtGui import QOffscreenSurface, QOpenGLContext
+
+    result = {'available': False, 'renderer': None}
+    try:
+        context = QOpenGLContext()
+        if not context.create():
+            return result
+        surface = QOffscreenSurface()
+        surface.setFormat(context.format())
+        surface.create()
+        if not context.makeCurrent(surface):
+            return result
+        renderer = context.functions().glGetString(0x1F01) or ""  # GL_RENDERER
+        context.doneCurrent()
+        surface.destroy()
+    except Exception as e:
+        print(f"GPUの確認に失敗: {e}")
+        return result
+    result['renderer'] = renderer
+    result['available'] = bool(renderer) and not any(
+        name in renderer.lower() for name in SOFTWARE_RENDERERS
+    )
+    return result
+
+
+def detect_hardware(gpu: bool = True) -> dict:
+    """搭載メモリ（MB）・CPU数・GPUの状態を取得"""
+    hardware = {
+        'memory_mb': psutil.virtual_memory().total / (1024 * 1024),
+        'cpu_count': os.cpu_count() or 1,
+        'gpu': probe_gpu() if gpu else {'available': False, 'renderer': None},
+    }
+    return hardware
+
+
+def choose_profile(hardware: dict) -> str:
+    """ハードウェアに合ったプロファイル名を選ぶ"""
+    if hardware['memory_mb'] < 8 * 1024 - 512 or hardware['cpu_count'] <= 2:
+        return 'low-memory'  # 8GB未満（OS予約分を考慮）または2コア以下
+    if hardware['memory_mb'] >= 16 * 1024 - 512 and hardware['cpu_count'] >= 8 and hardware['gpu']['available']:
+        return 'max-performance'
+    return 'balanced'
+
+
+def apply_performance_profile(settings) -> str:
+    """設定に応じてプロファイルを選択し、Settingsに反映して名前を返す
+
+    Chromiumフラグを組み立てる前（WebEngineの初期化前）、QApplication作成後に呼ぶ
+    """
+    name = settings.get('performance_profile', 'auto')
+    gpu_setting = settings.get('gpu_acceleration', 'auto')
+    hardware = detect_hardware(gpu=gpu_setting == 'auto' or name == 'auto')
+
+    if name not in PERFORMANCE_PROFILES:
+        if name != 'auto':
+            print(f"不明なパフォーマンスプロファイル: {name} - 自動選択")
+        name = choose_profile(hardware)
+
+    if gpu_setting == 'on':
+        gpu_rasterization = True
+    elif gpu_setting == 'off':
+        gpu_rasterization = False
+    else:
+        gpu_rasterization = hardware['gpu']['available']
+
+    values = dict(PERFORMANCE_PROFILES[name])
+    values['gpu_rasterization'] = gpu_rasterization
+    settings.set_profile_values(values)
+    settings.active_performance_profile = name
+
+    print(f"パフォーマンスプロファイル: {name} "
+          f"(メモリ {hardware['memory_mb']:.0f} MB, CPU {hardware['cpu_count']}, "
+          f"GPU {hardware['gpu']['renderer'] or 'なし'}, "
+          f"{'GPUラスタライズ' if gpu_rasterization else 'ソフトウェアラスタライズ'})")
+    return name
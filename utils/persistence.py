@@ -0,0 +1,98 @@
+"""
+AI比較アプリケーション - ファイル保存モジュール
+一時ファイルに書いてから置き換える（途中で落ちても元のファイルが壊れない）原子的な書き込みと、
+短時間の連続した変更を1回の書き込みにまとめてバックグラウンドで保存するライトビハインド
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+
+def atomic_write_text(path: Path, text: str):
+    """同じフォルダの一時ファイルに書き込んでからリネームで置き換える"""
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def atomic_write_json(path: Path, data: Any, indent: int = None):
+    """JSONを原子的に書き込む"""
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+
+def quarantine_corrupt_file(path: Path) -> Path:
+    """読み込めないファイルを .corrupt に退避し、次の保存で上書きされないようにする"""
+    path = Path(path)
+    corrupt_path = path.with_name(path.name + '.corrupt')
+    try:
+        os.replace(path, corrupt_path)
+    except OSError as e:
+        print(f"壊れたファイルを退避できません: {e}")
+        return None
+    return corrupt_path
+
+
+class WriteBehindWriter:
+    """変更の通知をまとめ、最初の通知からdelay秒後にバックグラウンドスレッドで1回だけ書き込む
+
+    serializeは書き込み時にバックグラウンドスレッドから呼ばれ、保存する文字列を返す
+    """
+
+    def __init__(self, path: Path, serialize: Callable[[], str], delay: float = 1.0):
+        self.path = Path(path)
+        self.serialize = serialize
+        self.delay = delay
+        self._lock = threading.Lock()  # 予約状態の保護
+        self._write_lock = threading.Lock()  # 書き込みを1つずつ行う
+        self._timer: threading.Timer = None
+        self._pending = False
+
+    def schedule(self):
+        """保存を予約（予約済みであれば同じ書き込みにまとめる）"""
+        with self._lock:
+            self._pending = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @property
+    def pending(self) -> bool:
+        return self._pending
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self._write_pending()
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._pending = False
+            try:
+                atomic_write_text(self.path, self.serialize())
+            except Exception as e:
+                print(f"保存に失敗 ({self.path.name}): {e}")
+
+    def flush(self):
+        """予約中の保存を今すぐ（呼び出したスレッドで）行う"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._write_pending()
+
+    def write_now(self):
+        """予約の有無にかかわらず今すぐ保存する"""
+        with self._lock:
+            self._pending = True
+        self.flush()
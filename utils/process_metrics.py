@@ -0,0 +1,98 @@
+"""
+AI比較アプリケーション - プロセスメトリクス収集モジュール
+メインプロセスと子プロセス（QtWebEngineProcess）ごとのメモリ・CPU使用量を計測する
+"""
+
+from typing import Dict, Optional
+
+import psutil
+
+
+MB = 1024 * 1024
+
+
+class ProcessMetricsCollector:
+    """プロセスツリーのメモリ・CPU使用量を収集するクラス"""
+
+    def __init__(self, root_pid: int = None):
+        self.root = psutil.Process(root_pid)
+        # cpu_percentは前回呼び出しとの差分で計算されるため、インスタンスを保持する
+        self._processes: Dict[int, psutil.Process] = {self.root.pid: self.root}
+        self.root.cpu_percent(None)
+
+    def _get_process(self, pid: int) -> Optional[psutil.Process]:
+        """キャッシュ済みのpsutil.Processを取得"""
+        process = self._processes.get(pid)
+        if process is None or not process.is_running():
+            try:
+                process = psutil.Process(pid)
+                process.cpu_percent(None)  # 初回は0.0が返るため計測の起点にする
+            except psutil.Error:
+                self._processes.pop(pid, None)
+                return None
+            self._processes[pid] = process
+        return process
+
+    def sample_process(self, pid: int, full: bool = True) -> Optional[dict]:
+        """1プロセスのメモリ（MB）とCPU使用率を取得
+
+        full=Trueの場合はUSS/PSSも取得する（PSSはLinuxのみ、取得できない場合はNone）
+        """
+        process = self._get_process(pid)
+        if process is None:
+            return None
+        try:
+            with process.oneshot():
+                if full:
+                    memory = process.memory_full_info()
+                else:
+                    memory = process.memory_info()
+                cpu = process.cpu_percent(None)
+                name = process.name()
+        except psutil.Error:
+            self._processes.pop(pid, None)
+            return None
+
+        uss = getattr(memory, 'uss', None)
+        pss = getattr(memory, 'pss', None)
+        return {
+            'pid': pid,
+            'name': name,
+            'rss_mb': memory.rss / MB,
+            'uss_mb': uss / MB if uss is not None else None,
+            'pss_mb': pss / MB if pss is not None else None,
+            'cpu_percent': cpu,
+        }
+
+    def sample_tree(self, full_pids: set = None) -> dict:
+        """メインプロセスと全子プロセスを計測
+
+        full_pidsに含まれるプロセス（レンダラー等）のみUSS/PSSを取得する
+        """
+        full_pids = full_pids or set()
+        processes = {}
+
+        main = self.sample_process(self.root.pid, full=False)
+        if main:
+            processes[main['pid']] = main
+
+        try:
+            children = self.root.children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            info = self.sample_process(child.pid, full=child.pid in full_pids)
+            if info:
+                processes[info['pid']] = info
+
+        # 終了したプロセスのキャッシュを削除
+        for pid in list(self._processes):
+            if pid not in processes and pid != self.root.pid:
+                del self._processes[pid]
+
+        return {
+            'main': main,
+            'processes': processes,
+            'total_rss_mb': sum(p['rss_mb'] for p in processes.values()),
+            'total_cpu_percent': sum(p['cpu_percent'] for p in processes.values()),
+        }
@@ -0,0 +1,117 @@
+"""
+AI比較アプリケーション - ロード失敗・クラッシュからの復旧制御モジュール
+指数バックオフ（ジッター付き）とサーキットブレーカーで再読み込みの嵐を防ぎ、
+スライディングウィンドウでクラッシュループを検出する
+"""
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class RetryPolicy:
+    """再試行ポリシー（時間は全て秒）"""
+    base_delay: float = 2.0  # 1回目の再試行までの待ち時間
+    max_delay: float = 120.0  # 待ち時間の上限
+    multiplier: float = 2.0  # 失敗ごとの待ち時間の倍率
+    jitter: float = 0.3  # 待ち時間を±30%の範囲でばらつかせる（全ペインの同時再試行を防ぐ）
+    max_attempts: int = 5  # この回数失敗するとサーキットを開く
+    open_cooldown: float = 300.0  # サーキットが開いてから自動で試行を再開するまで（0で手動のみ）
+
+    def delay_for(self, attempt: int, rng: random.Random = None) -> float:
+        """attempt回目（1始まり）の再試行までの待ち時間を計算"""
+        rng = rng or random
+        delay = min(self.base_delay * (self.multiplier ** max(attempt - 1, 0)), self.max_delay)
+        if self.jitter > 0:
+            delay *= 1 + rng.uniform(-self.jitter, self.jitter)
+        return max(delay, 0.0)
+
+
+class CircuitBreaker:
+    """連続失敗回数を数え、上限に達したら再試行を止めるサーキットブレーカー
+
+    CLOSED: 通常状態（失敗時はバックオフ後に再試行）
+    OPEN: 再試行停止中（プレースホルダーを表示）
+    HALF_OPEN: OPENから1回だけ試行中（成功でCLOSED、失敗で再びOPEN）
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, policy: RetryPolicy = None, clock: Callable[[], float] = time.monotonic,
+                 rng: random.Random = None):
+        self.policy = policy or RetryPolicy()
+        self.clock = clock
+        self.rng = rng
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def record_success(self):
+        """成功を記録して通常状態に戻す"""
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> Optional[float]:
+        """失敗を記録し、次の再試行までの待ち時間（秒）を返す
+
+        サーキットが開いた場合はNoneを返す
+        """
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.policy.max_attempts:
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+            return None
+        return self.policy.delay_for(self.failures, self.rng)
+
+    def half_open(self):
+        """OPEN状態から1回だけ試行を許可"""
+        if self.state == self.OPEN:
+            self.state = self.HALF_OPEN
+
+    def cooldown_remaining(self) -> Optional[float]:
+        """自動で試行を再開するまでの残り秒数（自動再開しない場合はNone）"""
+        if self.state != self.OPEN or self.policy.open_cooldown <= 0:
+            return None
+        return max(self.opened_at + self.policy.open_cooldown - self.clock(), 0.0)
+
+    def reset(self):
+        """失敗回数をリセット（ネットワーク復帰時など）"""
+        self.record_success()
+
+
+class SlidingWindowCounter:
+    """直近window秒間の発生回数を数えるカウンター（クラッシュループ検出用）"""
+
+    def __init__(self, window: float, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+        self._events: deque = deque()
+
+    def _expire(self, now: float):
+        while self._events and now - self._events[0] > self.window:
+            self._events.popleft()
+
+    def record(self) -> int:
+        """発生を記録し、ウィンドウ内の回数を返す"""
+        now = self.clock()
+        self._events.append(now)
+        self._expire(now)
+        return len(self._events)
+
+    def count(self) -> int:
+        """ウィンドウ内の発生回数"""
+        self._expire(self.clock())
+        return len(self._events)
+
+    def clear(self):
+        self._events.clear()
@@ -2,23 +2,45 @@
 AI比較アプリケーション - 設定管理モジュール
 """
 
+import atexit
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List
+
+from .persistence import WriteBehindWriter, quarantine_corrupt_file
+from .settings_schema import SETTINGS_SCHEMA, schema_defaults, validate_settings, validate_value
+
+
+# 設定ファイルの形式のバージョン
+# 2: スキーマの項目はユーザーが設定したものだけを保存する（書かれている項目はプロファイルより優先）
+SETTINGS_VERSION = 2
 
 
 class Settings:
     """アプリケーション設定を管理するクラス"""
     
-    def __init__(self):
-        self.config_dir = Path.home() / '.ai_comparison_app'
+    def __init__(self, config_dir: Path = None, write_delay: float = 1.0):
+        # config_dirを指定すると別の場所を使う（ベンチマーク用の使い捨て設定など）
+        self.config_dir = Path(config_dir) if config_dir else Path.home() / '.ai_comparison_app'
         self.config_file = self.config_dir / 'settings.json'
         self.data_dir = self.config_dir / 'data'
+        # 設定ファイルの内容（スキーマの項目はユーザーが設定したものだけを持つ）
         self.settings: Dict[str, Any] = {}
+        # パフォーマンスプロファイルの値（ユーザーが設定していない項目に使う）
+        self.profile_values: Dict[str, Any] = {}
+        self.active_performance_profile: str = None
+        self.defaults = self.get_default_settings()
+        self._listeners: List[Callable[[str, Any], None]] = []  # 設定変更の通知先 (キー, 新しい値)
+        
+        # 保存はライトビハインド（連続した変更をまとめ、write_delay秒後にバックグラウンドで原子的に書き込む）
+        self._lock = threading.Lock()
+        self.writer = WriteBehindWriter(self.config_file, self._serialize, write_delay)
+        atexit.register(self.flush)
         
         # ディレクトリの作成
-        self.config_dir.mkdir(exist_ok=True)
+        self.config_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(exist_ok=True)
         
         # 設定の読み込み
@@ -29,39 +51,142 @@ class Settings:
         if self.config_file.exists():
             try:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.settings = json.load(f)
+                    self.settings = self._validated(json.load(f))
+                if self.settings.get('settings_version', 1) < SETTINGS_VERSION:
+                    self._migrate()
             except Exception as e:
-                print(f"設定ファイルの読み込みに失敗: {e}")
-                self.settings = self.get_default_settings()
+                # 壊れたファイルは次の保存で上書きされないよう退避してから既定値で起動する
+                corrupt_path = quarantine_corrupt_file(self.config_file)
+                print(f"⚠️ 設定ファイルの読み込みに失敗、既定値を使用: {e}"
+                      + (f"（元のファイル: {corrupt_path}）" if corrupt_path else ""))
+                self.settings = self._initial_settings()
+                self.save()
         else:
-            self.settings = self.get_default_settings()
+            self.settings = self._initial_settings()
             self.save()
     
-    def save(self):
-        """設定ファイルを保存する"""
+    def _initial_settings(self) -> Dict[str, Any]:
+        """新しく作る設定ファイルの内容（スキーマの項目は書かず、既定値・プロファイルの値を使う）"""
+        values = {key: value for key, value in self.get_default_settings().items() if key not in SETTINGS_SCHEMA}
+        values['settings_version'] = SETTINGS_VERSION
+        return values
+    
+    def _migrate(self):
+        """以前の形式の設定ファイルを変換する
+
+        以前は全項目の既定値をファイルに書いていたため、既定値と同じスキーマの項目は
+        ユーザーが設定したものではないとみなして除く（以後はファイルに書かれた項目をユーザーの設定とする）
+        """
+        defaults = schema_defaults()
+        removed = [key for key in SETTINGS_SCHEMA if key in self.settings and self.settings[key] == defaults[key]]
+        for key in removed:
+            del self.settings[key]
+        self.settings['settings_version'] = SETTINGS_VERSION
+        print(f"設定ファイルを新しい形式に変換: 既定値の項目 {len(removed)}件を削除")
+        self.writer.schedule()
+    
+    def reload(self) -> List[str]:
+        """外部で編集された設定ファイルを読み直し、値が変わった項目を通知する（変わった項目名を返す）
+
+        未保存の変更がある場合は、それを書き込む時にファイルが上書きされるため読み直さない
+        """
+        if self.writer.pending or not self.config_file.exists():
+            return []
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                values = self._validated(json.load(f))
         except Exception as e:
-            print(f"設定ファイルの保存に失敗: {e}")
+            print(f"設定ファイルの再読み込みに失敗（現在の設定を維持）: {e}")
+            return []
+        if not isinstance(values, dict):
+            return []
+        keys = set(self.settings) | set(values)
+        before = {key: self.get(key) for key in keys}
+        with self._lock:
+            self.settings = values
+        changed = [key for key in keys if self.get(key) != before[key]]
+        for key in changed:
+            self._notify(key)
+        return changed
+    
+    def _validated(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """スキーマで検証し、不正な項目は既定値に戻して警告する"""
+        if not isinstance(values, dict):
+            raise ValueError("設定ファイルの形式が不正です")
+        values, errors = validate_settings(values)
+        for error in errors:
+            print(f"⚠️ 不正な設定値を既定値に戻しました: {error}")
+        return values
+    
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """設定変更の通知先を登録（実際に使われる値が変わった時に (キー, 新しい値) で呼ばれる）"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, Any], None]):
+        """設定変更の通知先を解除"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _notify(self, key: str):
+        value = self.get(key)
+        for callback in list(self._listeners):
+            try:
+                callback(key, value)
+            except Exception as e:
+                print(f"設定変更の反映に失敗 ({key}): {e}")
+    
+    def _serialize(self) -> str:
+        """保存する内容（書き込みスレッドから呼ばれる）"""
+        with self._lock:
+            return json.dumps(self.settings, indent=2, ensure_ascii=False)
+    
+    def save(self):
+        """設定ファイルを今すぐ保存する（一時ファイルに書いてから置き換える）"""
+        self.writer.write_now()
+    
+    def flush(self):
+        """予約中の保存があれば今すぐ書き込む（終了時）"""
+        self.writer.flush()
     
     def get(self, key: str, default: Any = None) -> Any:
-        """設定値を取得する"""
-        return self.settings.get(key, default)
+        """設定値を取得する
+
+        設定ファイルに書かれた（ユーザーが設定した）値 → パフォーマンスプロファイルの値 → 既定値の順に使う。
+        既定値と同じ値でも、ユーザーが設定した項目はプロファイルより優先する
+        """
+        if key in self.settings:
+            return self.settings[key]
+        if key in self.profile_values:
+            return self.profile_values[key]
+        return self.defaults.get(key, default)
+    
+    def set_profile_values(self, values: Dict[str, Any]):
+        """パフォーマンスプロファイルの値を設定する（ファイルには保存しない）"""
+        keys = set(self.profile_values) | set(values)
+        before = {key: self.get(key) for key in keys}
+        self.profile_values = dict(values)
+        for key in keys:
+            if self.get(key) != before[key]:
+                self._notify(key)
     
     def set(self, key: str, value: Any):
-        """設定値を設定する"""
-        self.settings[key] = value
-        self.save()
+        """設定値を設定する（保存はまとめてバックグラウンドで行う）
+
+        スキーマに定義された項目は検証し、不正な値はValueError。値が変わった場合は登録された通知先に知らせる
+        """
+        value = validate_value(key, value)
+        before = self.get(key)
+        with self._lock:
+            self.settings[key] = value
+        self.writer.schedule()
+        if self.get(key) != before:
+            self._notify(key)
     
     def get_default_settings(self) -> Dict[str, Any]:
-        """デフォルト設定を取得する"""
-        return {
+        """デフォルト設定を取得する（パフォーマンス関連の項目はsettings_schemaで定義）"""
+        defaults = {
             'window_geometry': None,
-            'suspend_timeout': 300,  # 5分（秒）
-            'memory_warning_threshold': 6144,  # 6GB（MB）
-            'tab_lazy_load': True,
-            'auto_suspend': True,
             'theme': 'dark',
             'text_ai_urls': {
                 'chatgpt': 'https://chat.openai.com/',
@@ -74,9 +199,15 @@ class Settings:
                 'deepl': 'https://www.deepl.com/translator'
             }
         }
+        defaults.update(schema_defaults())
+        return defaults
     
     def get_profile_dir(self, profile_name: str) -> str:
         """プロファイルディレクトリのパスを取得する"""
         profile_dir = self.data_dir / profile_name
         profile_dir.mkdir(exist_ok=True)
         return str(profile_dir)
+    
+    def get_cache_dir(self, profile_name: str) -> str:
+        """HTTPキャッシュのパスを取得する（使用量を集計できるようプロファイルディレクトリ内に置く）"""
+        return str(Path(self.get_profile_dir(profile_name)) / 'HttpCache')
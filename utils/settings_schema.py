@@ -0,0 +1,202 @@
+"""
+AI比較アプリケーション - 設定スキーマモジュール
+パフォーマンス関連の設定項目の型・既定値・範囲・選択肢と、実行中に反映できるか（再起動が必要か）を定義する
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class SettingSpec:
+    """設定項目の定義"""
+    type: type  # int / float / bool / str / dict
+    default: Any
+    description: str = ""
+    minimum: float = None
+    maximum: float = None
+    choices: tuple = None
+    restart: bool = False  # Trueの場合は再起動後に反映（WebEngineの初期化前・プロファイル作成時に使う値）
+
+
+SETTINGS_SCHEMA: Dict[str, SettingSpec] = {
+    # パフォーマンスプロファイル・Chromiumフラグ
+    'performance_profile': SettingSpec(
+        str, 'auto', "auto（ハードウェアから自動選択）/ low-memory / balanced / max-performance",
+        choices=('auto', 'low-memory', 'balanced', 'max-performance'), restart=True),
+    'gpu_acceleration': SettingSpec(
+        str, 'auto', "auto（GPUの初期化を試して判定）/ on / off（ソフトウェアラスタライズ）",
+        choices=('auto', 'on', 'off'), restart=True),
+    'process_model': SettingSpec(
+        str, 'process_per_site_instance', "レンダラー: process_per_site_instance / process_per_site / limited",
+        choices=('process_per_site_instance', 'process_per_site', 'limited'), restart=True),
+    'renderer_process_limit': SettingSpec(
+        int, 4, "limited選択時のレンダラープロセス数の上限", minimum=1, maximum=64, restart=True),
+
+    # 凍結・破棄
+    'auto_suspend': SettingSpec(bool, True, "非表示のビューを最後の操作からの経過時間で凍結・破棄"),
+    'freeze_timeout': SettingSpec(
+        int, 30, "非表示のビューの最後の操作（入力・タブの表示）→凍結（秒、0で凍結しない）", minimum=0, maximum=86400),
+    'suspend_timeout': SettingSpec(
+        int, 300, "凍結→破棄（秒、0で破棄しない）", minimum=0, maximum=86400),
+    'tab_lazy_load': SettingSpec(bool, True, "タブを最初に開いた時にビューを作成"),
+
+    # メモリ予算・計測
+    'memory_warning_threshold': SettingSpec(
+        int, 6144, "ステータスバーを警告表示にする合計メモリ（MB）", minimum=256),
+    'memory_budget_mb': SettingSpec(
+        int, 4096, "超過時はLRUのビューを破棄（MB、0で無効）", minimum=0),
+    'memory_check_interval': SettingSpec(int, 5, "予算チェック間隔（秒）", minimum=1, maximum=3600),
+    'sora_idle_shutdown_delay': SettingSpec(
+        int, 120, "メモリ予算超過時にSoraを終了するのは、非表示になってからこの秒数が経った後", minimum=0),
+    'sora_idle_cpu_percent': SettingSpec(
+        float, 5, "SoraのCPU使用率がこの値（%）以上の間は生成・再生中とみなして終了しない", minimum=0),
+    'metrics_sample_interval': SettingSpec(
+        int, 2, "メモリ・CPUの計測間隔（秒、ワーカースレッドで計測）", minimum=1, maximum=600),
+    'metrics_idle_interval': SettingSpec(
+        int, 10, "変化が無い間に計測間隔を延ばす上限（秒）", minimum=1, maximum=3600),
+    'metrics_change_mb': SettingSpec(
+        float, 5, "この量（MB）以上増減したら計測間隔を元に戻す", minimum=0),
+    'metrics_history_capacity': SettingSpec(
+        int, 3600, "メモリ・CPUの履歴に保持する計測数（古いものから上書き）",
+        minimum=60, maximum=1000000, restart=True),
+    'metrics_history_file': SettingSpec(
+        bool, True, "履歴を設定フォルダのファイルにメモリマップ（異常終了しても残る）", restart=True),
+    'memory_display_step_mb': SettingSpec(
+        int, 10, "ステータスバーのメモリ表示の単位（この単位で変わった時だけ再描画）", minimum=1, maximum=1024),
+
+    # ロード・再試行・クラッシュ
+    'load_timeout': SettingSpec(int, 30, "ロードタイムアウト（秒）", minimum=5, maximum=600),
+    'load_retry_max_attempts': SettingSpec(
+        int, 5, "連続失敗でこの回数に達すると自動再読み込みを停止", minimum=1, maximum=100),
+    'load_retry_base_delay': SettingSpec(
+        float, 2, "再試行間隔の初期値（秒、失敗ごとに倍増）", minimum=0.1, maximum=600),
+    'load_retry_max_delay': SettingSpec(float, 120, "再試行間隔の上限（秒）", minimum=1, maximum=3600),
+    'load_retry_cooldown': SettingSpec(
+        int, 300, "停止後に自動で再試行するまで（秒、0で手動のみ）", minimum=0, maximum=86400),
+    'crash_loop_max_crashes': SettingSpec(
+        int, 3, "この回数クラッシュすると自動復元を停止", minimum=1, maximum=100),
+    'crash_loop_window': SettingSpec(int, 300, "クラッシュ回数を数える期間（秒）", minimum=1, maximum=86400),
+    'load_concurrency': SettingSpec(
+        int, 1, "同時に読み込みを開始するペイン数（描画開始までの間）", minimum=1, maximum=16),
+    'load_stagger_timeout': SettingSpec(
+        int, 3, "前のペインの描画開始を待つ上限（秒）", minimum=0, maximum=60),
+    'load_metrics_max_samples': SettingSpec(
+        int, 200, "サービス・指標ごとに保持するロード計測値の件数", minimum=10, maximum=10000, restart=True),
+
+    # 先読み・予備ビュー
+    'page_pool_size': SettingSpec(
+        int, 1, "プロファイルごとの事前生成ビュー数（0で無効）", minimum=0, maximum=8),
+    'predictive_preload': SettingSpec(bool, True, "次に開かれそうなタブを先読み"),
+    'preload_idle_delay': SettingSpec(
+        int, 5, "タブ切り替え後、先読みを始めるまで（秒）", minimum=0, maximum=600),
+    'preload_min_probability': SettingSpec(
+        float, 0.3, "この確率以上で予測されたタブのみ先読み", minimum=0, maximum=1),
+    'preload_hover_delay': SettingSpec(
+        int, 300, "タブにマウスを乗せてから先読みするまで（ミリ秒）", minimum=0, maximum=10000),
+    'preload_estimated_view_mb': SettingSpec(
+        int, 300, "先読み可否の判定に使うビュー1つあたりの見積もり（MB）", minimum=1),
+
+    # ネットワーク・キャッシュ
+    'request_blocking': SettingSpec(
+        bool, False, "ブロックリストに一致するサードパーティリクエストを遮断", restart=True),
+    'block_list_file': SettingSpec(
+        str, '', "ブロックリストのパス（空の場合は設定フォルダのblocklist.txt）", restart=True),
+    'http_cache_type': SettingSpec(
+        str, 'disk', "HTTPキャッシュ: disk（上限付きディスク）/ memory（メモリのみ）/ none",
+        choices=('disk', 'memory', 'none')),
+    'http_cache_size_mb': SettingSpec(
+        int, 100, "プロファイルごとのキャッシュ上限（MB、0でQtの自動設定）", minimum=0, maximum=102400),
+    'http_cache_profile_sizes_mb': SettingSpec(
+        dict, {}, "プロファイル名 -> キャッシュ上限（MB、個別に変える場合）"),
+
+    # ダウンロード
+    'download_concurrency': SettingSpec(
+        int, 3, "同時にダウンロードする数（超えた分は待機）", minimum=1, maximum=16),
+    'download_workers': SettingSpec(
+        int, 2, "保存先の決定・後処理を行うワーカースレッド数", minimum=1, maximum=8, restart=True),
+    'download_convert_webp': SettingSpec(bool, False, "WebP画像をPNGに変換して保存"),
+    'download_strip_metadata': SettingSpec(
+        bool, False, "PNG・JPEG画像のメタデータ（EXIF・XMP・IPTC・テキスト）を取り除いて保存（ICCプロファイル等の色情報は残す）"),
+
+    # セッションの復元
+    'session_restore': SettingSpec(
+        bool, True, "前回のアクティブタブ・各ペインのURL・スプリッターのサイズを復元（他のタブは最初に表示した時に読み込む）"),
+    'session_save_interval': SettingSpec(
+        int, 60, "セッションを保存する間隔（秒、終了時にも保存）", minimum=5, maximum=3600),
+
+    # プロファイルの保存領域（Cookie・localStorageは削除しない）
+    'storage_auto_prune': SettingSpec(
+        bool, True, "起動後、使用していないプロファイルの上限を超えたキャッシュをバックグラウンドで削除", restart=True),
+    'storage_prune_delay': SettingSpec(
+        int, 60, "起動から削除を始めるまで（秒）", minimum=0, maximum=3600, restart=True),
+    'storage_quota_mb': SettingSpec(
+        int, 1024, "プロファイルごとのディスク使用量の上限（MB、0で無制限）", minimum=0),
+    'storage_max_age_days': SettingSpec(
+        int, 30, "この日数使われていないキャッシュを削除（0で無制限）", minimum=0, maximum=3650),
+    'storage_prune_indexeddb': SettingSpec(
+        bool, False, "期間切れのIndexedDB（オリジンごと）も削除（ログイン状態を保存するサイトもあるため既定は無効）"),
+}
+
+
+def schema_defaults() -> Dict[str, Any]:
+    """スキーマの既定値（dictは呼び出しごとに新しいものを返す）"""
+    return {key: dict(spec.default) if spec.type is dict else spec.default
+            for key, spec in SETTINGS_SCHEMA.items()}
+
+
+def validate_value(key: str, value: Any) -> Any:
+    """スキーマに沿って値を検証し、必要なら型を合わせて返す（不正な値はValueError）
+
+    スキーマに無い項目はそのまま返す
+    """
+    spec = SETTINGS_SCHEMA.get(key)
+    if spec is None:
+        return value
+
+    if spec.type is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"{key}: true/falseを指定してください（{value!r}）")
+    elif spec.type in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{key}: 数値を指定してください（{value!r}）")
+        if spec.type is int:
+            if value != int(value):
+                raise ValueError(f"{key}: 整数を指定してください（{value!r}）")
+            value = int(value)
+        else:
+            value = float(value)
+        if spec.minimum is not None and value < spec.minimum:
+            raise ValueError(f"{key}: {spec.minimum}以上を指定してください（{value!r}）")
+        if spec.maximum is not None and value > spec.maximum:
+            raise ValueError(f"{key}: {spec.maximum}以下を指定してください（{value!r}）")
+    elif not isinstance(value, spec.type):
+        raise ValueError(f"{key}: {spec.type.__name__}を指定してください（{value!r}）")
+
+    if spec.choices is not None and value not in spec.choices:
+        raise ValueError(f"{key}: {' / '.join(spec.choices)}のいずれかを指定してください（{value!r}）")
+    return value
+
+
+def validate_settings(values: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """設定全体を検証し、不正な項目を除いた辞書とエラーメッセージの一覧を返す
+
+    除いた項目は未設定として扱われ、パフォーマンスプロファイルの値か既定値が使われる
+    """
+    result = dict(values)
+    errors = []
+    for key in SETTINGS_SCHEMA:
+        if key not in result:
+            continue
+        try:
+            result[key] = validate_value(key, result[key])
+        except ValueError as e:
+            errors.append(str(e))
+            del result[key]
+    return result, errors
+
+
+def requires_restart(key: str) -> bool:
+    """変更の反映に再起動が必要な項目か"""
+    spec = SETTINGS_SCHEMA.get(key)
+    return spec is not None and spec.restart
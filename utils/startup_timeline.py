@@ -0,0 +1,45 @@
+"""
+AI比較アプリケーション - 起動時間計測モジュール
+プロセス起動からの経過時間を段階ごとに記録する（ベンチマークモード用）
+"""
+
+import json
+import time
+from typing import Dict, List
+
+import psutil
+
+
+class StartupTimeline:
+    """起動の各段階（インポート完了・QApplication作成・ウィンドウ作成・初回ロード等）の時刻を記録するクラス"""
+
+    def __init__(self, main_started: float = None):
+        # プロセスの起動時刻（OSの記録、エポック秒）
+        self.process_start = psutil.Process().create_time()
+        self.marks: Dict[str, float] = {'process_start': 0.0}
+        self.load_failures: List[dict] = []  # 失敗・タイムアウトしたロード（段階の到達としては記録しない）
+        if main_started is not None:
+            self.marks['interpreter_ready'] = self._elapsed_ms(main_started)
+
+    def _elapsed_ms(self, timestamp: float) -> float:
+        return round((timestamp - self.process_start) * 1000, 1)
+
+    def mark(self, name: str):
+        """段階の到達を記録（同じ段階は最初の1回のみ）"""
+        if name not in self.marks:
+            self.marks[name] = self._elapsed_ms(time.time())
+
+    def record_failure(self, name: str, reason: str):
+        """ロードの失敗を記録（再試行で後から成功した場合も残す）"""
+        self.load_failures.append({'name': name, 'reason': reason, 'at_ms': self._elapsed_ms(time.time())})
+
+    def to_dict(self) -> dict:
+        """JSON出力用の辞書（各段階はプロセス起動からのミリ秒）"""
+        return {'marks_ms': dict(self.marks), 'load_failures': list(self.load_failures)}
+
+    def save(self, path: str, **extra):
+        """JSONファイルに保存"""
+        data = self.to_dict()
+        data.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,511 @@
+"""
+AI比較アプリケーション - プロファイル保存領域の管理モジュール
+サービスごとのプロファイルフォルダ（設定フォルダのdata/<プロファイル名>）のディスク使用量を
+カテゴリ別に集計し、容量・期間の上限を超えたキャッシュを優先度の低いバックグラウンドスレッドで削除する。
+Cookie・localStorageなどのログイン状態は集計のみで削除しない。
+以前のバージョンがQtの既定の場所（キャッシュフォルダ/QtWebEngine/<プロファイル名>）に作ったHTTPキャッシュも
+集計し、もう使われないため削除する
+
+使い方（GUIを起動せずに使用量を表示・削除）:
+    python -m utils.storage_manager
+    python -m utils.storage_manager --prune --dry-run
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+# カテゴリ（表示順）
+CATEGORIES = ('cookies', 'login_state', 'indexeddb', 'service_worker_cache', 'http_cache', 'gpu_cache', 'other')
+CATEGORY_LABELS = {
+    'cookies': "Cookie",
+    'login_state': "localStorage等",
+    'indexeddb': "IndexedDB",
+    'service_worker_cache': "Service Worker",
+    'http_cache': "HTTPキャッシュ",
+    'gpu_cache': "GPUキャッシュ",
+    'other': "その他",
+}
+# 削除してよいカテゴリ（ページが必要に応じて作り直すキャッシュ）。IndexedDBは設定で有効な場合のみ
+PRUNABLE_CATEGORIES = ('http_cache', 'gpu_cache', 'service_worker_cache')
+
+# プロファイル直下のフォルダ・ファイル名 -> カテゴリ
+_TOP_LEVEL_CATEGORIES = {
+    'local storage': 'login_state',
+    'session storage': 'login_state',
+    'webstorage': 'login_state',
+    'indexeddb': 'indexeddb',
+    'cache': 'http_cache',
+    'code cache': 'http_cache',
+    'httpcache': 'http_cache',
+    'gpucache': 'gpu_cache',
+    'grshadercache': 'gpu_cache',
+    'shadercache': 'gpu_cache',
+    'graphitedawncache': 'gpu_cache',
+    'dawncache': 'gpu_cache',
+    'dawngraphitecache': 'gpu_cache',
+    'dawnwebgpucache': 'gpu_cache',
+}
+# Service Worker内でキャッシュとして扱うフォルダ（登録情報のDatabaseは残す）
+_SERVICE_WORKER_CACHES = ('cachestorage', 'scriptcache')
+
+
+def categorize(relative_parts: tuple) -> str:
+    """プロファイルフォルダからの相対パス（パス要素のタプル）のカテゴリ"""
+    if any(part.lower().startswith('cookies') for part in relative_parts):
+        return 'cookies'
+    top = relative_parts[0].lower()
+    if top == 'service worker':
+        if len(relative_parts) > 1 and relative_parts[1].lower() in _SERVICE_WORKER_CACHES:
+            return 'service_worker_cache'
+        return 'other'
+    return _TOP_LEVEL_CATEGORIES.get(top, 'other')
+
+
+@dataclass
+class StorageUnit:
+    """削除の単位（キャッシュフォルダ全体、またはオリジンごとのフォルダ）"""
+    path: Path
+    category: str
+    bytes: int = 0
+    last_used: float = 0.0  # 中のファイルの最終更新時刻
+
+
+@dataclass
+class ProfileUsage:
+    """プロファイル1つのディスク使用量"""
+    name: str
+    path: Path
+    categories: Dict[str, int] = field(default_factory=lambda: {category: 0 for category in CATEGORIES})
+    units: List[StorageUnit] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.categories.values())
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'path': str(self.path),
+            'total_bytes': self.total,
+            'categories': dict(self.categories),
+        }
+
+
+@dataclass
+class PruneResult:
+    """プロファイル1つの削除結果"""
+    name: str
+    removed: List[StorageUnit] = field(default_factory=list)
+    over_quota: bool = False  # 削除できるものを削除しても上限を超えている
+    interrupted: bool = False  # 使用開始・停止のため途中でやめた
+
+    @property
+    def freed(self) -> int:
+        return sum(unit.bytes for unit in self.removed)
+
+
+def _unit_path(profile_dir: Path, parts: tuple) -> Path:
+    """ファイルが属する削除単位のフォルダ"""
+    top = parts[0].lower()
+    if top == 'service worker':
+        # Service Worker/CacheStorage/<オリジン>/... はオリジンごと
+        return profile_dir.joinpath(*parts[:3]) if len(parts) > 3 else profile_dir.joinpath(*parts[:2])
+    if top == 'indexeddb':
+        # IndexedDB/<オリジン>.indexeddb.leveldb/... はオリジンごと
+        return profile_dir.joinpath(*parts[:2])
+    return profile_dir / parts[0]
+
+
+def _walk_files(root: Path, throttle: bool = False) -> Iterable[tuple]:
+    """(パス, サイズ, 最終更新時刻) を列挙（シンボリックリンクはたどらない）"""
+    stack = [root]
+    count = 0
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    yield Path(entry.path), stat.st_size, stat.st_mtime
+            except OSError:
+                continue
+            count += 1
+            if throttle and count % 500 == 0:
+                time.sleep(0.001)  # 他のディスクI/Oに譲る
+
+
+def scan_profile(profile_dir: Path, throttle: bool = False) -> ProfileUsage:
+    """プロファイルフォルダをカテゴリ・削除単位ごとに集計"""
+    profile_dir = Path(profile_dir)
+    usage = ProfileUsage(profile_dir.name, profile_dir)
+    units: Dict[Path, StorageUnit] = {}
+    for path, size, mtime in _walk_files(profile_dir, throttle):
+        parts = path.relative_to(profile_dir).parts
+        category = categorize(parts)
+        usage.categories[category] += size
+        if category in PRUNABLE_CATEGORIES or category == 'indexeddb':
+            unit_path = _unit_path(profile_dir, parts)
+            unit = units.get(unit_path)
+            if unit is None:
+                unit = units[unit_path] = StorageUnit(unit_path, category)
+            unit.bytes += size
+            unit.last_used = max(unit.last_used, mtime)
+    usage.units = list(units.values())
+    return usage
+
+
+def _remove_tree(path: Path, should_stop: Callable[[], bool], throttle: bool = False,
+                 lock: threading.Lock = None) -> bool:
+    """フォルダをファイル単位で削除（should_stop() がTrueになったらその時点でやめてFalse）
+
+    フォルダ全体を一度に削除すると、その間プロファイルの使用開始（claim）を待たせてしまうため、
+    1ファイルごとに中断できるようにする（キャッシュは一部のエントリが欠けても取得し直すだけ）。
+    lockを渡すと、判定と1ファイルの削除をその中で行う
+    """
+    path = Path(path)
+    guard = lock or contextlib.nullcontext()
+    if path.is_file() or path.is_symlink():
+        with guard:
+            if should_stop():
+                return False
+            path.unlink(missing_ok=True)
+        return True
+    count = 0
+    for root, directories, files in os.walk(path, topdown=False):
+        for name in files:
+            with guard:
+                if should_stop():
+                    return False
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    pass
+            count += 1
+            if throttle and count % 100 == 0:
+                time.sleep(0.001)  # 他のディスクI/Oに譲る
+        for name in directories:
+            child = os.path.join(root, name)
+            try:
+                if os.path.islink(child):
+                    os.remove(child)
+                else:
+                    os.rmdir(child)
+            except OSError:
+                pass
+    try:
+        path.rmdir()
+    except OSError:
+        pass
+    return True
+
+
+def qt_default_cache_root() -> Optional[Path]:
+    """QtWebEngineの既定のキャッシュの保存先（<ここ>/<プロファイル名>、以前のバージョンのHTTPキャッシュ）
+
+    アプリ名・組織名（QCoreApplication）から決まるため、それらを設定してから呼ぶ
+    """
+    from PySide6.QtCore import QStandardPaths
+    location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return Path(location) / 'QtWebEngine' if location else None
+
+
+def _lower_thread_priority():
+    """呼び出したスレッドのCPU・I/O優先度を下げる（失敗しても続行）"""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000  # CPU・I/O・メモリの優先度をまとめて下げる
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif hasattr(os, 'setpriority'):
+            # Linuxではスレッドごとにnice値を持つ
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except Exception as e:
+        print(f"削除スレッドの優先度を下げられません: {e}")
+
+
+class StorageManager:
+    """プロファイルフォルダの使用量集計と、上限を超えたキャッシュの削除
+
+    使用中のプロファイル（QWebEngineProfileを作成済み）のファイルはChromiumが開いているため削除しない。
+    プロファイルを作成する前に claim() を呼ぶと使用中になり、削除スレッドは次のファイルからそのプロファイルの削除をやめる
+    （削除の判定と1ファイルの削除はロックの中で行うため、claim() が待つのは最大でもファイル1つ分）
+    """
+
+    def __init__(self, data_dir: Path, quota_mb: int = 1024, max_age_days: int = 30,
+                 prune_indexeddb: bool = False, legacy_cache_root: Path = None):
+        self.data_dir = Path(data_dir)
+        # 以前のバージョンのHTTPキャッシュの場所（Noneの場合は扱わない）
+        self.legacy_cache_root = Path(legacy_cache_root) if legacy_cache_root else None
+        self.quota_mb = quota_mb  # プロファイルごとの上限（0で無制限）
+        self.max_age_days = max_age_days  # これより長く使われていないキャッシュを削除（0で無制限）
+        self.prune_indexeddb = prune_indexeddb
+        self._lock = threading.Lock()
+        self._in_use: set = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(cls, settings, legacy_cache_root: Path = None) -> 'StorageManager':
+        return cls(
+            settings.data_dir,
+            settings.get('storage_quota_mb', 1024),
+            settings.get('storage_max_age_days', 30),
+            settings.get('storage_prune_indexeddb', False),
+            legacy_cache_root,
+        )
+
+    def profile_dirs(self) -> List[Path]:
+        if not self.data_dir.exists():
+            return []
+        return sorted(path for path in self.data_dir.iterdir() if path.is_dir())
+
+    def report(self) -> List[ProfileUsage]:
+        """全プロファイルの使用量"""
+        return [scan_profile(path) for path in self.profile_dirs()]
+
+    def legacy_cache_dirs(self) -> List[Path]:
+        """以前のバージョンがQtの既定の場所に作った、このアプリのプロファイルのキャッシュフォルダ
+
+        他のアプリ・既定プロファイルのフォルダを消さないよう、data以下にあるプロファイル名と一致するものに限る
+        """
+        if self.legacy_cache_root is None or not self.legacy_cache_root.is_dir():
+            return []
+        names = {path.name for path in self.profile_dirs()}
+        return sorted(path for path in self.legacy_cache_root.iterdir() if path.is_dir() and path.name in names)
+
+    def legacy_report(self) -> List[ProfileUsage]:
+        """以前のバージョンのキャッシュの使用量"""
+        return [scan_profile(path) for path in self.legacy_cache_dirs()]
+
+    def remove_legacy_caches(self, dry_run: bool = False, throttle: bool = False) -> List[StorageUnit]:
+        """以前のバージョンのキャッシュを削除（今はプロファイルフォルダ内のHttpCacheを使うため、どのプロファイルも開かない）"""
+        removed = []
+        for path in self.legacy_cache_dirs():
+            if self._stop.is_set():
+                break
+            usage = scan_profile(path, throttle)
+            unit = StorageUnit(path, 'http_cache', usage.total,
+                               max((unit.last_used for unit in usage.units), default=0.0))
+            if not dry_run and not _remove_tree(path, self._stop.is_set, throttle):
+                break
+            removed.append(unit)
+        return removed
+
+    # --- 使用中のプロファイル ---
+
+    def claim(self, profile_name: str):
+        """プロファイルを使用中にする（削除中であれば、今のファイルの削除が終わるのだけを待つ）"""
+        with self._lock:
+            self._in_use.add(profile_name)
+
+    def _is_in_use(self, profile_name: str) -> bool:
+        with self._lock:
+            return profile_name in self._in_use
+
+    # --- 削除 ---
+
+    def plan(self, usage: ProfileUsage, now: float = None) -> List[StorageUnit]:
+        """削除する単位を決める（期間切れのもの、その後も上限を超えていれば古いものから）"""
+        now = now if now is not None else time.time()
+        categories = PRUNABLE_CATEGORIES + (('indexeddb',) if self.prune_indexeddb else ())
+        candidates = sorted((unit for unit in usage.units if unit.category in categories),
+                            key=lambda unit: unit.last_used)
+        selected = []
+        if self.max_age_days > 0:
+            cutoff = now - self.max_age_days * 86400
+            selected = [unit for unit in candidates if unit.last_used < cutoff]
+        remaining = usage.total - sum(unit.bytes for unit in selected)
+        if self.quota_mb > 0:
+            quota = self.quota_mb * 1024 * 1024
+            for unit in candidates:
+                if remaining <= quota:
+                    break
+                if unit.category == 'indexeddb' or unit in selected:
+                    continue  # IndexedDBは期間切れの場合のみ削除（サイトのデータを容量で消さない）
+                selected.append(unit)
+                remaining -= unit.bytes
+        return selected
+
+    def prune_profile(self, profile_dir: Path, dry_run: bool = False, throttle: bool = False) -> Optional[PruneResult]:
+        """プロファイル1つを削除（使用中の場合はNone）"""
+        profile_dir = Path(profile_dir)
+        name = profile_dir.name
+        if not dry_run and self._is_in_use(name):
+            return None
+        usage = scan_profile(profile_dir, throttle)
+        result = PruneResult(name)
+
+        def should_stop() -> bool:
+            # ロックの中で呼ばれる（claim() の後に、使用中になったプロファイルのファイルを削除しないため）
+            return self._stop.is_set() or name in self._in_use
+
+        for unit in self.plan(usage):
+            if not dry_run:
+                if not _remove_tree(unit.path, should_stop, throttle, self._lock):
+                    result.interrupted = True
+                    break
+                if throttle:
+                    time.sleep(0.01)
+            result.removed.append(unit)
+        quota = self.quota_mb * 1024 * 1024
+        result.over_quota = self.quota_mb > 0 and usage.total - result.freed > quota
+        return result
+
+    def prune(self, dry_run: bool = False, throttle: bool = False) -> List[PruneResult]:
+        """使用中でない全プロファイルを削除"""
+        results = []
+        for path in self.profile_dirs():
+            if self._stop.is_set():
+                break
+            result = self.prune_profile(path, dry_run, throttle)
+            if result is not None:
+                results.append(result)
+        return results
+
+    def start_background_prune(self, delay: float = 60.0):
+        """delay秒後に優先度の低いスレッドで削除（起動直後のディスクI/Oと競合させない）"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run_background, args=(delay,),
+                                        name='storage-prune', daemon=True)
+        self._thread.start()
+
+    def _run_background(self, delay: float):
+        if self._stop.wait(delay):
+            return
+        _lower_thread_priority()
+        try:
+            legacy = self.remove_legacy_caches(throttle=True)
+            if legacy:
+                print(f"以前のバージョンのキャッシュを削除: {format_size(sum(unit.bytes for unit in legacy))} "
+                      f"({', '.join(unit.path.name for unit in legacy)})")
+            results = self.prune(throttle=True)
+        except Exception as e:
+            print(f"プロファイルの削除に失敗: {e}")
+            return
+        freed = sum(result.freed for result in results)
+        if freed:
+            print(f"プロファイルのキャッシュを削除: {format_size(freed)}")
+        for result in results:
+            if result.over_quota:
+                print(f"⚠️ プロファイル {result.name} はキャッシュを削除しても上限（{self.quota_mb} MB）を超えています")
+
+    def stop(self):
+        """バックグラウンドの削除を止める（今のファイルの削除が終わるまで待つ）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+def _pad(text: str, width: int, right: bool) -> str:
+    """全角文字を2桁として幅を揃える"""
+    padding = ' ' * max(width - _display_width(text), 0)
+    return padding + text if right else text + padding
+
+
+def _display_width(text: str) -> int:
+    return sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+
+
+def format_report(usages: List[ProfileUsage]) -> str:
+    """使用量の表（プロファイルごとの行 + 合計）"""
+    columns = ['プロファイル', '合計'] + [CATEGORY_LABELS[category] for category in CATEGORIES]
+    rows = [[usage.name, format_size(usage.total)]
+            + [format_size(usage.categories[category]) for category in CATEGORIES]
+            for usage in sorted(usages, key=lambda usage: usage.total, reverse=True)]
+    rows.append(['合計', format_size(sum(usage.total for usage in usages))]
+                + [format_size(sum(usage.categories[category] for usage in usages)) for category in CATEGORIES])
+    widths = [max(_display_width(row[i]) for row in [columns] + rows) for i in range(len(columns))]
+    return '\n'.join('  '.join(_pad(cell, widths[i], right=i > 0) for i, cell in enumerate(row))
+                     for row in [columns] + rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="プロファイルのディスク使用量の表示・キャッシュの削除")
+    parser.add_argument('--config-dir', default=None, help="設定フォルダ（既定は ~/.ai_comparison_app）")
+    parser.add_argument('--prune', action='store_true', help="上限を超えたキャッシュを削除（アプリは終了しておく）")
+    parser.add_argument('--dry-run', action='store_true', help="削除せずに対象を表示")
+    parser.add_argument('--quota-mb', type=int, default=None, help="プロファイルごとの上限（MB、設定より優先）")
+    parser.add_argument('--max-age-days', type=int, default=None, help="キャッシュの保持期間（日、設定より優先）")
+    parser.add_argument('--json', action='store_true', help="JSONで出力")
+    args = parser.parse_args()
+
+    from PySide6.QtCore import QCoreApplication
+    from .settings import Settings
+    # 以前のキャッシュの場所はアプリ名・組織名から決まる（main.pyと同じ名前）
+    QCoreApplication.setOrganizationName("AI Comparison")
+    QCoreApplication.setApplicationName("AI比較アプリケーション")
+    manager = StorageManager.from_settings(Settings(args.config_dir), qt_default_cache_root())
+    if args.quota_mb is not None:
+        manager.quota_mb = args.quota_mb
+    if args.max_age_days is not None:
+        manager.max_age_days = args.max_age_days
+
+    usages = manager.report()
+    legacy_usages = manager.legacy_report()
+    legacy_removed = manager.remove_legacy_caches(dry_run=args.dry_run) if args.prune else []
+    results = manager.prune(dry_run=args.dry_run) if args.prune else []
+
+    if args.json:
+        print(json.dumps({
+            'data_dir': str(manager.data_dir),
+            'profiles': [usage.to_dict() for usage in usages],
+            'legacy_cache_root': str(manager.legacy_cache_root) if manager.legacy_cache_root else None,
+            'legacy_caches': [usage.to_dict() for usage in legacy_usages],
+            'legacy_removed': [str(unit.path) for unit in legacy_removed],
+            'pruned': [{
+                'name': result.name,
+                'freed_bytes': result.freed,
+                'removed': [str(unit.path) for unit in result.removed],
+                'over_quota': result.over_quota,
+            } for result in results],
+            'dry_run': args.dry_run,
+        }, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"{manager.data_dir}")
+    print(format_report(usages))
+    if legacy_usages:
+        print(f"\n以前のバージョンのキャッシュ（使用されていません）: {manager.legacy_cache_root}")
+        print(format_report(legacy_usages))
+    if args.prune:
+        action = "削除対象" if args.dry_run else "削除"
+        for unit in legacy_removed:
+            print(f"{action}: {unit.path} ({format_size(unit.bytes)})")
+        for result in results:
+            for unit in result.removed:
+                print(f"{action}: {unit.path} ({format_size(unit.bytes)})")
+            if result.over_quota:
+                print(f"⚠️ {result.name} はキャッシュを削除しても上限（{manager.quota_mb} MB）を超えています")
+        freed = sum(result.freed for result in results) + sum(unit.bytes for unit in legacy_removed)
+        print(f"{action}合計: {format_size(freed)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
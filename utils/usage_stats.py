@@ -0,0 +1,49 @@
+"""
+AI比較アプリケーション - タブ利用履歴モジュール
+タブの切り替え履歴を記録し、次に開かれる可能性が高いタブを予測する
+"""
+
+from typing import Dict, Optional, Tuple
+
+
+class TabUsageModel:
+    """タブ切り替えの遷移回数から次のタブを予測するモデル（一次マルコフ連鎖）
+
+    古い履歴ほど影響が小さくなるよう、記録のたびに遷移元の回数を減衰させる
+    """
+
+    def __init__(self, data: dict = None, decay: float = 0.95):
+        self.decay = decay
+        # 遷移元タブ -> {遷移先タブ: 重み付き回数}
+        self.transitions: Dict[str, Dict[str, float]] = {}
+        if data:
+            for source, targets in data.get('transitions', {}).items():
+                self.transitions[source] = {target: float(count) for target, count in targets.items()}
+
+    def record(self, source: str, target: str):
+        """タブの切り替えを記録"""
+        if not source or source == target:
+            return
+        targets = self.transitions.setdefault(source, {})
+        for key in targets:
+            targets[key] *= self.decay
+        targets[target] = targets.get(target, 0.0) + 1.0
+
+    def predict(self, source: str, exclude=()) -> Optional[Tuple[str, float]]:
+        """次に開かれる可能性が最も高いタブと、その確率を返す"""
+        targets = {key: count for key, count in self.transitions.get(source, {}).items()
+                   if key not in exclude}
+        total = sum(targets.values())
+        if total <= 0:
+            return None
+        target = max(targets, key=targets.get)
+        return target, targets[target] / total
+
+    def to_dict(self) -> dict:
+        """設定ファイル保存用の辞書に変換"""
+        return {
+            'transitions': {
+                source: {target: round(count, 3) for target, count in targets.items()}
+                for source, targets in self.transitions.items()
+            }
+        }